@@ -3,39 +3,336 @@ import psycopg2
 import psycopg2.extras
 import jwt
 import re
+import json
+import html
+import logging
+import base64
+import csv
+import io
+import uuid
+import hashlib
+import hmac
+import time
+import threading
+import tempfile
 from datetime import datetime, timedelta
 from functools import wraps
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, g
 from flask_cors import CORS
-from passlib.hash import pbkdf2_sha256 as sha256
-from dotenv import load_dotenv
+from db_pool import ConnectionPool, PoolTimeout
+from ref_cache import TTLCache, VersionMap
+from kdf_pool import KdfPool, KdfPoolBusy
+from rate_limit import RateLimiter
+from change_feed import ChangeFeed, CHANNEL as CHANGE_CHANNEL, format_sse
+import metrics
+import structured_log
 
 # Load environment variables from .env file
-load_dotenv()
+# 플랫폼이 환경 변수를 직접 넣어 주는 경우 DOTENV=0으로 .env 탐색과 python-dotenv import를 건너뜁니다.
+if os.getenv('DOTENV', '1') != '0':
+    from dotenv import load_dotenv
+    load_dotenv()
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'inspection_front', 'dist'))
 
 # --- CORS 설정 ---
+CORS_ORIGINS = ["https://qw-tau.vercel.app", "http://localhost:5173"] # Vercel 배포 주소와 로컬 개발 주소 명시
 CORS(
     app,
-    origins=["https://qw-tau.vercel.app", "http://localhost:5173"], # Vercel 배포 주소와 로컬 개발 주소 명시
+    origins=CORS_ORIGINS,
     supports_credentials=True,
     allow_headers=["Content-Type", "Authorization"]
 )
 # --- CORS 설정 끝 ---
 
+# --- 리버스 프록시 ---
+# Nginx 같은 프록시 뒤에서는 remote_addr가 프록시 주소라서 IP별 로그인 제한이 모든 클라이언트를 한 IP로 봅니다.
+# TRUSTED_PROXY_HOPS에 앞단 프록시 수를 넣으면 그만큼의 X-Forwarded-For/-Proto 항목만 믿습니다.
+# 프록시 없이 직접 받는 경우에는 0으로 두세요. (클라이언트가 X-Forwarded-For를 위조할 수 있음)
+TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', '0'))
+if TRUSTED_PROXY_HOPS > 0:
+    from werkzeug.middleware.proxy_fix import ProxyFix
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS, x_proto=TRUSTED_PROXY_HOPS)
+# --- 리버스 프록시 끝 ---
+
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY') or 'a-very-secret-key'
+
+# --- 로깅 설정 ---
+# 로그는 큐에 넣기만 하고 별도 스레드가 stdout에 JSON Lines로 씁니다. 요청 스레드는 stdout을 기다리지 않습니다.
+logger = structured_log.configure(
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    queue_size=int(os.getenv('LOG_QUEUE_SIZE', '10000')),
+    query_logging=os.getenv('LOG_QUERIES', '').lower() in ('1', 'true'),
+    query_sample_rate=float(os.getenv('LOG_QUERY_SAMPLE_RATE', '1.0')),
+)
+
+def log_query(handler, query, params=None, **fields):
+    # 쿼리 텍스트 로그는 LOG_QUERIES (또는 /api/debug/logging)로 켜고, 샘플링 비율을 적용합니다.
+    if structured_log.should_log_query():
+        logger.info('query', extra={'fields': {'handler': handler, 'sql': ' '.join(query.split()), 'params': params, **fields}})
+# --- 로깅 설정 끝 ---
 DATABASE_URI = os.getenv('DATABASE_URI')
 
+# --- DB 커넥션 풀 설정 ---
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '5'))
+DB_POOL_HEALTHCHECK_INTERVAL = float(os.getenv('DB_POOL_HEALTHCHECK_INTERVAL', '30'))
+DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', '1800'))
+
+db_pool = ConnectionPool(
+    DATABASE_URI,
+    minconn=DB_POOL_MIN_SIZE,
+    maxconn=DB_POOL_MAX_SIZE,
+    timeout=DB_POOL_TIMEOUT,
+    healthcheck_interval=DB_POOL_HEALTHCHECK_INTERVAL,
+    max_lifetime=DB_POOL_MAX_LIFETIME,
+    cursor_wrapper=metrics.InstrumentedCursor,
+)
+# --- DB 커넥션 풀 설정 끝 ---
+
 def get_db_connection():
+    # 풀에서 커넥션을 빌려옵니다. conn.close()는 커넥션을 풀에 반납합니다.
+    # PoolTimeout은 잡지 않고 그대로 올려서 503으로 응답하도록 합니다.
     try:
-        conn = psycopg2.connect(DATABASE_URI)
-        return conn
+        return db_pool.getconn()
+    except PoolTimeout:
+        raise
     except Exception as e:
-        print(f"Database connection error: {e}", flush=True)
+        logger.error("Database connection error", extra={'fields': {'error': str(e)}})
         return None
 
+# --- 참조 데이터 캐시 (업체/제품 ID, 사용자 목록) ---
+REF_CACHE_TTL = float(os.getenv('REF_CACHE_TTL', '300'))
+REF_CACHE_MAX_SIZE = int(os.getenv('REF_CACHE_MAX_SIZE', '1024'))
+
+company_id_cache = TTLCache('company_id', ttl=REF_CACHE_TTL, max_size=REF_CACHE_MAX_SIZE)
+product_id_cache = TTLCache('product_id', ttl=REF_CACHE_TTL, max_size=REF_CACHE_MAX_SIZE)
+ref_list_cache = TTLCache('ref_list', ttl=REF_CACHE_TTL, max_size=8)  # 'companies', 'users', 'inspection_filter_options'
+REF_CACHES = (company_id_cache, product_id_cache, ref_list_cache)
+
+COMPANY_ID_QUERY = "SELECT id FROM Companies WHERE company_name = %s"
+PRODUCT_ID_QUERY = "SELECT id FROM Products WHERE product_code = %s"
+
+def get_or_create_company(cursor, company_name):
+    # (company_id, created) 반환. 새로 만든 ID는 커밋 후 remember_company로 캐시에 넣어야 합니다.
+    company_id = company_id_cache.get(company_name)
+    if company_id is not None:
+        return company_id, False
+    cursor.execute(COMPANY_ID_QUERY, (company_name,))
+    company = cursor.fetchone()
+    if company:
+        return company['id'], False
+    cursor.execute("INSERT INTO Companies (company_name) VALUES (%s) RETURNING id", (company_name,))
+    return cursor.fetchone()['id'], True
+
+def get_or_create_product(cursor, product_code, product_name):
+    product_id = product_id_cache.get(product_code)
+    if product_id is not None:
+        return product_id, False
+    cursor.execute(PRODUCT_ID_QUERY, (product_code,))
+    product = cursor.fetchone()
+    if product:
+        return product['id'], False
+    cursor.execute("INSERT INTO Products (product_name, product_code) VALUES (%s, %s) RETURNING id", (product_name, product_code))
+    return cursor.fetchone()['id'], True
+
+def remember_company(company_name, company_id, created=False):
+    company_id_cache.set(company_name, company_id)
+    if created:
+        ref_list_cache.delete('companies')
+
+def remember_product(product_code, product_id):
+    product_id_cache.set(product_code, product_id)
+# --- 참조 데이터 캐시 끝 ---
+
+# --- 요청 계측 (지연 시간, DB 왕복 횟수/시간, 행 수, 응답 크기) ---
+SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', '0'))  # 0이면 느린 요청 로그 비활성화
+# /metrics는 METRICS_TOKEN(Bearer)이 있어야 볼 수 있습니다. 토큰 없이 열어 두려면(개발용) METRICS_ALLOW_ANONYMOUS=1.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+METRICS_ALLOW_ANONYMOUS = os.getenv('METRICS_ALLOW_ANONYMOUS', '0') == '1'
+
+request_metrics = metrics.MetricsRegistry()
+
+@app.before_request
+def start_request_metrics():
+    g.request_stats = metrics.begin_request()
+
+@app.after_request
+def record_request_metrics(response):
+    stats = metrics.end_request()
+    if stats is None:
+        return response
+    duration = time.perf_counter() - stats.started
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    response_bytes = None if response.is_streamed else response.calculate_content_length()
+    request_metrics.record(request.method, endpoint, response.status_code, duration, stats, response_bytes)
+
+    if SLOW_REQUEST_MS and duration * 1000 >= SLOW_REQUEST_MS:
+        slowest = sorted(stats.queries, key=lambda q: q[1], reverse=True)[:5]
+        logger.warning('slow_request', extra={'fields': {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': endpoint,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'db_queries': stats.db_queries,
+            'db_ms': round(stats.db_time * 1000, 2),
+            'db_rows': stats.db_rows,
+            'queries': [{'sql': ' '.join(str(sql).split())[:1000], 'ms': round(t * 1000, 2)} for sql, t in slowest],
+        }})
+    return response
+# --- 요청 계측 끝 ---
+
+@app.errorhandler(PoolTimeout)
+def handle_pool_timeout(e):
+    return jsonify({"message": "Server is busy, please try again shortly."}), 503
+
+# --- 비밀번호 해시 (KDF) ---
+# pbkdf2 계산은 kdf_pool에서만 실행합니다. 풀과 대기열이 가득 차면 기다리지 않고 503으로 응답합니다.
+KDF_WORKERS = int(os.getenv('KDF_WORKERS', str(min(4, os.cpu_count() or 1))))
+KDF_QUEUE_SIZE = int(os.getenv('KDF_QUEUE_SIZE', '16'))
+KDF_TIMEOUT = float(os.getenv('KDF_TIMEOUT', '5'))
+# 서버에 맞춘 값은 `python kdf_pool.py --target-ms 50`으로 구합니다. 기존 해시는 로그인할 때 이 값으로 다시 만듭니다.
+PASSWORD_HASH_ROUNDS = int(os.getenv('PASSWORD_HASH_ROUNDS', '29000'))  # passlib pbkdf2_sha256 기본값
+# 로그인 시도 제한은 DB 조회/KDF 계산 전에 검사합니다. 사용자명 기준과 IP 기준을 모두 통과해야 합니다.
+LOGIN_RATE_PER_USER = float(os.getenv('LOGIN_RATE_PER_USER', '10'))  # 분당
+LOGIN_BURST_PER_USER = int(os.getenv('LOGIN_BURST_PER_USER', '5'))
+LOGIN_RATE_PER_IP = float(os.getenv('LOGIN_RATE_PER_IP', '60'))
+LOGIN_BURST_PER_IP = int(os.getenv('LOGIN_BURST_PER_IP', '30'))
+
+kdf_pool = KdfPool(workers=KDF_WORKERS, queue_size=KDF_QUEUE_SIZE, timeout=KDF_TIMEOUT)
+login_user_limiter = RateLimiter('login_user', LOGIN_RATE_PER_USER, LOGIN_BURST_PER_USER)
+login_ip_limiter = RateLimiter('login_ip', LOGIN_RATE_PER_IP, LOGIN_BURST_PER_IP)
+
+_password_hasher = None
+
+def get_password_hasher():
+    # passlib은 로그인/비밀번호 변경 때만 필요하므로 처음 쓸 때 불러옵니다. (시작 시간 단축)
+    global _password_hasher
+    if _password_hasher is None:
+        from passlib.hash import pbkdf2_sha256
+        _password_hasher = pbkdf2_sha256.using(rounds=PASSWORD_HASH_ROUNDS, min_desired_rounds=PASSWORD_HASH_ROUNDS)
+    return _password_hasher
+
+def hash_password(password):
+    return kdf_pool.run(get_password_hasher().hash, password)
+
+def verify_password(password, password_hash):
+    return kdf_pool.run(get_password_hasher().verify, password, password_hash)
+
+def check_login_rate(username):
+    # 거부되면 다시 시도할 수 있을 때까지의 초를, 허용되면 0을 반환합니다.
+    return login_ip_limiter.hit(request.remote_addr or '-') or login_user_limiter.hit(username.lower())
+
+def too_many_attempts(retry_after):
+    response = jsonify({"message": "로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요."})
+    response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+    return response, 429
+
+@app.errorhandler(KdfPoolBusy)
+def handle_kdf_pool_busy(e):
+    response = jsonify({"message": "Server is busy, please try again shortly."})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+# --- 비밀번호 해시 (KDF) 끝 ---
+
 # == JWT Token Decorator ==
+TOKEN_LIFETIME_HOURS = int(os.getenv('TOKEN_LIFETIME_HOURS', '24'))
+# 검증을 마친 토큰 -> 클레임 캐시. 같은 토큰으로 오는 요청은 HMAC 검증을 다시 하지 않습니다.
+# 항목은 TOKEN_CACHE_TTL과 토큰 만료(exp)까지 남은 시간 중 짧은 쪽이 지나면 사라집니다.
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', '4096'))
+TOKEN_CACHE_TTL = float(os.getenv('TOKEN_CACHE_TTL', '300'))
+# 다른 프로세스에서 폐기된 토큰은 최대 이 시간 안에 반영됩니다. (같은 프로세스에서는 즉시)
+TOKEN_VERSION_REFRESH_SECONDS = float(os.getenv('TOKEN_VERSION_REFRESH_SECONDS', '30'))
+
+verified_token_cache = TTLCache('verified_token', ttl=TOKEN_CACHE_TTL, max_size=TOKEN_CACHE_SIZE)
+
+def load_token_versions():
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("Database connection failed")
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT id, token_version FROM Users")
+            return cursor.fetchall()
+    finally:
+        conn.close()
+
+def load_token_version(user_id):
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("Database connection failed")
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT token_version FROM Users WHERE id = %s", (user_id,))
+            row = cursor.fetchone()
+            return row[0] if row else None
+    finally:
+        conn.close()
+
+# user_id -> 현재 토큰 버전. 삭제된 사용자는 없으므로 그 사용자의 토큰은 모두 거부됩니다.
+# 표에 없는 사용자(다른 프로세스에서 방금 생성/로그인)는 그 한 명만 읽고, 전체 표는 백그라운드에서 갱신합니다.
+token_versions = VersionMap('token_version', load_token_versions, refresh_interval=TOKEN_VERSION_REFRESH_SECONDS,
+                            load_one=load_token_version)
+
+class TokenCheckUnavailable(Exception):
+    # 토큰 자체는 유효하지만 DB에서 토큰 버전을 확인하지 못한 경우. 401이 아니라 503으로 응답합니다.
+    pass
+
+@app.errorhandler(TokenCheckUnavailable)
+def handle_token_check_unavailable(e):
+    logger.error("Token version check failed", extra={'fields': {'error': str(e)}})
+    return jsonify({"message": "Server is busy, please try again shortly."}), 503
+
+def user_role(username):
+    return 'admin' if username == 'test' else 'user'
+
+def issue_token(user_id, username, team, version):
+    return jwt.encode({
+        'user_id': user_id,
+        'username': username,
+        'role': user_role(username),
+        'team': team,
+        'ver': version,
+        'exp': datetime.utcnow() + timedelta(hours=TOKEN_LIFETIME_HOURS)
+    }, app.config['SECRET_KEY'], algorithm="HS256")
+
+def token_claims(token):
+    # 서명/만료만 확인한 클레임 (토큰 버전 확인 전). 검증 결과는 verified_token_cache에 둡니다.
+    current_user = verified_token_cache.get(token)
+    if current_user is None:
+        secret = app.config['SECRET_KEY']
+        data = jwt.decode(token, secret, algorithms=["HS256"])
+        if 'user_id' not in data or 'username' not in data:
+            raise jwt.InvalidTokenError('Token is missing required claims')
+        # role/team/ver가 없는 예전 토큰도 만료될 때까지는 받아들입니다.
+        current_user = {
+            'id': data['user_id'],
+            'username': data['username'],
+            'role': data.get('role') or user_role(data['username']),
+            'team': data.get('team'),
+            'ver': data.get('ver', 0),
+        }
+        ttl = TOKEN_CACHE_TTL
+        if 'exp' in data:
+            ttl = min(ttl, data['exp'] - time.time())
+        verified_token_cache.set(token, current_user, ttl=ttl)
+    return current_user
+
+def decode_token(token):
+    # 서명/만료/폐기 문제는 jwt.InvalidTokenError(401), DB 문제는 PoolTimeout/TokenCheckUnavailable(503)로 올립니다.
+    current_user = token_claims(token)
+    try:
+        version = token_versions.get(current_user['id'])
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        raise TokenCheckUnavailable(str(e)) from e
+    if version != current_user['ver']:
+        raise jwt.InvalidTokenError('Token has been revoked')
+    return current_user
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -49,10 +346,8 @@ def token_required(f):
             return jsonify({'message': 'Token is missing!'}), 401
 
         try:
-            secret = app.config['SECRET_KEY']
-            data = jwt.decode(token, secret, algorithms=["HS256"])
-            current_user = {'id': data['user_id'], 'username': data['username']}
-        except Exception as e:
+            current_user = decode_token(token)
+        except jwt.InvalidTokenError as e:
             return jsonify({'message': f'Token is invalid! Error: {e}'}), 401
 
         return f(current_user, *args, **kwargs)
@@ -60,6 +355,8 @@ def token_required(f):
     return decorated
 
 # == User Authentication Endpoints ==
+LOGIN_USER_QUERY = "SELECT id, password_hash, team, token_version FROM Users WHERE username = %s"
+
 @app.route('/api/login', methods=['POST'])
 def login():
     data = request.get_json()
@@ -69,28 +366,49 @@ def login():
     if not username or not password:
         return jsonify({"message": "Username and password are required"}), 400
 
+    retry_after = check_login_rate(username)
+    if retry_after:
+        return too_many_attempts(retry_after)
+
+    # KDF 계산 동안 풀 커넥션을 붙잡지 않도록, 해시를 읽고 커넥션을 반납한 뒤 검증합니다.
     conn = get_db_connection()
     if not conn: return jsonify({"message": "Database connection failed"}), 500
-    
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            cursor.execute("SELECT id, password_hash, team FROM Users WHERE username = %s", (username,))
+            cursor.execute(LOGIN_USER_QUERY, (username,))
             user = cursor.fetchone()
+    except Exception as e:
+        return jsonify({"message": f"An error occurred: {e}"}), 500
+    finally:
+        if conn: conn.close()
 
-            if user and sha256.verify(password, user['password_hash']):
-                token = jwt.encode({
-                    'user_id': user['id'],
-                    'username': username,
-                    'exp': datetime.utcnow() + timedelta(hours=24)
-                }, app.config['SECRET_KEY'], algorithm="HS256")
-                
-                cursor.execute("UPDATE Users SET last_login = NOW() WHERE username = %s", (username,))
-                conn.commit()
-                return jsonify({'message': 'Login successful', 'token': token})
-            else:
-                return jsonify({"message": "Invalid credentials"}), 401
+    try:
+        if not user or not verify_password(password, user['password_hash']):
+            return jsonify({"message": "Invalid credentials"}), 401
+        # 예전 rounds로 만든 해시는 평문을 알고 있는 지금 PASSWORD_HASH_ROUNDS로 다시 만듭니다.
+        new_hash = hash_password(password) if get_password_hasher().needs_update(user['password_hash']) else None
+    except KdfPoolBusy:
+        raise
     except Exception as e:
         return jsonify({"message": f"An error occurred: {e}"}), 500
+
+    token = issue_token(user['id'], username, user['team'], user['token_version'])
+    token_versions.set(user['id'], user['token_version'])
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    try:
+        with conn.cursor() as cursor:
+            if new_hash:
+                # 그사이 비밀번호가 바뀌었으면 덮어쓰지 않습니다.
+                cursor.execute("UPDATE Users SET password_hash = %s WHERE id = %s AND password_hash = %s",
+                               (new_hash, user['id'], user['password_hash']))
+            cursor.execute("UPDATE Users SET last_login = NOW() WHERE id = %s", (user['id'],))
+            conn.commit()
+            return jsonify({'message': 'Login successful', 'token': token})
+    except Exception as e:
+        conn.rollback()
+        return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
 
@@ -111,57 +429,499 @@ def change_password(current_user):
     if len(new_password) < 6:
         return jsonify({"message": "새 비밀번호는 최소 6자 이상이어야 합니다."}), 400
 
+    retry_after = check_login_rate(current_user['username'])
+    if retry_after:
+        return too_many_attempts(retry_after)
+
+    # login과 같이 KDF 계산(현재 비밀번호 검증, 새 해시) 동안에는 커넥션을 반납해 둡니다.
     conn = get_db_connection()
     if not conn: return jsonify({"message": "Database connection failed"}), 500
-
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            # Verify current password
             cursor.execute("SELECT password_hash FROM Users WHERE id = %s", (current_user['id'],))
             user = cursor.fetchone()
+    except Exception as e:
+        logger.exception("Error in change_password")
+        return jsonify({"message": f"비밀번호 변경 중 오류가 발생했습니다: {e}"}), 500
+    finally:
+        if conn: conn.close()
 
-            if not user or not sha256.verify(current_password, user['password_hash']):
-                return jsonify({"message": "현재 비밀번호가 올바르지 않습니다."}), 401
+    try:
+        # Verify current password
+        if not user or not verify_password(current_password, user['password_hash']):
+            return jsonify({"message": "현재 비밀번호가 올바르지 않습니다."}), 401
+        new_password_hash = hash_password(new_password)
+    except KdfPoolBusy:
+        raise
+    except Exception as e:
+        logger.exception("Error in change_password")
+        return jsonify({"message": f"비밀번호 변경 중 오류가 발생했습니다: {e}"}), 500
 
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
             # Hash and update new password
-            new_password_hash = sha256.hash(new_password)
-            cursor.execute("UPDATE Users SET password_hash = %s WHERE id = %s", (new_password_hash, current_user['id']))
+            # 토큰 버전을 올려서 기존에 발급된 토큰을 모두 폐기하고, 이 요청을 보낸 클라이언트에는 새 토큰을 줍니다.
+            # 검증한 뒤에 다른 요청이 비밀번호를 바꿨으면 갱신하지 않습니다.
+            cursor.execute("""
+                UPDATE Users SET password_hash = %s, token_version = token_version + 1
+                WHERE id = %s AND password_hash = %s RETURNING username, team, token_version
+            """, (new_password_hash, current_user['id'], user['password_hash']))
+            updated = cursor.fetchone()
+            if not updated:
+                conn.rollback()
+                return jsonify({"message": "비밀번호가 그사이 변경되었습니다. 다시 시도해주세요."}), 409
             conn.commit()
-            return jsonify({"message": "비밀번호가 성공적으로 변경되었습니다."}), 200
+            token_versions.set(current_user['id'], updated['token_version'])
+            token = issue_token(current_user['id'], updated['username'], updated['team'], updated['token_version'])
+            return jsonify({"message": "비밀번호가 성공적으로 변경되었습니다.", "token": token}), 200
     except Exception as e:
         conn.rollback()
-        print(f"Error in change_password: {e}", flush=True)
+        logger.exception("Error in change_password")
         return jsonify({"message": f"비밀번호 변경 중 오류가 발생했습니다: {e}"}), 500
     finally:
         if conn: conn.close()
 
+# == Pagination / Filtering Helpers ==
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+VALID_STATUSES = ('inProgress', 'completed', 'delayed')
+
+# == Conditional Request (ETag / Last-Modified) Helpers ==
+# 전체 조인/직렬화 전에 COUNT/MAX(updated_at) 같은 가벼운 쿼리로 검증값(validator)을 만들고,
+# 클라이언트의 If-None-Match / If-Modified-Since와 같으면 304를 바로 반환합니다.
+def make_etag(*parts):
+    raw = '|'.join(str(part) for part in parts)
+    return hashlib.md5(raw.encode()).hexdigest()
+
+def table_etag(cursor, table, modified_expr, where='', params=()):
+    cursor.execute(f"SELECT COUNT(*) AS count, MAX({modified_expr}) AS modified FROM {table} {where}", params)
+    row = cursor.fetchone()
+    # 계산된 상태는 날짜에 따라 바뀌므로 오늘 날짜도 검증값에 포함합니다.
+    return make_etag(table, row['count'], row['modified'], request.full_path, datetime.now().date())
+
+# 테이블 전체가 대상인 목록은 COUNT/MAX가 O(테이블)이므로, publish_change가 올리는 종류별 버전(한 행)으로 만듭니다.
+# 사용자별 목록은 parts에 사용자 id를 넣어 다른 사용자의 캐시와 섞이지 않게 합니다.
+# 종류별 버전 시퀀스 (migrations/0009). 쓰기 경로가 커밋한 뒤 bump_version으로 올립니다.
+# reference는 사용자명/업체명/제품명이 바뀌면 트리거가 올립니다. (migrations/0010)
+# 목록은 모두 이 이름들을 조인해서 보여주므로 version_etag는 항상 reference도 함께 읽습니다.
+VERSION_SEQUENCES = {
+    'inspection': 'inspection_version_seq',
+    'quality': 'quality_version_seq',
+    'reference': 'reference_version_seq',
+}
+
+def version_etag_query(entities):
+    columns = ", ".join(f"(SELECT last_value FROM {VERSION_SEQUENCES[entity]}) AS {entity}"
+                        for entity in [*entities, 'reference'])
+    return f"SELECT {columns}"
+
+def version_etag(cursor, entities, *parts):
+    cursor.execute(version_etag_query(entities))
+    return make_etag(*cursor.fetchone().values(), *parts, request.full_path, datetime.now().date())
+
+def bump_version(conn, *entities):
+    # 커밋한 뒤에 올립니다. 커밋 전에 올리면 그 사이 읽은 요청이 새 버전의 ETag로 이전 데이터를 캐시할 수 있습니다.
+    # (커밋 직후~nextval 사이에 읽은 요청은 이전 ETag로 새 데이터를 받을 뿐이라, 다음 요청에서 다시 받습니다.)
+    # nextval은 행을 잠그지 않으므로 동시에 쓰는 요청끼리 기다리지 않습니다.
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT " + ", ".join(f"nextval('{VERSION_SEQUENCES[entity]}')" for entity in entities))
+        conn.commit()
+    except Exception as e:
+        # 변경은 이미 커밋되었으므로 요청은 성공으로 끝냅니다. (ETag는 다음 쓰기나 날짜가 바뀌면 갱신됩니다)
+        logger.warning('version_bump_failed', extra={'fields': {'entities': entities, 'error': str(e)}})
+
+def row_modified(cursor, table, item_id):
+    cursor.execute(f"SELECT GREATEST(created_at, updated_at) AS modified FROM {table} WHERE id = %s", (item_id,))
+    row = cursor.fetchone()
+    return row['modified'] if row else None
+
+def is_not_modified(etag, last_modified=None):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0, tzinfo=None) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+def with_validators(response, etag, last_modified=None):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def not_modified_response(etag, last_modified=None):
+    return with_validators(Response(status=304), etag, last_modified)
+
+# == Delta Sync (updated_since) Helpers ==
+# 다음 동기화 기준 시각(watermark)을 약간 앞당겨서, 늦게 커밋된 트랜잭션의 변경도 놓치지 않게 합니다.
+# 클라이언트는 id 기준으로 병합하므로 일부 행을 중복으로 받아도 문제가 없습니다.
+SYNC_OVERLAP_SECONDS = int(os.getenv('SYNC_OVERLAP_SECONDS', '5'))
+TOMBSTONE_RETENTION_DAYS = int(os.getenv('TOMBSTONE_RETENTION_DAYS', '30'))
+
+class ResyncRequired(Exception):
+    pass
+
+def parse_watermark(value):
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        raise ValueError("updated_since must be an ISO 8601 timestamp")
+
+TOMBSTONES_SINCE_QUERY = "SELECT DISTINCT item_id FROM Tombstones WHERE parent_type = %s AND deleted_at > %s"
+
+def updated_since_clause(alias):
+    return f"GREATEST({alias}.created_at, {alias}.updated_at) > %s"
+
+def fetch_sync_state(cursor, parent_type, since):
+    cursor.execute("""
+        SELECT NOW() - make_interval(secs => %s) AS watermark,
+               %s < NOW() - make_interval(days => %s) AS expired
+    """, (SYNC_OVERLAP_SECONDS, since, TOMBSTONE_RETENTION_DAYS))
+    state = cursor.fetchone()
+    if state['expired']:
+        # 보관 기간이 지난 tombstone은 삭제되므로 전체 목록을 다시 받아야 합니다.
+        raise ResyncRequired()
+    cursor.execute(TOMBSTONES_SINCE_QUERY, (parent_type, since))
+    return state['watermark'], [row['item_id'] for row in cursor.fetchall()]
+
+def record_tombstone(cursor, parent_type, item_id):
+    cursor.execute("INSERT INTO Tombstones (parent_type, item_id) VALUES (%s, %s)", (parent_type, item_id))
+    cursor.execute(
+        "DELETE FROM Tombstones WHERE deleted_at < NOW() - make_interval(days => %s)",
+        (TOMBSTONE_RETENTION_DAYS,)
+    )
+
+@app.errorhandler(ResyncRequired)
+def handle_resync_required(e):
+    return jsonify({"message": "updated_since is older than the sync retention window; reload the full list."}), 410
+
+# == Change Feed (SSE) Helpers ==
+CHANGE_EVENT_RETENTION_HOURS = int(os.getenv('CHANGE_EVENT_RETENTION_HOURS', '24'))
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+SSE_REPLAY_LIMIT = int(os.getenv('SSE_REPLAY_LIMIT', '500'))
+
+change_feed = ChangeFeed(DATABASE_URI, retention_hours=CHANGE_EVENT_RETENTION_HOURS)
+
+def publish_change(cursor, entity, action, user_id, item_id=None, parent_type=None, parent_id=None):
+    # 이벤트를 ChangeEvents에 기록하고 NOTIFY합니다. NOTIFY는 트랜잭션이 커밋될 때만 전달됩니다.
+    cursor.execute("""
+        INSERT INTO ChangeEvents (entity, action, item_id, parent_type, parent_id, user_id)
+        VALUES (%s, %s, %s, %s, %s, %s) RETURNING id, created_at
+    """, (entity, action, item_id, parent_type, parent_id, user_id))
+    row = cursor.fetchone()
+    event_id, created_at = (row['id'], row['created_at']) if isinstance(row, dict) else row
+    event = {
+        'id': event_id, 'entity': entity, 'action': action, 'item_id': item_id,
+        'parent_type': parent_type, 'parent_id': parent_id, 'user_id': user_id,
+        'created_at': created_at.isoformat(),
+    }
+    cursor.execute("SELECT pg_notify(%s, %s)", (CHANGE_CHANNEL, json.dumps(event)))
+
+# == Calculated Status (SQL) ==
+# 상태 계산 규칙: 진행률 100 이상 -> 완료, 마감일이 지났으면 -> 지연, 그 외 -> 진행중
+# 검수/품질 개선 쿼리가 같은 규칙을 쓰도록 SQL로만 계산합니다.
+def status_sql(progress_col, due_col):
+    return f"""
+    CASE
+        WHEN {progress_col} >= 100 THEN 'completed'
+        WHEN {due_col} IS NULL THEN 'inProgress'
+        WHEN CURRENT_DATE > {due_col} THEN 'delayed'
+        ELSE 'inProgress'
+    END
+"""
+
+def status_filter_sql(status, progress_col, due_col):
+    # CASE 식과 같은 의미의 조건식입니다. CASE = %s 대신 이 조건을 쓰면
+    # progress / 마감일 컬럼의 인덱스를 사용할 수 있습니다.
+    not_completed = f"({progress_col} < 100 OR {progress_col} IS NULL)"
+    if status == 'completed':
+        return f"{progress_col} >= 100"
+    if status == 'delayed':
+        return f"{not_completed} AND {due_col} < CURRENT_DATE"
+    if status == 'inProgress':
+        return f"{not_completed} AND ({due_col} IS NULL OR {due_col} >= CURRENT_DATE)"
+    raise ValueError("Invalid status filter")
+
+INSPECTION_STATUS_SQL = status_sql('i.progress_percentage', 'i.target_date')
+QUALITY_STATUS_SQL = status_sql('q.progress', 'q.end_date')
+
+def encode_cursor(created_at, item_id):
+    payload = json.dumps([created_at.isoformat(), item_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return datetime.fromisoformat(created_at), int(item_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def parse_page_size(value):
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if size < 1:
+        raise ValueError("limit must be positive")
+    return min(size, MAX_PAGE_SIZE)
+
 # == Inspections Endpoints ==
+INSPECTION_LIST_FILTERS = {
+    'username': 'u.username = %s',
+    'company_name': 'c.company_name = %s',
+    'product_name': 'p.product_name = %s',
+    'product_code': 'p.product_code = %s',
+    'user_id': 'i.user_id = %s',
+}
+
+# 정수 컬럼과 비교하는 필터. 문자열 그대로 넘기면 psycopg2는 DB에서 500(invalid input syntax)이 나고,
+# asyncpg는 int4 파라미터에 str을 바인딩하지 못하므로 여기서 int로 바꾸고 잘못된 값은 400으로 돌려줍니다.
+INTEGER_FILTERS = ('user_id',)
+
+def filter_value(name, value):
+    if name not in INTEGER_FILTERS:
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+
+def build_inspection_filters(args):
+    where, params = [], []
+    for name, clause in INSPECTION_LIST_FILTERS.items():
+        value = args.get(name)
+        if value and value != 'all':
+            where.append(clause)
+            params.append(filter_value(name, value))
+
+    status = args.get('status')
+    if status and status != 'all':
+        where.append(status_filter_sql(status, 'i.progress_percentage', 'i.target_date'))
+    return where, params
+
+INSPECTION_LIST_QUERY = f"""
+    SELECT i.id, i.user_id, u.username, c.company_name, p.product_name, p.product_code, i.received_date,
+           i.inspected_quantity, i.defective_quantity, i.status,
+           i.defect_reason, i.solution, i.target_date, i.progress_percentage, i.created_at, i.updated_at,
+           {INSPECTION_STATUS_SQL} AS calculated_status
+    FROM Inspections i
+    JOIN Users u ON i.user_id = u.id
+    JOIN Companies c ON i.company_id = c.id
+    JOIN Products p ON i.product_id = p.id
+    {{where_clause}}
+    ORDER BY i.created_at {{order}}, i.id {{order}}
+    {{limit_clause}};
+"""
+
+def inspection_cursor_clause(order):
+    return f"(i.created_at, i.id) {'<' if order == 'desc' else '>'} (%s, %s)"
+
+def split_page(rows, page_size):
+    # page_size + 1개를 조회해서 다음 페이지 존재 여부를 판단합니다.
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+
 @app.route('/api/inspections', methods=['GET'])
 @token_required
 def get_inspections(current_user):
+    args = request.args
+    # limit/cursor가 없으면 기존처럼 전체 목록을 배열로 반환합니다.
+    paginated = 'limit' in args or 'cursor' in args
+    # updated_since가 있으면 그 이후 생성/수정된 행과 삭제된 ID만 반환합니다.
+    delta = 'updated_since' in args
+    if paginated and delta:
+        return jsonify({"message": "updated_since cannot be combined with limit/cursor"}), 400
+
+    order = args.get('order', 'desc').lower()
+    if order not in ('asc', 'desc'):
+        return jsonify({"message": "order must be 'asc' or 'desc'"}), 400
+
+    try:
+        where, params = build_inspection_filters(args)
+        if delta:
+            since = parse_watermark(args['updated_since'])
+            where.append(updated_since_clause('i'))
+            params.append(since)
+        page_size = parse_page_size(args.get('limit'))
+        if args.get('cursor'):
+            cursor_created_at, cursor_id = decode_cursor(args['cursor'])
+            where.append(inspection_cursor_clause(order))
+            params.extend([cursor_created_at, cursor_id])
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+    limit_clause = "LIMIT %s" if paginated else ""
+    if paginated:
+        params.append(page_size + 1)
+
     conn = get_db_connection()
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            query = """
-                SELECT i.id, i.user_id, u.username, c.company_name, p.product_name, p.product_code, i.received_date,
-                       i.inspected_quantity, i.defective_quantity, i.status,
-                       i.defect_reason, i.solution, i.target_date, i.progress_percentage, i.created_at
-                FROM Inspections i
-                JOIN Users u ON i.user_id = u.id
-                JOIN Companies c ON i.company_id = c.id
-                JOIN Products p ON i.product_id = p.id
-                ORDER BY i.created_at DESC;
-            """
-            print(f"Executing query: {query}", flush=True)
-            cursor.execute(query)
+            etag = version_etag(cursor, ['inspection'])
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+            if delta:
+                watermark, deleted = fetch_sync_state(cursor, 'inspection', since)
+
+            query = INSPECTION_LIST_QUERY.format(where_clause=where_clause, order=order.upper(), limit_clause=limit_clause)
+            log_query('get_inspections', query, params)
+            cursor.execute(query, tuple(params))
             inspections = cursor.fetchall()
-            return jsonify(inspections)
+            if delta:
+                return with_validators(jsonify({'items': inspections, 'deleted': deleted, 'watermark': watermark.isoformat()}), etag)
+            if not paginated:
+                return with_validators(jsonify(inspections), etag)
+
+            inspections, next_cursor = split_page(inspections, page_size)
+            return with_validators(jsonify({'items': inspections, 'next_cursor': next_cursor, 'limit': page_size}), etag)
+    except ResyncRequired:
+        raise
+    except Exception as e:
+        return jsonify({"message": f"An error occurred: {e}"}), 500
+    finally:
+        if conn: conn.close()
+
+def summarize_kpis(rows):
+    kpis = {'total': 0, 'completed': 0, 'inProgress': 0, 'delayed': 0,
+            'inspected_quantity': 0, 'defective_quantity': 0}
+    for row in rows:
+        kpis[row['status']] = row['count']
+        kpis['total'] += row['count']
+        kpis['inspected_quantity'] += int(row['inspected_quantity'] or 0)
+        kpis['defective_quantity'] += int(row['defective_quantity'] or 0)
+    inspected = kpis['inspected_quantity']
+    kpis['defect_rate'] = round(kpis['defective_quantity'] / inspected * 100, 2) if inspected else 0.0
+    return kpis
+
+INSPECTION_KPIS_QUERY = f"""
+    SELECT {INSPECTION_STATUS_SQL} AS status,
+           COUNT(*) AS count,
+           SUM(i.inspected_quantity) AS inspected_quantity,
+           SUM(i.defective_quantity) AS defective_quantity
+    FROM Inspections i
+    JOIN Users u ON i.user_id = u.id
+    JOIN Companies c ON i.company_id = c.id
+    JOIN Products p ON i.product_id = p.id
+    {{where_clause}}
+    GROUP BY 1;
+"""
+
+def fetch_inspection_kpis(cursor, where=None, params=()):
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+    cursor.execute(INSPECTION_KPIS_QUERY.format(where_clause=where_clause), tuple(params))
+    return summarize_kpis(cursor.fetchall())
+
+@app.route('/api/inspections/kpis', methods=['GET'])
+@token_required
+def get_inspection_kpis(current_user):
+    try:
+        where, params = build_inspection_filters(request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            return jsonify(fetch_inspection_kpis(cursor, where, params))
+    except Exception as e:
+        return jsonify({"message": f"An error occurred: {e}"}), 500
+    finally:
+        if conn: conn.close()
+
+# == Dashboard Bootstrap ==
+# 필터 옵션은 검사 데이터에 등장하는 담당자/업체/부품입니다. 전체 목록을 훑지 않도록
+# (user_id|company_id|product_id, created_at) 인덱스를 건너뛰며 읽는 재귀 CTE(loose index scan)로 구합니다.
+def distinct_ids_cte(name, column):
+    return f"""{name}(id) AS (
+        (SELECT {column} FROM Inspections ORDER BY {column} LIMIT 1)
+        UNION ALL
+        SELECT (SELECT {column} FROM Inspections WHERE {column} > {name}.id ORDER BY {column} LIMIT 1)
+        FROM {name} WHERE {name}.id IS NOT NULL
+    )"""
+
+INSPECTION_FILTER_OPTIONS_QUERY = f"""
+    WITH RECURSIVE
+    {distinct_ids_cte('user_ids', 'user_id')},
+    {distinct_ids_cte('company_ids', 'company_id')},
+    {distinct_ids_cte('product_ids', 'product_id')}
+    SELECT
+        ARRAY(SELECT u.username FROM user_ids x JOIN Users u ON u.id = x.id ORDER BY 1) AS usernames,
+        ARRAY(SELECT c.company_name FROM company_ids x JOIN Companies c ON c.id = x.id ORDER BY 1) AS company_names,
+        ARRAY(SELECT DISTINCT p.product_name FROM product_ids x JOIN Products p ON p.id = x.id ORDER BY 1) AS product_names;
+"""
+
+def fetch_inspection_filter_options(cursor):
+    generation = ref_list_cache.generation()
+    options = ref_list_cache.get('inspection_filter_options')
+    if options is None:
+        cursor.execute(INSPECTION_FILTER_OPTIONS_QUERY)
+        options = dict(cursor.fetchone())
+        options['statuses'] = list(VALID_STATUSES)
+        ref_list_cache.set('inspection_filter_options', options, generation=generation)
+    return options
+
+@app.route('/api/inspections/bootstrap', methods=['GET'])
+@token_required
+def get_inspection_bootstrap(current_user):
+    # 대시보드 첫 화면: 전체 KPI + 목록 첫 페이지(필터 적용) + 필터 옵션을 한 번에 반환합니다.
+    try:
+        where, params = build_inspection_filters(request.args)
+        page_size = parse_page_size(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            etag = version_etag(cursor, ['inspection'])
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+
+            kpis = fetch_inspection_kpis(cursor)
+            query = INSPECTION_LIST_QUERY.format(where_clause=where_clause, order='DESC', limit_clause='LIMIT %s')
+            log_query('get_inspection_bootstrap', query, params + [page_size + 1])
+            cursor.execute(query, tuple(params + [page_size + 1]))
+            items, next_cursor = split_page(cursor.fetchall(), page_size)
+            filter_options = fetch_inspection_filter_options(cursor)
+            return with_validators(jsonify({
+                'kpis': kpis,
+                'items': items,
+                'next_cursor': next_cursor,
+                'limit': page_size,
+                'filter_options': filter_options,
+            }), etag)
     except Exception as e:
+        logger.exception("Error in get_inspection_bootstrap")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
 
+MY_INSPECTIONS_QUERY = f"""
+    SELECT i.id, u.username, c.company_name, p.product_name, p.product_code, i.received_date,
+           i.inspected_quantity, i.defective_quantity, i.status,
+           i.defect_reason, i.solution, i.target_date, i.progress_percentage, i.created_at,
+           {INSPECTION_STATUS_SQL} AS calculated_status
+    FROM Inspections i
+    JOIN Users u ON i.user_id = u.id
+    JOIN Companies c ON i.company_id = c.id
+    JOIN Products p ON i.product_id = p.id
+    WHERE i.user_id = %s
+    ORDER BY i.created_at DESC;
+"""
+
 @app.route('/api/my-inspections', methods=['GET'])
 @token_required
 def get_my_inspections(current_user):
@@ -169,21 +929,15 @@ def get_my_inspections(current_user):
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            query = """
-                SELECT i.id, u.username, c.company_name, p.product_name, p.product_code, i.received_date,
-                       i.inspected_quantity, i.defective_quantity, i.status,
-                       i.defect_reason, i.solution, i.target_date, i.progress_percentage, i.created_at
-                FROM Inspections i
-                JOIN Users u ON i.user_id = u.id
-                JOIN Companies c ON i.company_id = c.id
-                JOIN Products p ON i.product_id = p.id
-                WHERE i.user_id = %s
-                ORDER BY i.created_at DESC;
-            """
-            print(f"Executing query: {query} with params: {current_user['id']}", flush=True)
+            etag = version_etag(cursor, ['inspection'], current_user['id'])
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+
+            query = MY_INSPECTIONS_QUERY
+            log_query('get_my_inspections', query, [current_user['id']])
             cursor.execute(query, (current_user['id'],))
             inspections = cursor.fetchall()
-            return jsonify(inspections)
+            return with_validators(jsonify(inspections), etag)
     except Exception as e:
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
@@ -193,31 +947,18 @@ def get_my_inspections(current_user):
 @token_required
 def add_inspection(current_user):
     data = request.get_json()
-    print(f"add_inspection received data: {data}", flush=True)
     conn = get_db_connection()
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
             # Company ID
             company_name = data['company_name']
-            cursor.execute("SELECT id FROM Companies WHERE company_name = %s", (company_name,))
-            company = cursor.fetchone()
-            if company:
-                company_id = company['id']
-            else:
-                cursor.execute("INSERT INTO Companies (company_name) VALUES (%s) RETURNING id", (company_name,))
-                company_id = cursor.fetchone()['id']
+            company_id, company_created = get_or_create_company(cursor, company_name)
 
             # Product ID
             product_name = data['product_name']
             product_code = data['product_code']
-            cursor.execute("SELECT id FROM Products WHERE product_code = %s", (product_code,))
-            product = cursor.fetchone()
-            if product:
-                product_id = product['id']
-            else:
-                cursor.execute("INSERT INTO Products (product_name, product_code) VALUES (%s, %s) RETURNING id", (product_name, product_code))
-                product_id = cursor.fetchone()['id']
+            product_id, _ = get_or_create_product(cursor, product_code, product_name)
 
             # Insert Inspection
             params = (
@@ -230,15 +971,23 @@ def add_inspection(current_user):
             insert_query = """
                 INSERT INTO Inspections (company_id, product_id, user_id, inspected_quantity, defective_quantity, defect_reason, solution, received_date, target_date, progress_percentage, status)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
             """
-            print(f"add_inspection executing query: {insert_query}", flush=True)
-            print(f"add_inspection with params: {params}", flush=True)
+            log_query('add_inspection', insert_query, params)
             cursor.execute(insert_query, params)
+            new_id = cursor.fetchone()['id']
+            sync_search_documents(cursor, 'inspection', [new_id])
+            apply_inspection_rollup(cursor, [new_id], 1)
+            publish_change(cursor, 'inspection', 'created', current_user['id'], new_id)
             conn.commit()
+            bump_version(conn, 'inspection')
+            remember_company(company_name, company_id, company_created)
+            remember_product(product_code, product_id)
+            ref_list_cache.delete('inspection_filter_options')
             return jsonify({"message": "검수 데이터가 성공적으로 추가되었습니다."}), 201
     except Exception as e:
         conn.rollback()
-        print(f"Error in add_inspection: {e}", flush=True) # Detailed error logging
+        logger.exception("Error in add_inspection")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
@@ -250,6 +999,13 @@ def get_inspection_detail(current_user, id):
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            modified = row_modified(cursor, 'Inspections', id)
+            if modified is None:
+                return jsonify({"message": "Inspection not found"}), 404
+            etag = make_etag('Inspections', id, modified)
+            if is_not_modified(etag, modified):
+                return not_modified_response(etag, modified)
+
             query = """
                 SELECT i.*, u.username, c.company_name, p.product_name, p.product_code, i.received_date
                 FROM Inspections i
@@ -258,12 +1014,12 @@ def get_inspection_detail(current_user, id):
                 JOIN Products p ON i.product_id = p.id
                 WHERE i.id = %s;
             """
-            print(f"Executing query: {query} with id: {id}", flush=True)
+            log_query('get_inspection_detail', query, [id])
             cursor.execute(query, (id,))
             inspection = cursor.fetchone()
             if not inspection:
                 return jsonify({"message": "Inspection not found"}), 404
-            return jsonify(inspection)
+            return with_validators(jsonify(inspection), etag, modified)
     except Exception as e:
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
@@ -292,7 +1048,8 @@ def update_inspection(current_user, id):
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
             # Step 1: Get current state of the item
-            cursor.execute("SELECT * FROM Inspections WHERE id = %s", (id,))
+            # 행 잠금을 먼저 잡아야 동시에 수정할 때 같은 이전 값을 일별 합계에서 두 번 빼지 않습니다.
+            cursor.execute("SELECT * FROM Inspections WHERE id = %s FOR UPDATE", (id,))
             old_item = cursor.fetchone()
 
             if not old_item:
@@ -312,31 +1069,28 @@ def update_inspection(current_user, id):
             params.append(id)
             
             query = f"UPDATE Inspections SET {set_clause} WHERE id = %s"
+            rollup_changed = bool(ROLLUP_FIELDS & set(update_fields))
+            if rollup_changed:
+                apply_inspection_rollup(cursor, [id], -1)
             cursor.execute(query, tuple(params))
+            if rollup_changed:
+                apply_inspection_rollup(cursor, [id], 1)
 
-            # Step 3: Log changes to Histories table
-            for field in update_fields:
-                old_value = old_item.get(field)
-                new_value = data.get(field)
-                
-                # To prevent logging for non-changes (e.g. None vs '')
-                old_value_str = str(old_value) if old_value is not None else ""
-                new_value_str = str(new_value) if new_value is not None else ""
-
-                if old_value_str != new_value_str:
-                    field_name_kor = field_names.get(field, field)
-                    action_log = f"'{field_name_kor}' 변경 ({old_value_str} -> {new_value_str})"
-                    cursor.execute(
-                        "INSERT INTO Histories (user_id, parent_id, parent_type, action) VALUES (%s, %s, %s, %s)",
-                        (current_user['id'], id, 'inspection', action_log)
-                    )
+            # Step 3: Log changes to Histories table (한 행, 한 번의 INSERT)
+            history_logged = log_history_changes(cursor, current_user['id'], 'inspection', id,
+                                                 old_item, data, update_fields, field_names)
 
+            sync_search_documents(cursor, 'inspection', [id])
+            publish_change(cursor, 'inspection', 'updated', current_user['id'], id)
+            if history_logged:
+                publish_change(cursor, 'history', 'created', current_user['id'], parent_type='inspection', parent_id=id)
             conn.commit()
+            bump_version(conn, 'inspection')
             return jsonify({"message": "Inspection updated successfully"})
     except Exception as e:
         conn.rollback()
         # Provide more detailed error in log
-        print(f"Error in update_inspection: {e}", flush=True)
+        logger.exception("Error in update_inspection")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
@@ -348,16 +1102,26 @@ def delete_inspection(current_user, id):
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            # Author verification
-            cursor.execute("SELECT user_id FROM Inspections WHERE id = %s", (id,))
+            # Author verification (행을 잠가서 동시에 삭제할 때 일별 합계에서 두 번 빼지 않도록 합니다)
+            cursor.execute("SELECT user_id FROM Inspections WHERE id = %s FOR UPDATE", (id,))
             inspection = cursor.fetchone()
             if not inspection:
                 return jsonify({"message": "Inspection not found"}), 404
             if inspection['user_id'] != current_user['id'] and not is_admin(current_user):
                 return jsonify({"message": "Permission denied"}), 403
 
+            apply_inspection_rollup(cursor, [id], -1)
             cursor.execute("DELETE FROM Inspections WHERE id = %s", (id,))
+            if cursor.rowcount == 0:
+                conn.rollback()
+                return jsonify({"message": "Inspection not found"}), 404
+            record_tombstone(cursor, 'inspection', id)
+            remove_search_documents(cursor, 'inspection', id)
+            publish_change(cursor, 'inspection', 'deleted', current_user['id'], id)
             conn.commit()
+            bump_version(conn, 'inspection')
+            # 마지막 검수가 지워진 업체/제품/작성자가 필터 옵션에 남지 않도록 합니다.
+            ref_list_cache.delete('inspection_filter_options')
             return jsonify({"message": "Inspection deleted successfully"})
     except Exception as e:
         conn.rollback()
@@ -368,12 +1132,17 @@ def delete_inspection(current_user, id):
 @app.route('/api/companies', methods=['GET'])
 @token_required
 def get_companies(current_user):
+    generation = ref_list_cache.generation()
+    companies = ref_list_cache.get('companies')
+    if companies is not None:
+        return jsonify(companies)
     conn = get_db_connection()
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
             cursor.execute("SELECT id, company_name FROM Companies ORDER BY company_name")
             companies = cursor.fetchall()
+            ref_list_cache.set('companies', companies, generation=generation)
             return jsonify(companies)
     except Exception as e:
         return jsonify({"message": f"An error occurred: {e}"}), 500
@@ -383,12 +1152,17 @@ def get_companies(current_user):
 @app.route('/users', methods=['GET'])
 @token_required
 def get_users(current_user):
+    generation = ref_list_cache.generation()
+    users = ref_list_cache.get('users')
+    if users is not None:
+        return jsonify(users)
     conn = get_db_connection()
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
             cursor.execute("SELECT id, username FROM Users ORDER BY username")
             users = cursor.fetchall()
+            ref_list_cache.set('users', users, generation=generation)
             return jsonify(users)
     except Exception as e:
         return jsonify({"message": f"An error occurred: {e}"}), 500
@@ -397,48 +1171,68 @@ def get_users(current_user):
 
 # == Quality Improvement Endpoints ==
 
-def calculate_status_py(progress, end_date):
-    if progress is not None and progress >= 100:
-        return 'completed'
-    if not end_date:
-        return 'inProgress'
-    
-    today = datetime.now().date()
-    
-    end_date_obj = end_date
-    if isinstance(end_date, str):
-        try:
-            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-        except (ValueError, TypeError):
-            return 'inProgress'
-
-    if isinstance(end_date, datetime):
-        end_date_obj = end_date.date()
-
-    if today > end_date_obj:
-        return 'delayed'
-    else:
-        return 'inProgress'
+QUALITY_LIST_FILTERS = {
+    'username': 'u.username = %s',
+    'company_name': 'c.company_name = %s',
+    'user_id': 'q.user_id = %s',
+}
+
+def build_quality_filters(args):
+    where, params = [], []
+    for name, clause in QUALITY_LIST_FILTERS.items():
+        value = args.get(name)
+        if value and value != 'all':
+            where.append(clause)
+            params.append(filter_value(name, value))
+
+    status = args.get('status')
+    if status and status != 'all':
+        where.append(status_filter_sql(status, 'q.progress', 'q.end_date'))
+    return where, params
+
+QUALITY_LIST_QUERY = f"""
+    SELECT q.id, q.user_id, u.username, c.company_name, q.item_description, q.status, q.start_date, q.end_date, q.progress,
+           q.created_at, q.updated_at, {QUALITY_STATUS_SQL} AS calculated_status
+    FROM QualityImprovements q
+    JOIN Users u ON q.user_id = u.id
+    JOIN Companies c ON q.company_id = c.id
+    {{where_clause}}
+    ORDER BY q.created_at DESC;
+"""
 
 @app.route('/api/quality-improvements', methods=['GET'])
 @token_required
 def get_quality_improvements(current_user):
+    # updated_since가 있으면 그 이후 생성/수정된 행과 삭제된 ID만 반환합니다.
+    delta = 'updated_since' in request.args
+    try:
+        where, params = build_quality_filters(request.args)
+        if delta:
+            since = parse_watermark(request.args['updated_since'])
+            where.append(updated_since_clause('q'))
+            params.append(since)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+
     conn = get_db_connection()
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            query = """
-                SELECT q.id, q.user_id, u.username, c.company_name, q.item_description, q.status, q.start_date, q.end_date, q.progress
-                FROM QualityImprovements q
-                JOIN Users u ON q.user_id = u.id
-                JOIN Companies c ON q.company_id = c.id
-                ORDER BY q.created_at DESC;
-            """
-            cursor.execute(query)
+            etag = version_etag(cursor, ['quality'])
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+            if delta:
+                watermark, deleted = fetch_sync_state(cursor, 'quality', since)
+
+            query = QUALITY_LIST_QUERY.format(where_clause=where_clause)
+            cursor.execute(query, tuple(params))
             items = cursor.fetchall()
-            for item in items:
-                item['calculated_status'] = calculate_status_py(item.get('progress'), item.get('end_date'))
-            return jsonify(items)
+            if delta:
+                return with_validators(jsonify({'items': items, 'deleted': deleted, 'watermark': watermark.isoformat()}), etag)
+            return with_validators(jsonify(items), etag)
+    except ResyncRequired:
+        raise
     except Exception as e:
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
@@ -451,20 +1245,15 @@ def add_quality_improvement(current_user):
     conn = get_db_connection()
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
-        with conn.cursor() as cursor:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
             # Get company_id
             company_name = data['company_name']
-            cursor.execute("SELECT id FROM Companies WHERE company_name = %s", (company_name,))
-            company = cursor.fetchone()
-            if company:
-                company_id = company[0]
-            else:
-                cursor.execute("INSERT INTO Companies (company_name) VALUES (%s) RETURNING id", (company_name,))
-                company_id = cursor.fetchone()[0]
+            company_id, company_created = get_or_create_company(cursor, company_name)
 
             query = """
                 INSERT INTO QualityImprovements (user_id, company_id, item_description, start_date, end_date, progress, status)
                 VALUES (%s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
             """
             params = (
                 current_user['id'],
@@ -476,7 +1265,12 @@ def add_quality_improvement(current_user):
                 data.get('status', 'inProgress')
             )
             cursor.execute(query, params)
+            new_id = cursor.fetchone()['id']
+            sync_search_documents(cursor, 'quality', [new_id])
+            publish_change(cursor, 'quality', 'created', current_user['id'], new_id)
             conn.commit()
+            bump_version(conn, 'quality')
+            remember_company(company_name, company_id, company_created)
             return jsonify({"message": "Quality improvement item added successfully"}), 201
     except Exception as e:
         conn.rollback()
@@ -491,6 +1285,13 @@ def get_quality_improvement_detail(current_user, id):
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            modified = row_modified(cursor, 'QualityImprovements', id)
+            if modified is None:
+                return jsonify({"message": "Item not found"}), 404
+            etag = make_etag('QualityImprovements', id, modified)
+            if is_not_modified(etag, modified):
+                return not_modified_response(etag, modified)
+
             query = """
                 SELECT q.*, u.username, c.company_name
                 FROM QualityImprovements q
@@ -502,7 +1303,7 @@ def get_quality_improvement_detail(current_user, id):
             item = cursor.fetchone()
             if not item:
                 return jsonify({"message": "Item not found"}), 404
-            return jsonify(item)
+            return with_validators(jsonify(item), etag, modified)
     except Exception as e:
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
@@ -547,27 +1348,20 @@ def update_quality_improvement(current_user, id):
             query = f"UPDATE QualityImprovements SET {set_clause} WHERE id = %s"
             cursor.execute(query, tuple(params))
 
-            # Step 3: Log changes
-            for field in update_fields:
-                old_value = old_item.get(field)
-                new_value = data.get(field)
-
-                old_value_str = str(old_value) if old_value is not None else ""
-                new_value_str = str(new_value) if new_value is not None else ""
-
-                if old_value_str != new_value_str:
-                    field_name_kor = field_names.get(field, field)
-                    action_log = f"'{field_name_kor}' 변경 ({old_value_str} -> {new_value_str})"
-                    cursor.execute(
-                        "INSERT INTO Histories (user_id, parent_id, parent_type, action) VALUES (%s, %s, %s, %s)",
-                        (current_user['id'], id, 'quality', action_log)
-                    )
+            # Step 3: Log changes (한 행, 한 번의 INSERT)
+            history_logged = log_history_changes(cursor, current_user['id'], 'quality', id,
+                                                 old_item, data, update_fields, field_names)
 
+            sync_search_documents(cursor, 'quality', [id])
+            publish_change(cursor, 'quality', 'updated', current_user['id'], id)
+            if history_logged:
+                publish_change(cursor, 'history', 'created', current_user['id'], parent_type='quality', parent_id=id)
             conn.commit()
+            bump_version(conn, 'quality')
             return jsonify({"message": "Quality improvement item updated successfully"})
     except Exception as e:
         conn.rollback()
-        print(f"Error in update_quality_improvement: {e}", flush=True)
+        logger.exception("Error in update_quality_improvement")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
@@ -579,7 +1373,8 @@ def delete_quality_improvement(current_user, id):
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            cursor.execute("SELECT user_id FROM QualityImprovements WHERE id = %s", (id,))
+            # 행을 잠가서 동시에 삭제할 때 삭제 기록/이벤트가 두 번 남지 않도록 합니다. (delete_inspection과 같음)
+            cursor.execute("SELECT user_id FROM QualityImprovements WHERE id = %s FOR UPDATE", (id,))
             item = cursor.fetchone()
             if not item:
                 return jsonify({"message": "Item not found"}), 404
@@ -589,7 +1384,14 @@ def delete_quality_improvement(current_user, id):
             cursor.execute("DELETE FROM Comments WHERE parent_id = %s AND parent_type = 'quality'", (id,))
             cursor.execute("DELETE FROM Histories WHERE parent_id = %s AND parent_type = 'quality'", (id,))
             cursor.execute("DELETE FROM QualityImprovements WHERE id = %s", (id,))
+            if cursor.rowcount == 0:
+                conn.rollback()
+                return jsonify({"message": "Item not found"}), 404
+            record_tombstone(cursor, 'quality', id)
+            remove_search_documents(cursor, 'quality', id)
+            publish_change(cursor, 'quality', 'deleted', current_user['id'], id)
             conn.commit()
+            bump_version(conn, 'quality')
             return jsonify({"message": "Quality improvement item deleted successfully"})
     except Exception as e:
         conn.rollback()
@@ -597,6 +1399,16 @@ def delete_quality_improvement(current_user, id):
     finally:
         if conn: conn.close()
 
+MY_QUALITY_QUERY = f"""
+    SELECT q.id, u.username, c.company_name, q.item_description, q.status, q.start_date, q.end_date, q.progress,
+           {QUALITY_STATUS_SQL} AS calculated_status
+    FROM QualityImprovements q
+    JOIN Users u ON q.user_id = u.id
+    JOIN Companies c ON q.company_id = c.id
+    WHERE q.user_id = %s
+    ORDER BY q.created_at DESC;
+"""
+
 @app.route('/api/my-quality-improvements', methods=['GET'])
 @token_required
 def get_my_quality_improvements(current_user):
@@ -604,23 +1416,586 @@ def get_my_quality_improvements(current_user):
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            query = """
-                SELECT q.id, u.username, c.company_name, q.item_description, q.status, q.start_date, q.end_date, q.progress
-                FROM QualityImprovements q
-                JOIN Users u ON q.user_id = u.id
-                JOIN Companies c ON q.company_id = c.id
-                WHERE q.user_id = %s
-                ORDER BY q.created_at DESC;
-            """
-            cursor.execute(query, (current_user['id'],))
+            etag = version_etag(cursor, ['quality'], current_user['id'])
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+
+            cursor.execute(MY_QUALITY_QUERY, (current_user['id'],))
             items = cursor.fetchall()
-            return jsonify(items)
+            return with_validators(jsonify(items), etag)
+    except Exception as e:
+        return jsonify({"message": f"An error occurred: {e}"}), 500
+    finally:
+        if conn: conn.close()
+
+# == My Posts Feed ==
+# 내 검사/품질개선 항목을 최근 활동 시각(생성 또는 수정) 순서로 하나의 목록으로 합쳐서 페이지 단위로 반환합니다.
+# 정렬 키: (activity_at, kind, id) 내림차순. 각 분기는 (user_id, activity_at, id) 인덱스에서 limit + 1행만 읽습니다.
+MY_POSTS_FIELDS = {
+    'inspection': ('product_name', 'product_code', 'received_date', 'inspected_quantity', 'defective_quantity',
+                   'defect_reason', 'solution', 'target_date', 'progress_percentage'),
+    'quality': ('item_description', 'start_date', 'end_date', 'progress'),
+}
+MY_POSTS_COMMON_FIELDS = ('kind', 'id', 'user_id', 'username', 'company_name', 'status', 'calculated_status',
+                          'created_at', 'updated_at', 'activity_at')
+
+MY_POSTS_QUERY = f"""
+    (SELECT 'inspection' AS kind, i.id, i.user_id, u.username, c.company_name, i.status,
+            {INSPECTION_STATUS_SQL} AS calculated_status, i.created_at, i.updated_at,
+            GREATEST(i.created_at, i.updated_at) AS activity_at,
+            p.product_name, p.product_code, i.received_date, i.inspected_quantity, i.defective_quantity,
+            i.defect_reason, i.solution, i.target_date, i.progress_percentage,
+            NULL::text AS item_description, NULL::date AS start_date, NULL::date AS end_date, NULL::integer AS progress
+     FROM Inspections i
+     JOIN Users u ON i.user_id = u.id
+     JOIN Companies c ON i.company_id = c.id
+     JOIN Products p ON i.product_id = p.id
+     WHERE i.user_id = %s {{inspection_after}}
+     ORDER BY GREATEST(i.created_at, i.updated_at) DESC, i.id DESC
+     LIMIT %s)
+    UNION ALL
+    (SELECT 'quality' AS kind, q.id, q.user_id, u.username, c.company_name, q.status,
+            {QUALITY_STATUS_SQL} AS calculated_status, q.created_at, q.updated_at,
+            GREATEST(q.created_at, q.updated_at) AS activity_at,
+            NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL,
+            q.item_description, q.start_date, q.end_date, q.progress
+     FROM QualityImprovements q
+     JOIN Users u ON q.user_id = u.id
+     JOIN Companies c ON q.company_id = c.id
+     WHERE q.user_id = %s {{quality_after}}
+     ORDER BY GREATEST(q.created_at, q.updated_at) DESC, q.id DESC
+     LIMIT %s)
+    ORDER BY activity_at DESC, kind DESC, id DESC
+    LIMIT %s;
+"""
+
+def encode_feed_cursor(activity_at, kind, item_id):
+    payload = json.dumps([activity_at.isoformat(), kind, item_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_feed_cursor(cursor):
+    try:
+        activity_at, kind, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        if kind not in MY_POSTS_FIELDS:
+            raise ValueError(kind)
+        return datetime.fromisoformat(activity_at), kind, int(item_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def feed_after_clause(kind, alias, cursor_value):
+    # (activity_at, kind, id) < 커서 조건을 분기별로 풀어 씁니다. 분기 안에서 kind는 상수이므로
+    # 각 분기의 조건이 인덱스 범위 조건이 됩니다.
+    if cursor_value is None:
+        return "", []
+    activity_at, cursor_kind, cursor_id = cursor_value
+    activity = f"GREATEST({alias}.created_at, {alias}.updated_at)"
+    if kind < cursor_kind:
+        return f"AND {activity} <= %s", [activity_at]
+    if kind > cursor_kind:
+        return f"AND {activity} < %s", [activity_at]
+    return f"AND ({activity}, {alias}.id) < (%s, %s)", [activity_at, cursor_id]
+
+@app.route('/api/my-posts', methods=['GET'])
+@token_required
+def get_my_posts(current_user):
+    try:
+        page_size = parse_page_size(request.args.get('limit'))
+        cursor_value = decode_feed_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    user_id = current_user['id']
+    inspection_after, inspection_params = feed_after_clause('inspection', 'i', cursor_value)
+    quality_after, quality_params = feed_after_clause('quality', 'q', cursor_value)
+    query = MY_POSTS_QUERY.format(inspection_after=inspection_after, quality_after=quality_after)
+    params = ([user_id] + inspection_params + [page_size + 1]
+              + [user_id] + quality_params + [page_size + 1]
+              + [page_size + 1])
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            etag = version_etag(cursor, ['inspection', 'quality'], 'my-posts', user_id)
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+
+            log_query('get_my_posts', query, params)
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                last = rows[-1]
+                next_cursor = encode_feed_cursor(last['activity_at'], last['kind'], last['id'])
+            items = [
+                {field: row[field] for field in MY_POSTS_COMMON_FIELDS + MY_POSTS_FIELDS[row['kind']]}
+                for row in rows
+            ]
+            return with_validators(jsonify({'items': items, 'next_cursor': next_cursor, 'limit': page_size}), etag)
+    except Exception as e:
+        logger.exception("Error in get_my_posts")
+        return jsonify({"message": f"An error occurred: {e}"}), 500
+    finally:
+        if conn: conn.close()
+
+# == Defect Analytics ==
+# InspectionDailyStats(일/업체/제품/담당자별 합계)에서 기간 단위로 다시 합산하므로 Inspections 전체를 읽지 않습니다.
+# 합계 행은 검사 추가/수정/삭제/가져오기 핸들러가 apply_inspection_rollup으로 같은 트랜잭션 안에서 증감합니다.
+ROLLUP_DATE_SQL = "COALESCE(i.received_date, i.created_at::date)"
+# 이 필드가 바뀌는 수정만 합계를 다시 계산합니다.
+ROLLUP_FIELDS = {'inspected_quantity', 'defective_quantity', 'received_date', 'progress_percentage'}
+
+ANALYTICS_BUCKETS = ('day', 'week', 'month')
+ANALYTICS_DEFAULT_DAYS = 365
+# group_by -> (합계 테이블/검사 테이블의 그룹 컬럼, 이름 조회 JOIN, 이름 식)
+ANALYTICS_GROUPS = {
+    'none': (None, '', None),
+    'company': ('company_id', 'JOIN Companies g ON g.id = x.group_id', 'g.company_name'),
+    'product': ('product_id', 'JOIN Products g ON g.id = x.group_id', "g.product_name || ' (' || g.product_code || ')'"),
+    'inspector': ('user_id', 'JOIN Users g ON g.id = x.group_id', 'g.username'),
+}
+
+def apply_inspection_rollup(cursor, inspection_ids, sign):
+    # sign=1: 현재 행을 합계에 더함 (추가 후 / 수정 후), sign=-1: 뺌 (수정 전 / 삭제 전)
+    cursor.execute(f"""
+        INSERT INTO InspectionDailyStats AS s
+            (stat_date, company_id, product_id, user_id, inspections, inspected_quantity, defective_quantity, completed)
+        SELECT {ROLLUP_DATE_SQL}, i.company_id, i.product_id, i.user_id,
+               %(sign)s * COUNT(*),
+               %(sign)s * COALESCE(SUM(i.inspected_quantity), 0),
+               %(sign)s * COALESCE(SUM(i.defective_quantity), 0),
+               %(sign)s * COUNT(*) FILTER (WHERE i.progress_percentage >= 100)
+        FROM Inspections i
+        WHERE i.id = ANY(%(ids)s)
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (stat_date, company_id, product_id, user_id) DO UPDATE
+        SET inspections = s.inspections + EXCLUDED.inspections,
+            inspected_quantity = s.inspected_quantity + EXCLUDED.inspected_quantity,
+            defective_quantity = s.defective_quantity + EXCLUDED.defective_quantity,
+            completed = s.completed + EXCLUDED.completed
+    """, {'sign': sign, 'ids': list(inspection_ids)})
+
+def analytics_queries(group_by):
+    # (기간별 합계 쿼리, 기간별 지연 건수 쿼리)
+    group_column, group_join, group_label = ANALYTICS_GROUPS[group_by]
+    totals_query = f"""
+        SELECT x.period, x.group_id, {group_label or 'NULL'} AS "group",
+               x.inspections, x.inspected_quantity, x.defective_quantity, x.completed
+        FROM (
+            SELECT date_trunc(%(bucket)s, s.stat_date)::date AS period, {f's.{group_column}' if group_column else '0'} AS group_id,
+                   SUM(s.inspections) AS inspections, SUM(s.inspected_quantity) AS inspected_quantity,
+                   SUM(s.defective_quantity) AS defective_quantity, SUM(s.completed) AS completed
+            FROM InspectionDailyStats s
+            WHERE s.stat_date BETWEEN %(from)s AND %(to)s
+            GROUP BY 1, 2
+            HAVING SUM(s.inspections) > 0
+        ) x
+        {group_join}
+        ORDER BY x.period, 3;
+    """
+    # 지연 건수: 완료되지 않은 검사만 담는 부분 인덱스(inspections_open_target_date_idx)로 조회합니다.
+    delayed_query = f"""
+        SELECT date_trunc(%(bucket)s, {ROLLUP_DATE_SQL})::date AS period,
+               {f'i.{group_column}' if group_column else '0'} AS group_id, COUNT(*) AS delayed
+        FROM Inspections i
+        WHERE {status_filter_sql('delayed', 'i.progress_percentage', 'i.target_date')}
+          AND {ROLLUP_DATE_SQL} BETWEEN %(from)s AND %(to)s
+        GROUP BY 1, 2;
+    """
+    return totals_query, delayed_query
+
+def parse_date_arg(value, default):
+    if not value:
+        return default
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError("Dates must be in YYYY-MM-DD format")
+
+@app.route('/api/analytics/defects', methods=['GET'])
+@token_required
+def get_defect_analytics(current_user):
+    bucket = request.args.get('bucket', 'month')
+    group_by = request.args.get('group_by', 'none')
+    if bucket not in ANALYTICS_BUCKETS:
+        return jsonify({"message": f"bucket must be one of {', '.join(ANALYTICS_BUCKETS)}"}), 400
+    if group_by not in ANALYTICS_GROUPS:
+        return jsonify({"message": f"group_by must be one of {', '.join(ANALYTICS_GROUPS)}"}), 400
+    try:
+        today = datetime.now().date()
+        date_to = parse_date_arg(request.args.get('to'), today)
+        date_from = parse_date_arg(request.args.get('from'), date_to - timedelta(days=ANALYTICS_DEFAULT_DAYS))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    if date_from > date_to:
+        return jsonify({"message": "from must not be after to"}), 400
+
+    params = {'bucket': bucket, 'from': date_from, 'to': date_to}
+    totals_query, delayed_query = analytics_queries(group_by)
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            log_query('get_defect_analytics', totals_query, params)
+            cursor.execute(totals_query, params)
+            rows = cursor.fetchall()
+            cursor.execute(delayed_query, params)
+            delayed = {(row['period'], row['group_id']): row['delayed'] for row in cursor.fetchall()}
+
+            series = []
+            for row in rows:
+                inspected = int(row['inspected_quantity'])
+                defective = int(row['defective_quantity'])
+                series.append({
+                    'period': row['period'].isoformat(),
+                    'group_id': row['group_id'] if group_by != 'none' else None,
+                    'group': row['group'],
+                    'inspections': int(row['inspections']),
+                    'inspected_quantity': inspected,
+                    'defective_quantity': defective,
+                    'defect_rate': round(defective / inspected * 100, 2) if inspected else 0.0,
+                    'completed': int(row['completed']),
+                    'delayed': delayed.get((row['period'], row['group_id']), 0),
+                })
+            return jsonify({
+                'bucket': bucket,
+                'group_by': group_by,
+                'from': date_from.isoformat(),
+                'to': date_to.isoformat(),
+                'series': series,
+            })
     except Exception as e:
+        logger.exception("Error in get_defect_analytics")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
 
+# == Export Endpoints ==
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))
+XLSX_CHUNK_SIZE = 64 * 1024
+
+INSPECTION_EXPORT_COLUMNS = [
+    ('id', 'ID'), ('username', '담당자'), ('company_name', '업체명'), ('product_name', '제품명'),
+    ('product_code', '제품코드'), ('received_date', '접수일'), ('inspected_quantity', '검사수량'),
+    ('defective_quantity', '불량수량'), ('defect_reason', '불량 원인'), ('solution', '해결 방안'),
+    ('target_date', '마감일'), ('progress_percentage', '진행률'), ('calculated_status', '상태'),
+    ('created_at', '작성일'),
+]
+
+QUALITY_EXPORT_COLUMNS = [
+    ('id', 'ID'), ('username', '담당자'), ('company_name', '업체명'), ('item_description', '개선항목'),
+    ('start_date', '시작일'), ('end_date', '마감일'), ('progress', '진행률'),
+    ('calculated_status', '상태'), ('created_at', '작성일'),
+]
+
+def iter_row_batches(conn, query, params):
+    # 서버 측(named) 커서로 EXPORT_BATCH_SIZE씩 나눠 읽어서 메모리 사용량을 일정하게 유지합니다.
+    with conn.cursor(name=f"export_{uuid.uuid4().hex}") as cursor:
+        cursor.itersize = EXPORT_BATCH_SIZE
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            yield rows
+    conn.rollback()
+
+def generate_csv(conn, columns, query, params):
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        buffer.write('\ufeff')  # Excel에서 한글이 깨지지 않도록 BOM 추가
+        writer.writerow([header for _, header in columns])
+        for rows in iter_row_batches(conn, query, params):
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        conn.close()
+
+def xlsx_value(value):
+    # Excel은 timezone 정보가 있는 datetime을 저장할 수 없습니다.
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+def generate_xlsx(conn, columns, query, params):
+    from openpyxl import Workbook
+
+    try:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append([header for _, header in columns])
+        for rows in iter_row_batches(conn, query, params):
+            for row in rows:
+                sheet.append([xlsx_value(value) for value in row])
+    finally:
+        conn.close()
+
+    # write_only 모드는 행을 임시 파일로 흘려보내므로 전체 데이터를 메모리에 올리지 않습니다.
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(XLSX_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+def export_response(conn, name, columns, query, params, fmt):
+    filename = f"{name}_{datetime.now().strftime('%Y%m%d')}.{fmt}"
+    if fmt == 'xlsx':
+        body = generate_xlsx(conn, columns, query, params)
+        mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    else:
+        body = generate_csv(conn, columns, query, params)
+        mimetype = 'text/csv; charset=utf-8'
+    response = Response(body, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    # 스트림이 시작되기 전에 연결이 끊겨도 커넥션이 풀로 반납되도록 합니다.
+    response.call_on_close(conn.close)
+    return response
+
+def parse_export_format(args):
+    fmt = args.get('format', 'csv').lower()
+    if fmt not in ('csv', 'xlsx'):
+        raise ValueError("format must be 'csv' or 'xlsx'")
+    return fmt
+
+@app.route('/api/inspections/export', methods=['GET'])
+@token_required
+def export_inspections(current_user):
+    try:
+        fmt = parse_export_format(request.args)
+        where, params = build_inspection_filters(request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+    select_list = ", ".join(column for column, _ in INSPECTION_EXPORT_COLUMNS)
+    query = f"""
+        SELECT {select_list}
+        FROM (
+            SELECT i.id, u.username, c.company_name, p.product_name, p.product_code, i.received_date,
+                   i.inspected_quantity, i.defective_quantity, i.defect_reason, i.solution, i.target_date,
+                   i.progress_percentage, {INSPECTION_STATUS_SQL} AS calculated_status, i.created_at
+            FROM Inspections i
+            JOIN Users u ON i.user_id = u.id
+            JOIN Companies c ON i.company_id = c.id
+            JOIN Products p ON i.product_id = p.id
+            {where_clause}
+        ) rows
+        ORDER BY created_at DESC, id DESC;
+    """
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    return export_response(conn, 'inspections', INSPECTION_EXPORT_COLUMNS, query, tuple(params), fmt)
+
+@app.route('/api/quality-improvements/export', methods=['GET'])
+@token_required
+def export_quality_improvements(current_user):
+    try:
+        fmt = parse_export_format(request.args)
+        where, params = build_quality_filters(request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+    select_list = ", ".join(column for column, _ in QUALITY_EXPORT_COLUMNS)
+    query = f"""
+        SELECT {select_list}
+        FROM (
+            SELECT q.id, u.username, c.company_name, q.item_description, q.start_date, q.end_date,
+                   q.progress, {QUALITY_STATUS_SQL} AS calculated_status, q.created_at
+            FROM QualityImprovements q
+            JOIN Users u ON q.user_id = u.id
+            JOIN Companies c ON q.company_id = c.id
+            {where_clause}
+        ) rows
+        ORDER BY created_at DESC, id DESC;
+    """
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    return export_response(conn, 'quality_improvements', QUALITY_EXPORT_COLUMNS, query, tuple(params), fmt)
+
+# == Import Endpoints ==
+IMPORT_MAX_ROWS = int(os.getenv('IMPORT_MAX_ROWS', '10000'))
+
+IMPORT_INT_FIELDS = ('inspected_quantity', 'defective_quantity', 'progress_percentage')
+IMPORT_DATE_FIELDS = ('received_date', 'target_date')
+IMPORT_TEXT_FIELDS = ('defect_reason', 'solution')
+IMPORT_REQUIRED_FIELDS = ('company_name', 'product_name', 'product_code')
+# 스키마의 VARCHAR 길이 / INTEGER 범위. 넘는 행은 INSERT 전체를 실패시키지 않도록 행 단위 오류로 돌려줍니다.
+IMPORT_MAX_LENGTHS = {'company_name': 255, 'product_name': 255, 'product_code': 100}
+IMPORT_MAX_INT = 2 ** 31 - 1
+
+# 내보내기(export) 파일의 한글 헤더도 그대로 가져올 수 있도록 매핑합니다.
+# 내보내기의 '상태' 열은 calculated_status(진행률/마감일로 계산한 값)이지만 값의 종류가 같으므로 status로 가져옵니다.
+IMPORT_HEADER_ALIASES = {header: column for column, header in INSPECTION_EXPORT_COLUMNS}
+IMPORT_HEADER_ALIASES['상태'] = 'status'
+
+def read_import_rows():
+    upload = request.files.get('file')
+    if upload:
+        text = upload.read().decode('utf-8-sig')
+    elif request.mimetype == 'text/csv':
+        text = request.get_data(as_text=True).lstrip('\ufeff')
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get('rows')
+        if not isinstance(data, list):
+            raise ValueError("Expected a CSV file or a JSON array of inspections")
+        return data
+    reader = csv.DictReader(io.StringIO(text))
+    return [{IMPORT_HEADER_ALIASES.get(key, key): value for key, value in row.items()} for row in reader]
+
+def clean_import_row(raw):
+    if not isinstance(raw, dict):
+        raise ValueError("Row must be an object")
+    row = {}
+    for field in IMPORT_REQUIRED_FIELDS:
+        value = str(raw.get(field) or '').strip()
+        if not value:
+            raise ValueError(f"'{field}' is required")
+        if len(value) > IMPORT_MAX_LENGTHS[field]:
+            raise ValueError(f"'{field}' must be at most {IMPORT_MAX_LENGTHS[field]} characters")
+        row[field] = value
+    for field in IMPORT_INT_FIELDS:
+        value = raw.get(field)
+        if value in (None, ''):
+            row[field] = 0 if field == 'progress_percentage' else None
+            continue
+        try:
+            row[field] = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{field}' must be an integer")
+        if not 0 <= row[field] <= IMPORT_MAX_INT:
+            raise ValueError(f"'{field}' must be between 0 and {IMPORT_MAX_INT}")
+    if not 0 <= row['progress_percentage'] <= 100:
+        raise ValueError("'progress_percentage' must be between 0 and 100")
+    for field in IMPORT_DATE_FIELDS:
+        value = raw.get(field)
+        if value in (None, ''):
+            row[field] = None
+            continue
+        try:
+            row[field] = datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError(f"'{field}' must be a date (YYYY-MM-DD)")
+    for field in IMPORT_TEXT_FIELDS:
+        value = raw.get(field)
+        row[field] = str(value) if value not in (None, '') else None
+    row['status'] = str(raw.get('status') or raw.get('calculated_status') or 'inProgress').strip()
+    if row['status'] not in VALID_STATUSES:
+        raise ValueError(f"'status' must be one of {', '.join(VALID_STATUSES)}")
+    return row
+
+@app.route('/api/inspections/import', methods=['POST'])
+@token_required
+def import_inspections(current_user):
+    try:
+        raw_rows = read_import_rows()
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({"message": f"Invalid import data: {e}"}), 400
+    if not raw_rows:
+        return jsonify({"message": "No rows to import"}), 400
+    if len(raw_rows) > IMPORT_MAX_ROWS:
+        return jsonify({"message": f"Too many rows (max {IMPORT_MAX_ROWS})"}), 413
+
+    rows, errors = [], []
+    for index, raw in enumerate(raw_rows, start=1):
+        try:
+            rows.append(clean_import_row(raw))
+        except ValueError as e:
+            errors.append({'row': index, 'message': str(e)})
+
+    strict = request.args.get('strict') in ('1', 'true')
+    if not rows or (strict and errors):
+        return jsonify({"message": "No rows were imported", "inserted": 0, "errors": errors}), 400
+
+    company_names = sorted({row['company_name'] for row in rows})
+    products = {}
+    for row in rows:
+        products.setdefault(row['product_code'], row['product_name'])
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    try:
+        with conn.cursor() as cursor:
+            # 업체/제품을 한 번의 set 기반 INSERT ... ON CONFLICT로 생성하고, 한 번의 SELECT로 ID를 조회합니다.
+            cursor.execute("""
+                INSERT INTO Companies (company_name)
+                SELECT unnest(%s::text[])
+                ON CONFLICT (company_name) DO NOTHING
+            """, (company_names,))
+            companies_created = cursor.rowcount
+            cursor.execute("SELECT company_name, id FROM Companies WHERE company_name = ANY(%s)", (company_names,))
+            company_ids = dict(cursor.fetchall())
+
+            product_codes = list(products.keys())
+            cursor.execute("""
+                INSERT INTO Products (product_code, product_name)
+                SELECT * FROM unnest(%s::text[], %s::text[])
+                ON CONFLICT (product_code) DO NOTHING
+            """, (product_codes, [products[code] for code in product_codes]))
+            products_created = cursor.rowcount
+            cursor.execute("SELECT product_code, id FROM Products WHERE product_code = ANY(%s)", (product_codes,))
+            product_ids = dict(cursor.fetchall())
+
+            values = [
+                (
+                    company_ids[row['company_name']], product_ids[row['product_code']], current_user['id'],
+                    row['inspected_quantity'], row['defective_quantity'], row['defect_reason'], row['solution'],
+                    row['received_date'], row['target_date'], row['progress_percentage'], row['status'],
+                )
+                for row in rows
+            ]
+            inserted_ids = psycopg2.extras.execute_values(cursor, """
+                INSERT INTO Inspections (company_id, product_id, user_id, inspected_quantity, defective_quantity, defect_reason, solution, received_date, target_date, progress_percentage, status)
+                VALUES %s
+                RETURNING id
+            """, values, page_size=1000, fetch=True)
+            inserted_ids = [row[0] for row in inserted_ids]
+            sync_search_documents(cursor, 'inspection', inserted_ids)
+            apply_inspection_rollup(cursor, inserted_ids, 1)
+            publish_change(cursor, 'inspection', 'imported', current_user['id'])
+            conn.commit()
+            bump_version(conn, 'inspection')
+            for name in company_names:
+                remember_company(name, company_ids[name], companies_created > 0)
+            for code in product_codes:
+                remember_product(code, product_ids[code])
+            ref_list_cache.delete('inspection_filter_options')
+            return jsonify({
+                "message": f"{len(values)}건의 검수 데이터가 추가되었습니다.",
+                "inserted": len(values),
+                "companies_created": companies_created,
+                "products_created": products_created,
+                "errors": errors,
+            }), 201
+    except Exception as e:
+        conn.rollback()
+        logger.exception("Error in import_inspections")
+        return jsonify({"message": f"An error occurred: {e}", "inserted": 0, "errors": errors}), 500
+    finally:
+        if conn: conn.close()
+
 # == Comments Endpoints ==
+COMMENTS_QUERY = """
+    SELECT c.id, c.content, c.created_at, c.updated_at, u.username, c.user_id
+    FROM Comments c
+    JOIN Users u ON c.user_id = u.id
+    WHERE c.parent_type = %s AND c.parent_id = %s
+    ORDER BY c.created_at ASC;
+"""
+
 @app.route('/api/comments/<parent_type>/<int:parent_id>', methods=['GET'])
 @token_required
 def get_comments(current_user, parent_type, parent_id):
@@ -630,18 +2005,16 @@ def get_comments(current_user, parent_type, parent_id):
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            query = """
-                SELECT c.id, c.content, c.created_at, c.updated_at, u.username, c.user_id
-                FROM Comments c
-                JOIN Users u ON c.user_id = u.id
-                WHERE c.parent_type = %s AND c.parent_id = %s
-                ORDER BY c.created_at ASC;
-            """
-            cursor.execute(query, (parent_type, parent_id))
+            etag = table_etag(cursor, 'Comments', 'GREATEST(created_at, updated_at)',
+                              'WHERE parent_type = %s AND parent_id = %s', (parent_type, parent_id))
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+
+            cursor.execute(COMMENTS_QUERY, (parent_type, parent_id))
             comments = cursor.fetchall()
-            return jsonify(comments)
+            return with_validators(jsonify(comments), etag)
     except Exception as e:
-        print(f"Error in get_comments: {e}", flush=True)
+        logger.exception("Error in get_comments")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
@@ -669,6 +2042,8 @@ def add_comment(current_user):
             """
             cursor.execute(query, (current_user['id'], parent_id, parent_type, content))
             new_comment = cursor.fetchone()
+            sync_search_documents(cursor, 'comment', [new_comment['id']])
+            publish_change(cursor, 'comment', 'created', current_user['id'], new_comment['id'], parent_type, parent_id)
             conn.commit()
             return jsonify({
                 "message": "Comment added successfully",
@@ -681,7 +2056,7 @@ def add_comment(current_user):
             }), 201
     except Exception as e:
         conn.rollback()
-        print(f"Error in add_comment: {e}", flush=True)
+        logger.exception("Error in add_comment")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
@@ -699,7 +2074,7 @@ def update_comment(current_user, comment_id):
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            cursor.execute("SELECT user_id FROM Comments WHERE id = %s", (comment_id,))
+            cursor.execute("SELECT user_id, parent_type, parent_id FROM Comments WHERE id = %s", (comment_id,))
             comment = cursor.fetchone()
             if not comment:
                 return jsonify({"message": "Comment not found"}), 404
@@ -711,11 +2086,13 @@ def update_comment(current_user, comment_id):
                 (content, comment_id)
             )
             updated_at = cursor.fetchone()['updated_at']
+            sync_search_documents(cursor, 'comment', [comment_id])
+            publish_change(cursor, 'comment', 'updated', current_user['id'], comment_id, comment['parent_type'], comment['parent_id'])
             conn.commit()
             return jsonify({"message": "Comment updated successfully", "updated_at": updated_at})
     except Exception as e:
         conn.rollback()
-        print(f"Error in update_comment: {e}", flush=True)
+        logger.exception("Error in update_comment")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
@@ -727,7 +2104,7 @@ def delete_comment(current_user, comment_id):
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            cursor.execute("SELECT user_id FROM Comments WHERE id = %s", (comment_id,))
+            cursor.execute("SELECT user_id, parent_type, parent_id FROM Comments WHERE id = %s", (comment_id,))
             comment = cursor.fetchone()
             if not comment:
                 return jsonify({"message": "Comment not found"}), 404
@@ -735,16 +2112,53 @@ def delete_comment(current_user, comment_id):
                 return jsonify({"message": "Permission denied"}), 403
 
             cursor.execute("DELETE FROM Comments WHERE id = %s", (comment_id,))
+            remove_search_documents(cursor, 'comment', comment_id)
+            publish_change(cursor, 'comment', 'deleted', current_user['id'], comment_id, comment['parent_type'], comment['parent_id'])
             conn.commit()
             return jsonify({"message": "Comment deleted successfully"})
     except Exception as e:
         conn.rollback()
-        print(f"Error in delete_comment: {e}", flush=True)
+        logger.exception("Error in delete_comment")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
 
 # == Histories Endpoint ==
+# 수정 한 번의 변경 내용은 changes JSONB 배열 한 행에 담깁니다. (migrations/0006_history_changes.sql)
+# 조회할 때 배열 원소마다 한 줄로 펼쳐서 기존과 같은 "'필드' 변경 (old -> new)" 문구를 만들고,
+# changes가 없는 (형식을 알 수 없어 변환되지 않은) 예전 행은 action을 그대로 보여줍니다.
+# (format()은 NULL 인자를 빈 문자열로 바꿔서 NULL을 돌려주지 않으므로 COALESCE가 아니라 CASE로 나눕니다.)
+HISTORY_ACTION_SQL = """CASE WHEN c.change IS NULL THEN h.action
+    ELSE format('''%%s'' 변경 (%%s -> %%s)', c.change->>'label', c.change->>'old', c.change->>'new') END"""
+HISTORY_CHANGES_JOIN = "LEFT JOIN LATERAL jsonb_array_elements(h.changes) WITH ORDINALITY AS c(change, n) ON TRUE"
+
+def history_value(value):
+    # None과 ''을 같은 값으로 취급해 실제로 바뀌지 않은 필드는 기록하지 않습니다.
+    return str(value) if value is not None else ""
+
+def log_history_changes(cursor, user_id, parent_type, parent_id, old_item, data, fields, field_names):
+    changes = []
+    for field in fields:
+        old_value, new_value = history_value(old_item.get(field)), history_value(data.get(field))
+        if old_value != new_value:
+            changes.append({'field': field, 'label': field_names.get(field, field), 'old': old_value, 'new': new_value})
+    if not changes:
+        return False
+    cursor.execute(
+        "INSERT INTO Histories (user_id, parent_id, parent_type, changes) VALUES (%s, %s, %s, %s)",
+        (user_id, parent_id, parent_type, psycopg2.extras.Json(changes))
+    )
+    return True
+
+HISTORIES_QUERY = f"""
+    SELECT {HISTORY_ACTION_SQL} AS action, h.created_at, u.username
+    FROM Histories h
+    JOIN Users u ON h.user_id = u.id
+    {HISTORY_CHANGES_JOIN}
+    WHERE h.parent_type = %s AND h.parent_id = %s
+    ORDER BY h.created_at DESC, h.id DESC, c.n;
+"""
+
 @app.route('/api/histories/<parent_type>/<int:parent_id>', methods=['GET'])
 @token_required
 def get_histories(current_user, parent_type, parent_id):
@@ -755,26 +2169,353 @@ def get_histories(current_user, parent_type, parent_id):
     if not conn: return jsonify({"message": "Database connection failed"}), 500
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            query = """
-                SELECT h.action, h.created_at, u.username
-                FROM Histories h
-                JOIN Users u ON h.user_id = u.id
-                WHERE h.parent_type = %s AND h.parent_id = %s
-                ORDER BY h.created_at DESC;
-            """
-            cursor.execute(query, (parent_type, parent_id))
+            etag = table_etag(cursor, 'Histories', 'created_at',
+                              'WHERE parent_type = %s AND parent_id = %s', (parent_type, parent_id))
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+
+            cursor.execute(HISTORIES_QUERY, (parent_type, parent_id))
             histories = cursor.fetchall()
-            return jsonify(histories)
+            return with_validators(jsonify(histories), etag)
+    except Exception as e:
+        logger.exception("Error in get_histories")
+        return jsonify({"message": f"An error occurred: {e}"}), 500
+    finally:
+        if conn: conn.close()
+
+# == Detail Bundle Endpoint ==
+# 상세 모달이 항목/댓글/이력을 따로 요청하지 않도록 한 번의 요청, 한 커넥션으로 묶어서 반환합니다.
+# 검증값 쿼리 1번으로 304를 판단하고, 변경된 경우에만 본문 쿼리 1번을 더 실행합니다.
+DETAIL_BUNDLE_SOURCES = {
+    'inspection': ('Inspections', """
+        SELECT i.*, u.username, c.company_name, p.product_name, p.product_code, i.received_date, {extra}
+        FROM Inspections i
+        JOIN Users u ON i.user_id = u.id
+        JOIN Companies c ON i.company_id = c.id
+        JOIN Products p ON i.product_id = p.id
+        WHERE i.id = %(id)s
+    """),
+    'quality': ('QualityImprovements', """
+        SELECT q.*, u.username, c.company_name, {extra}
+        FROM QualityImprovements q
+        JOIN Users u ON q.user_id = u.id
+        JOIN Companies c ON q.company_id = c.id
+        WHERE q.id = %(id)s
+    """),
+}
+
+# 댓글/이력은 json_agg로 같은 행에 실어 옵니다. 컬럼과 정렬은 get_comments / get_histories와 같습니다.
+DETAIL_BUNDLE_CHILDREN = """
+    (SELECT COALESCE(json_agg(cm ORDER BY cm.created_at ASC), '[]'::json)
+     FROM (SELECT cm.id, cm.content, cm.created_at, cm.updated_at, u.username, cm.user_id
+           FROM Comments cm JOIN Users u ON cm.user_id = u.id
+           WHERE cm.parent_type = %(parent_type)s AND cm.parent_id = %(id)s) cm) AS bundle_comments,
+    (SELECT COALESCE(json_agg(json_build_object('action', """ + HISTORY_ACTION_SQL + """,
+                                                'created_at', h.created_at, 'username', u.username)
+                              ORDER BY h.created_at DESC, h.id DESC, c.n), '[]'::json)
+     FROM Histories h JOIN Users u ON h.user_id = u.id
+     """ + HISTORY_CHANGES_JOIN + """
+     WHERE h.parent_type = %(parent_type)s AND h.parent_id = %(id)s) AS bundle_histories
+"""
+
+# 304 판단용 검증값: 항목 수정 시각 + 댓글/이력의 개수와 마지막 변경 시각
+DETAIL_BUNDLE_STATE_QUERY = """
+    SELECT (SELECT GREATEST(created_at, updated_at) FROM {table} WHERE id = %(id)s) AS item_modified,
+           cm.count AS comment_count, cm.modified AS comment_modified,
+           h.count AS history_count, h.modified AS history_modified
+    FROM (SELECT COUNT(*) AS count, MAX(GREATEST(created_at, updated_at)) AS modified
+          FROM Comments WHERE parent_type = %(parent_type)s AND parent_id = %(id)s) cm,
+         (SELECT COUNT(*) AS count, MAX(created_at) AS modified
+          FROM Histories WHERE parent_type = %(parent_type)s AND parent_id = %(id)s) h;
+"""
+
+def parse_json_timestamp(value):
+    # json은 소수 초 끝의 0을 빼고(예: 10:00:00.12345) 내보내는데, Python 3.11 미만의 fromisoformat은
+    # 소수 3/6자리만 받으므로 6자리로 맞춰서 strptime으로 읽습니다. (TIMESTAMP 컬럼이라 시간대는 없음)
+    head, _, fraction = value.partition('.')
+    return datetime.strptime(f"{head}.{fraction.ljust(6, '0')}", '%Y-%m-%dT%H:%M:%S.%f')
+
+def parse_json_timestamps(rows, *fields):
+    # json_agg는 시각을 ISO 문자열로 돌려주므로, 개별 엔드포인트와 같은 형식으로 직렬화되도록 datetime으로 되돌립니다.
+    for row in rows:
+        for field in fields:
+            if row.get(field):
+                row[field] = parse_json_timestamp(row[field])
+    return rows
+
+@app.route('/api/details/<parent_type>/<int:parent_id>', methods=['GET'])
+@token_required
+def get_detail_bundle(current_user, parent_type, parent_id):
+    if parent_type not in DETAIL_BUNDLE_SOURCES:
+        return jsonify({"message": "Invalid parent type"}), 400
+    table, item_query = DETAIL_BUNDLE_SOURCES[parent_type]
+    params = {'id': parent_id, 'parent_type': parent_type}
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.execute(DETAIL_BUNDLE_STATE_QUERY.format(table=table), params)
+            state = cursor.fetchone()
+            if state['item_modified'] is None:
+                return jsonify({"message": "Item not found"}), 404
+            etag = make_etag('bundle', parent_type, parent_id, *state.values())
+            modified = max(value for value in (state['item_modified'], state['comment_modified'], state['history_modified']) if value)
+            if is_not_modified(etag, modified):
+                return not_modified_response(etag, modified)
+
+            query = item_query.format(extra=DETAIL_BUNDLE_CHILDREN)
+            log_query('get_detail_bundle', query, params)
+            cursor.execute(query, params)
+            item = cursor.fetchone()
+            if not item:
+                return jsonify({"message": "Item not found"}), 404
+            comments = parse_json_timestamps(item.pop('bundle_comments'), 'created_at', 'updated_at')
+            histories = parse_json_timestamps(item.pop('bundle_histories'), 'created_at')
+            return with_validators(jsonify({'item': item, 'comments': comments, 'histories': histories}), etag, modified)
+    except Exception as e:
+        logger.exception("Error in get_detail_bundle")
+        return jsonify({"message": f"An error occurred: {e}"}), 500
+    finally:
+        if conn: conn.close()
+
+# == Search ==
+# 검사/품질개선/댓글 본문을 SearchDocuments 한 테이블에 색인해서 전문 검색(tsvector)과 부분/유사 일치(pg_trgm)로 찾습니다.
+# 색인은 각 추가/수정/삭제 핸들러가 같은 트랜잭션 안에서 sync_search_documents / remove_search_documents로 갱신합니다.
+SEARCH_KINDS = ('inspection', 'quality', 'comment')
+SEARCH_MAX_QUERY_LENGTH = 200
+SEARCH_MAX_OFFSET = int(os.getenv('SEARCH_MAX_OFFSET', '500'))
+SEARCH_SNIPPET_CHARS = 120
+# 전문 검색 일치(ts_rank_cd)와 trigram 유사도(word_similarity)를 더해서 순위를 매깁니다.
+SEARCH_QUERY = """
+    WITH query AS (SELECT plainto_tsquery('simple', %(q)s) AS tsq)
+    SELECT d.kind, d.item_id AS id, d.parent_type, d.parent_id, u.username, d.title, d.body, d.created_at,
+           ts_rank_cd(d.search_vector, query.tsq) + word_similarity(%(q)s, d.body) AS score
+    FROM SearchDocuments d
+    CROSS JOIN query
+    LEFT JOIN Users u ON d.user_id = u.id
+    WHERE d.kind = ANY(%(kinds)s)
+      AND (d.search_vector @@ query.tsq OR d.body ILIKE %(pattern)s OR %(q)s <%% d.body)
+    ORDER BY score DESC, d.created_at DESC, d.kind, d.item_id
+    LIMIT %(limit)s OFFSET %(offset)s;
+"""
+
+# migrations/0004_search.sql의 백필과 같은 내용입니다.
+SEARCH_SOURCES = {
+    'inspection': """
+        SELECT 'inspection', i.id, 'inspection', i.id, i.user_id,
+               c.company_name || ' / ' || p.product_name,
+               concat_ws(E'\\n', i.defect_reason, i.solution),
+               setweight(to_tsvector('simple', coalesce(i.defect_reason, '')), 'A')
+                   || setweight(to_tsvector('simple', coalesce(i.solution, '')), 'B')
+                   || setweight(to_tsvector('simple', c.company_name || ' ' || p.product_name), 'C'),
+               i.created_at
+        FROM Inspections i
+        JOIN Companies c ON i.company_id = c.id
+        JOIN Products p ON i.product_id = p.id
+        WHERE i.id = ANY(%s)
+    """,
+    'quality': """
+        SELECT 'quality', q.id, 'quality', q.id, q.user_id,
+               c.company_name,
+               coalesce(q.item_description, ''),
+               setweight(to_tsvector('simple', coalesce(q.item_description, '')), 'A')
+                   || setweight(to_tsvector('simple', c.company_name), 'C'),
+               q.created_at
+        FROM QualityImprovements q
+        JOIN Companies c ON q.company_id = c.id
+        WHERE q.id = ANY(%s)
+    """,
+    'comment': """
+        SELECT 'comment', cm.id, cm.parent_type, cm.parent_id, cm.user_id,
+               NULL,
+               cm.content,
+               setweight(to_tsvector('simple', cm.content), 'B'),
+               cm.created_at
+        FROM Comments cm
+        WHERE cm.id = ANY(%s)
+    """,
+}
+
+def sync_search_documents(cursor, kind, item_ids):
+    cursor.execute(f"""
+        INSERT INTO SearchDocuments (kind, item_id, parent_type, parent_id, user_id, title, body, search_vector, created_at)
+        {SEARCH_SOURCES[kind]}
+        ON CONFLICT (kind, item_id) DO UPDATE
+        SET title = EXCLUDED.title, body = EXCLUDED.body, search_vector = EXCLUDED.search_vector
+    """, (list(item_ids),))
+
+def remove_search_documents(cursor, kind, item_id):
+    # 항목을 지우면 그 항목에 달린 댓글도 검색 결과에서 뺍니다.
+    cursor.execute("""
+        DELETE FROM SearchDocuments
+        WHERE (kind = %s AND item_id = %s) OR (kind = 'comment' AND parent_type = %s AND parent_id = %s)
+    """, (kind, item_id, kind, item_id))
+
+def escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def make_snippet(body, query):
+    # 첫 번째로 일치하는 검색어 주변만 잘라서, HTML 이스케이프 후 일치 부분을 <mark>로 감쌉니다.
+    terms = [re.escape(term) for term in query.split() if term]
+    pattern = re.compile('|'.join(terms), re.IGNORECASE) if terms else None
+    match = pattern.search(body) if pattern else None
+    start = max(0, match.start() - SEARCH_SNIPPET_CHARS // 3) if match else 0
+    end = min(len(body), start + SEARCH_SNIPPET_CHARS)
+    excerpt = body[start:end]
+
+    parts, last = [], 0
+    for found in (pattern.finditer(excerpt) if pattern else ()):
+        parts.append(html.escape(excerpt[last:found.start()]))
+        parts.append(f"<mark>{html.escape(found.group())}</mark>")
+        last = found.end()
+    parts.append(html.escape(excerpt[last:]))
+    return ('…' if start > 0 else '') + ''.join(parts) + ('…' if end < len(body) else '')
+
+@app.route('/api/search', methods=['GET'])
+@token_required
+def search(current_user):
+    query_text = (request.args.get('q') or '').strip()
+    if not query_text:
+        return jsonify({"message": "q is required"}), 400
+    if len(query_text) > SEARCH_MAX_QUERY_LENGTH:
+        return jsonify({"message": f"q must be at most {SEARCH_MAX_QUERY_LENGTH} characters"}), 400
+    kinds = [kind for kind in (request.args.get('types') or ','.join(SEARCH_KINDS)).split(',') if kind]
+    if not kinds or any(kind not in SEARCH_KINDS for kind in kinds):
+        return jsonify({"message": f"types must be a comma separated subset of {', '.join(SEARCH_KINDS)}"}), 400
+    try:
+        page_size = parse_page_size(request.args.get('limit'))
+        offset = int(request.args.get('offset', 0))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    if offset < 0 or offset > SEARCH_MAX_OFFSET:
+        return jsonify({"message": f"offset must be between 0 and {SEARCH_MAX_OFFSET}"}), 400
+
+    params = {
+        'q': query_text,
+        'pattern': f"%{escape_like(query_text)}%",
+        'kinds': kinds,
+        'limit': page_size + 1,
+        'offset': offset,
+    }
+    query = SEARCH_QUERY
+
+    conn = get_db_connection()
+    if not conn: return jsonify({"message": "Database connection failed"}), 500
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            log_query('search', query, params)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            next_offset = offset + page_size if len(rows) > page_size and offset + page_size <= SEARCH_MAX_OFFSET else None
+            items = []
+            for row in rows[:page_size]:
+                body = row.pop('body')
+                row['snippet'] = make_snippet(body, query_text)
+                row['score'] = round(float(row['score']), 4)
+                items.append(row)
+            return jsonify({'items': items, 'next_offset': next_offset, 'limit': page_size})
     except Exception as e:
-        print(f"Error in get_histories: {e}", flush=True)
+        logger.exception("Error in search")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
 
+# == Change Feed Endpoint (SSE) ==
+# id는 INSERT 순서, 전달은 COMMIT 순서라서 더 작은 id가 나중에 커밋될 수 있습니다. 그래서 Last-Event-ID 이후뿐 아니라
+# 그 이벤트 전 SYNC_OVERLAP_SECONDS 안에 생긴 이벤트도 다시 보냅니다. (중복은 클라이언트가 다시 불러오기만 하므로 무해)
+MISSED_EVENTS_QUERY = """
+    SELECT id, entity, action, item_id, parent_type, parent_id, user_id, created_at
+    FROM ChangeEvents
+    WHERE id > %(last_event_id)s
+       OR (id < %(last_event_id)s AND created_at >= (SELECT created_at FROM ChangeEvents WHERE id = %(last_event_id)s)
+                                                    - make_interval(secs => %(overlap)s))
+    ORDER BY id
+    LIMIT %(limit)s
+"""
+
+def missed_events_params(last_event_id):
+    return {'last_event_id': last_event_id, 'overlap': SYNC_OVERLAP_SECONDS, 'limit': SSE_REPLAY_LIMIT + 1}
+
+def fetch_missed_events(last_event_id):
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.execute(MISSED_EVENTS_QUERY, missed_events_params(last_event_id))
+            return cursor.fetchall()
+    finally:
+        conn.close()
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    # EventSource는 Authorization 헤더를 보낼 수 없어서 token 쿼리 파라미터도 허용합니다.
+    token = request.args.get('token')
+    auth_header = request.headers.get('authorization', '')
+    if auth_header.startswith('Bearer '):
+        token = auth_header.split(" ")[1]
+    if not token:
+        return jsonify({'message': 'Token is missing!'}), 401
+    try:
+        decode_token(token)
+    except jwt.InvalidTokenError as e:
+        return jsonify({'message': f'Token is invalid! Error: {e}'}), 401
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({"message": "Invalid Last-Event-ID"}), 400
+
+    # 재전송 조회보다 먼저 구독해야 그 사이에 커밋된 이벤트를 놓치지 않습니다.
+    subscription = change_feed.subscribe()
+    try:
+        missed = fetch_missed_events(last_event_id) if last_event_id is not None else []
+    except Exception:
+        change_feed.unsubscribe(subscription)
+        raise
+    if missed is None:
+        change_feed.unsubscribe(subscription)
+        return jsonify({"message": "Database connection failed"}), 500
+
+    def generate():
+        # 실시간 이벤트는 커밋 순서대로 오므로 id로 거르지 않고, 재전송한 이벤트와 겹치는 것만 건너뜁니다.
+        replayed = set()
+        try:
+            yield "retry: 3000\n\n"
+            if len(missed) > SSE_REPLAY_LIMIT:
+                # 놓친 이벤트가 너무 많으면 전체 새로고침을 요청합니다.
+                yield "event: reset\ndata: {}\n\n"
+            else:
+                for event in missed:
+                    replayed.add(event['id'])
+                    yield format_sse(event)
+            while True:
+                if subscription.lagging:
+                    yield "event: reset\ndata: {}\n\n"
+                    return
+                event = subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                if event['id'] in replayed:
+                    replayed.discard(event['id'])
+                    continue
+                yield format_sse(event)
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.call_on_close(lambda: change_feed.unsubscribe(subscription))
+    return response
+
 # == User Management Endpoints (Admin Only) ==
 
 def is_admin(current_user):
-    return current_user['username'] == 'test'
+    return current_user['role'] == 'admin'
 
 @app.route('/api/debug/quality-improvements', methods=['GET'])
 @token_required
@@ -832,10 +2573,14 @@ def create_user(current_user):
             if cursor.fetchone():
                 return jsonify({"message": "Username already exists"}), 409 # 409 Conflict
 
-            password_hash = sha256.hash(password)
+            password_hash = hash_password(password)
             cursor.execute("INSERT INTO Users (username, password_hash) VALUES (%s, %s)", (username, password_hash))
             conn.commit()
+            ref_list_cache.delete('users')
             return jsonify({"message": "User created successfully"}), 201
+    except KdfPoolBusy:
+        conn.rollback()
+        raise
     except Exception as e:
         conn.rollback()
         return jsonify({"message": f"An error occurred: {e}"}), 500
@@ -872,6 +2617,8 @@ def delete_user(current_user, id):
 
             cursor.execute("DELETE FROM Users WHERE id = %s", (id,))
             conn.commit()
+            token_versions.delete(id)
+            ref_list_cache.delete('users')
             return jsonify({"message": "User deleted successfully"})
     except Exception as e:
         conn.rollback()
@@ -896,8 +2643,13 @@ def update_user(current_user, id):
 
     try:
         with conn.cursor() as cursor:
-            cursor.execute("UPDATE users SET team = %s WHERE id = %s", (team, id))
+            # 팀은 토큰 클레임에 들어 있으므로 버전을 올려서 다시 로그인하도록 합니다.
+            cursor.execute("UPDATE users SET team = %s, token_version = token_version + 1 WHERE id = %s RETURNING token_version",
+                           (team, id))
+            updated = cursor.fetchone()
             conn.commit()
+            if updated:
+                token_versions.set(id, updated[0])
             return jsonify({"message": "User updated successfully"}), 200
     except Exception as e:
         conn.rollback()
@@ -905,6 +2657,58 @@ def update_user(current_user, id):
     finally:
         if conn: conn.close()
 
+@app.route('/api/debug/db-pool', methods=['GET'])
+@token_required
+def debug_db_pool(current_user):
+    return jsonify(db_pool.stats())
+
+@app.route('/api/debug/change-feed', methods=['GET'])
+@token_required
+def debug_change_feed(current_user):
+    return jsonify(change_feed.stats())
+
+@app.route('/api/debug/logging', methods=['GET', 'PUT'])
+@token_required
+def debug_logging(current_user):
+    if request.method == 'PUT':
+        if not is_admin(current_user):
+            return jsonify({"message": "Permission denied"}), 403
+        data = request.get_json() or {}
+        try:
+            if 'level' in data:
+                logger.setLevel(str(data['level']).upper())
+            if 'query_logging' in data:
+                structured_log.settings.query_logging = bool(data['query_logging'])
+            if 'query_sample_rate' in data:
+                rate = float(data['query_sample_rate'])
+                if not 0 <= rate <= 1:
+                    raise ValueError("query_sample_rate must be between 0 and 1")
+                structured_log.settings.query_sample_rate = rate
+        except (TypeError, ValueError) as e:
+            return jsonify({"message": str(e)}), 400
+    return jsonify({
+        'level': logging.getLevelName(logger.level),
+        'query_logging': structured_log.settings.query_logging,
+        'query_sample_rate': structured_log.settings.query_sample_rate,
+        'dropped': structured_log.dropped_count(),
+    })
+
+@app.route('/api/debug/cache', methods=['GET'])
+@token_required
+def debug_cache(current_user):
+    stats = {cache.name: cache.stats() for cache in REF_CACHES + (verified_token_cache,)}
+    stats[token_versions.name] = token_versions.stats()
+    return jsonify(stats)
+
+@app.route('/api/debug/kdf', methods=['GET'])
+@token_required
+def debug_kdf(current_user):
+    return jsonify({
+        'pool': kdf_pool.stats(),
+        'rounds': PASSWORD_HASH_ROUNDS,
+        'rate_limits': {limiter.name: limiter.stats() for limiter in (login_user_limiter, login_ip_limiter)},
+    })
+
 # == Serve React App ==
 @app.route('/api/debug/inspections-schema', methods=['GET'])
 @token_required
@@ -920,16 +2724,101 @@ def debug_inspections_schema(current_user):
                 WHERE table_schema = 'public' AND table_name = 'inspections'
                 ORDER BY ordinal_position;
             """
-            print(f"Executing debug query: {query}", flush=True)
+            log_query('debug_inspections_schema', query)
             cursor.execute(query)
             columns = cursor.fetchall()
             return jsonify(columns)
     except Exception as e:
-        print(f"Error in debug_inspections_schema: {e}", flush=True)
+        logger.exception("Error in debug_inspections_schema")
         return jsonify({"message": f"An error occurred: {e}"}), 500
     finally:
         if conn: conn.close()
 
+# == Health / Warm-up ==
+# serve.py가 트래픽을 받기 전에 warm_up()을 호출합니다. 다른 방식(waitress-serve app:app 등)으로 띄운 경우에는
+# 첫 readiness 요청이 warm_up()을 대신 실행합니다.
+warm_up_state = {'done': False, 'seconds': None}
+warm_up_lock = threading.Lock()
+
+def warm_up():
+    # DB 커넥션을 DB_POOL_MIN_SIZE개 미리 열고, 토큰 버전 표와 참조 목록 캐시를 채웁니다. 여러 번 불러도 한 번만 실행됩니다.
+    with warm_up_lock:
+        if warm_up_state['done']:
+            return True
+        started = time.perf_counter()
+        db_pool.warm_up()
+        conn = get_db_connection()
+        if not conn:
+            return False
+        try:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                generation = ref_list_cache.generation()
+                cursor.execute("SELECT id, company_name FROM Companies ORDER BY company_name")
+                ref_list_cache.set('companies', cursor.fetchall(), generation=generation)
+                cursor.execute("SELECT id, username FROM Users ORDER BY username")
+                ref_list_cache.set('users', cursor.fetchall(), generation=generation)
+                fetch_inspection_filter_options(cursor)
+            conn.rollback()
+        finally:
+            conn.close()
+        token_versions.reload()  # 전체 표를 읽어 둡니다.
+        get_password_hasher()  # 첫 로그인이 passlib import를 기다리지 않도록 미리 불러 둡니다.
+        warm_up_state.update(done=True, seconds=round(time.perf_counter() - started, 3))
+        logger.info('warm_up', extra={'fields': {'seconds': warm_up_state['seconds'], 'db_pool': db_pool.stats()}})
+        return True
+
+@app.route('/api/health/live', methods=['GET'])
+def health_live():
+    # 프로세스가 요청을 처리할 수 있는지만 봅니다. (DB 상태와 무관, 실패하면 재시작 대상)
+    return jsonify({"status": "ok"})
+
+@app.route('/api/health/ready', methods=['GET'])
+def health_ready():
+    # 워밍업이 끝났고 DB에 쿼리할 수 있으면 200, 아니면 503 (트래픽을 보내지 말 것)
+    try:
+        if not warm_up():
+            return jsonify({"status": "starting"}), 503
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({"status": "unavailable", "message": "Database connection failed"}), 503
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        finally:
+            conn.close()
+    except Exception as e:
+        return jsonify({"status": "unavailable", "message": str(e)}), 503
+    return jsonify({"status": "ready", "warm_up_seconds": warm_up_state['seconds'], "db_pool": db_pool.stats()})
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    if not METRICS_TOKEN:
+        if not METRICS_ALLOW_ANONYMOUS:
+            return jsonify({"message": "Metrics are disabled (set METRICS_TOKEN)"}), 403
+    elif not hmac.compare_digest(request.headers.get('authorization', ''), f"Bearer {METRICS_TOKEN}"):
+        return jsonify({"message": "Permission denied"}), 403
+    pool_stats = db_pool.stats()
+    gauges = {
+        'db_pool_connections': ('DB pool connections by state', [
+            ({'state': 'in_use'}, pool_stats['in_use']),
+            ({'state': 'idle'}, pool_stats['idle']),
+            ({'state': 'waiting'}, pool_stats['waiting']),
+        ]),
+        'db_pool_wait_ms_avg': ('Average DB pool checkout wait', [({}, pool_stats['wait_ms_avg'])]),
+        'db_pool_timeouts_total': ('DB pool checkout timeouts', [({}, pool_stats['timeouts'])]),
+        'ref_cache_hits_total': ('Reference cache hits', [({'cache': c.name}, c.hits) for c in REF_CACHES]),
+        'ref_cache_misses_total': ('Reference cache misses', [({'cache': c.name}, c.misses) for c in REF_CACHES]),
+        'kdf_pool_pending': ('Password hash jobs running or queued', [({}, kdf_pool.stats()['pending'])]),
+        'kdf_pool_rejected_total': ('Password hash jobs rejected (pool saturated)', [({}, kdf_pool.stats()['rejected'])]),
+        'login_rate_limited_total': ('Login attempts rejected by rate limit', [
+            ({'key': limiter.name}, limiter.limited) for limiter in (login_user_limiter, login_ip_limiter)
+        ]),
+        'token_cache_hits_total': ('Verified token cache hits', [({}, verified_token_cache.hits)]),
+        'token_cache_misses_total': ('Verified token cache misses', [({}, verified_token_cache.misses)]),
+        'sse_subscribers': ('Open change feed subscribers', [({}, change_feed.stats()['subscribers'])]),
+    }
+    return Response(request_metrics.render(gauges), mimetype='text/plain; version=0.0.4')
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
@@ -0,0 +1,642 @@
+"""비동기(ASGI) 서버 모드.
+
+요청이 많고 오래 열려 있는 경로(대시보드 첫 화면, 목록 페이지, 상세 묶음, 변경 알림 SSE, 헬스 체크)는
+asyncpg 커넥션 풀로 이벤트 루프에서 직접 처리하고, 나머지 모든 경로는 같은 프로세스의 Flask 앱(app.py)으로
+넘깁니다. 느린 쿼리를 기다리거나 SSE 연결을 유지하는 동안 스레드를 붙잡지 않으므로, 한 프로세스로 훨씬 많은
+동시 클라이언트와 스트림을 받을 수 있습니다. 응답 JSON, 상태 코드, ETag는 Flask 경로와 같습니다.
+
+    cd backend
+    pip install -r requirements-async.txt
+    python -m uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+Flask로 넘기는 요청은 ASGI_WSGI_THREADS개 스레드에서 실행되고 기존 psycopg2 풀(DB_POOL_*)을 씁니다.
+asyncpg 풀(ASYNC_DB_POOL_*)은 그와 별도이므로 두 풀의 합이 DB의 max_connections를 넘지 않게 둡니다.
+"""
+import asyncio
+import contextlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+from functools import lru_cache, wraps
+
+import asyncpg
+import jwt
+import psycopg2.extensions
+from a2wsgi import WSGIMiddleware
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route, Router
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import http_date, parse_date, parse_etags, quote_etag
+
+import app as flask_module
+import metrics
+from change_feed import CHANNEL as CHANGE_CHANNEL, format_sse
+from db_pool import PoolTimeout
+
+logger = flask_module.logger
+
+ASYNC_DB_POOL_MIN_SIZE = int(os.getenv('ASYNC_DB_POOL_MIN_SIZE', '2'))
+ASYNC_DB_POOL_MAX_SIZE = int(os.getenv('ASYNC_DB_POOL_MAX_SIZE', '20'))
+ASYNC_DB_POOL_TIMEOUT = float(os.getenv('ASYNC_DB_POOL_TIMEOUT', str(flask_module.DB_POOL_TIMEOUT)))
+ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', '8'))  # Flask로 넘긴 요청을 처리할 스레드 수
+ASGI_WARMUP_TIMEOUT = float(os.getenv('ASGI_WARMUP_TIMEOUT', os.getenv('SERVE_WARMUP_TIMEOUT', '30')))
+
+
+# == asyncpg 데이터 계층 ==
+# app.py의 쿼리 상수(psycopg2 형식 %s, %(name)s, %%)를 asyncpg 형식($1, $2 ...)으로 바꿔서 그대로 씁니다.
+PLACEHOLDER = re.compile(r"%%|%s|%\((\w+)\)s")
+
+@lru_cache(maxsize=256)
+def to_asyncpg(query):
+    # (변환된 SQL, 인자 순서) - 인자 순서는 위치 인자면 인덱스, 이름 인자면 이름입니다. 같은 이름은 같은 $n을 씁니다.
+    keys = []
+
+    def replace(match):
+        if match.group(0) == '%%':
+            return '%'
+        key = match.group(1)
+        if key is None:
+            key = len(keys)
+        elif key in keys:
+            return f"${keys.index(key) + 1}"
+        keys.append(key)
+        return f"${len(keys)}"
+
+    return PLACEHOLDER.sub(replace, query), tuple(keys)
+
+def connect_args(dsn):
+    # asyncpg는 URI 형식만 받으므로 libpq 키=값 형식(psycopg2.extensions.make_dsn 결과 등)은 인자로 풉니다.
+    if '://' in dsn:
+        return {'dsn': dsn}
+    names = {'host': 'host', 'port': 'port', 'user': 'user', 'password': 'password', 'dbname': 'database', 'sslmode': 'ssl'}
+    return {names[key]: value for key, value in psycopg2.extensions.parse_dsn(dsn).items() if key in names}
+
+async def init_connection(conn):
+    # psycopg2처럼 json/jsonb 컬럼을 파이썬 객체로 돌려받습니다.
+    for type_name in ('json', 'jsonb'):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+
+
+class AsyncDatabase:
+    def __init__(self, dsn, min_size=2, max_size=20, timeout=5.0):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pool = None
+        self.timeouts = 0
+
+    async def open(self):
+        if self.pool is None:
+            self.pool = await asyncpg.create_pool(
+                **connect_args(self.dsn), min_size=self.min_size, max_size=self.max_size, init=init_connection,
+            )
+
+    async def close(self):
+        if self.pool is not None:
+            pool, self.pool = self.pool, None
+            await pool.close()
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        # 풀이 비어 timeout 안에 커넥션을 못 받으면 Flask 경로와 같이 PoolTimeout (503)
+        if self.pool is None:
+            raise PoolTimeout("Async DB pool is not open yet")
+        try:
+            conn = await self.pool.acquire(timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise PoolTimeout("Timed out waiting for an async DB connection") from None
+        try:
+            yield conn
+        finally:
+            await self.pool.release(conn)
+
+    async def fetch(self, query, params=(), conn=None):
+        if conn is None:
+            async with self.connection() as conn:
+                return await self.fetch(query, params, conn)
+        sql, keys = to_asyncpg(query)
+        started = time.perf_counter()
+        try:
+            rows = await conn.fetch(sql, *(params[key] for key in keys))
+        finally:
+            # InstrumentedCursor와 같은 방식으로 현재 요청의 DB 사용량을 기록합니다.
+            stats = metrics.current_request()
+            if stats is not None:
+                elapsed = time.perf_counter() - started
+                stats.db_queries += 1
+                stats.db_time += elapsed
+                if len(stats.queries) < metrics.InstrumentedCursor.MAX_RECORDED_QUERIES:
+                    stats.queries.append((query, elapsed))
+        if stats is not None:
+            stats.db_rows += len(rows)
+        return [dict(row) for row in rows]
+
+    async def fetchrow(self, query, params=(), conn=None):
+        rows = await self.fetch(query, params, conn)
+        return rows[0] if rows else None
+
+    def stats(self):
+        if self.pool is None:
+            return {'open': False, 'timeouts': self.timeouts}
+        size, idle = self.pool.get_size(), self.pool.get_idle_size()
+        return {'open': True, 'size': size, 'idle': idle, 'in_use': size - idle,
+                'max_size': self.max_size, 'timeouts': self.timeouts}
+
+
+database = AsyncDatabase(flask_module.DATABASE_URI, min_size=ASYNC_DB_POOL_MIN_SIZE,
+                         max_size=ASYNC_DB_POOL_MAX_SIZE, timeout=ASYNC_DB_POOL_TIMEOUT)
+
+
+# == 변경 알림 (asyncpg LISTEN) ==
+class AsyncSubscription:
+    def __init__(self, maxsize):
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.lagging = False
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class AsyncChangeFeed:
+    # change_feed.ChangeFeed의 이벤트 루프 버전. 프로세스당 LISTEN 커넥션 하나로 모든 SSE 구독자에게 나눠줍니다.
+    def __init__(self, dsn, channel=CHANGE_CHANNEL, subscriber_queue_size=256, poll_interval=5.0,
+                 retention_hours=24, prune_interval=600.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.subscriber_queue_size = subscriber_queue_size
+        self.poll_interval = poll_interval
+        self.retention_hours = retention_hours
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        self._subscribers = set()
+        self._task = None
+        self._listening = False
+        self.delivered = 0
+        self.dropped = 0
+
+    def _ensure_listener(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen_forever())
+
+    async def _listen_forever(self):
+        backoff = 1.0
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(**connect_args(self.dsn))
+                await conn.add_listener(self.channel, self._on_notify)
+                self._listening = True
+                backoff = 1.0
+                while not conn.is_closed():
+                    await asyncio.sleep(self.poll_interval)
+                    await self._prune(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Change feed listener error", extra={'fields': {'error': str(e)}})
+            finally:
+                self._listening = False
+                if conn is not None and not conn.is_closed():
+                    conn.terminate()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _prune(self, conn):
+        now = time.monotonic()
+        if now - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = now
+        await conn.execute("DELETE FROM ChangeEvents WHERE created_at < NOW() - make_interval(hours => $1)",
+                           self.retention_hours)
+
+    def _on_notify(self, conn, pid, channel, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                subscription.lagging = True
+                self.dropped += 1
+
+    def subscribe(self):
+        self._ensure_listener()
+        subscription = AsyncSubscription(self.subscriber_queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self._subscribers.discard(subscription)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self):
+        return {
+            'subscribers': len(self._subscribers),
+            'listening': self._listening,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+        }
+
+
+change_feed = AsyncChangeFeed(flask_module.DATABASE_URI, retention_hours=flask_module.CHANGE_EVENT_RETENTION_HOURS)
+# /api/debug/change-feed, /metrics (Flask)가 실제로 SSE를 처리하는 이 피드의 상태를 보여주도록 바꿔 끼웁니다.
+flask_module.change_feed = change_feed
+
+
+# == 요청/응답 헬퍼 (app.py의 Flask 헬퍼와 같은 결과) ==
+def request_args(request):
+    # Flask의 request.args처럼 같은 키가 여러 번 오면 첫 값을 씁니다.
+    return MultiDict(request.query_params.multi_items())
+
+def full_path(request):
+    return f"{request.scope['path']}?{request.scope['query_string'].decode()}"
+
+def json_response(payload, status_code=200):
+    # jsonify와 같은 바이트가 나오도록 Flask 앱의 JSON provider(키 정렬, 날짜 형식)와 압축 구분자, 끝 줄바꿈을 씁니다.
+    body = flask_module.app.json.dumps(payload, separators=(",", ":")) + "\n"
+    return Response(body, status_code=status_code, media_type='application/json')
+
+def is_not_modified(request, etag, last_modified=None):
+    if_none_match = parse_etags(request.headers.get('if-none-match'))
+    if if_none_match:
+        return if_none_match.contains(etag)
+    if_modified_since = parse_date(request.headers.get('if-modified-since'))
+    if last_modified is not None and if_modified_since is not None:
+        return last_modified.replace(microsecond=0, tzinfo=None) <= if_modified_since.replace(tzinfo=None)
+    return False
+
+def with_validators(response, etag, last_modified=None):
+    response.headers['ETag'] = quote_etag(etag)
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(last_modified)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def not_modified_response(etag, last_modified=None):
+    return with_validators(Response(status_code=304), etag, last_modified)
+
+def add_cors_headers(request, response):
+    # Flask 쪽은 flask_cors가 처리합니다. 사전 요청(OPTIONS)은 Flask로 넘어가므로 여기서는 실제 응답에만 붙입니다.
+    origin = request.headers.get('origin')
+    if origin in flask_module.CORS_ORIGINS:
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.headers['Access-Control-Allow-Credentials'] = 'true'
+    response.headers.append('Vary', 'Origin')
+
+async def version_etag(conn, request, entities, *parts):
+    # app.py의 version_etag와 같은 검증값 (종류별 버전 시퀀스의 last_value)
+    row = await database.fetchrow(flask_module.version_etag_query(entities), (), conn)
+    return flask_module.make_etag(*row.values(), *parts, full_path(request), datetime.now().date())
+
+
+# == 인증 ==
+async def authenticate(token):
+    # decode_token과 같은 검사. 토큰 버전 표를 이벤트 루프에서 동기로 다시 읽지 않도록, 표에 없는 사용자만
+    # (다른 프로세스에서 방금 생성/로그인한 경우) 그 사용자의 버전을 asyncpg로 읽어 옵니다.
+    current_user = flask_module.token_claims(token)
+    versions = flask_module.token_versions
+    version = versions.peek(current_user['id'])
+    if version is None:
+        try:
+            row = await database.fetchrow("SELECT token_version FROM Users WHERE id = %s", (current_user['id'],))
+        except PoolTimeout:
+            raise
+        except Exception as e:
+            raise flask_module.TokenCheckUnavailable(str(e)) from e
+        if row is not None:
+            version = row['token_version']
+            versions.set(current_user['id'], version)
+    if version != current_user['ver']:
+        raise jwt.InvalidTokenError('Token has been revoked')
+    return current_user
+
+def token_required(handler):
+    @wraps(handler)
+    async def decorated(request):
+        token = None
+        auth_header = request.headers.get('authorization', '')
+        if auth_header.startswith('Bearer '):
+            token = auth_header.split(" ")[1]
+        if not token:
+            return json_response({'message': 'Token is missing!'}, 401)
+        try:
+            current_user = await authenticate(token)
+        except jwt.InvalidTokenError as e:
+            return json_response({'message': f'Token is invalid! Error: {e}'}, 401)
+        return await handler(request, current_user)
+
+    return decorated
+
+async def refresh_token_versions():
+    rows = await database.fetch("SELECT id, token_version FROM Users")
+    flask_module.token_versions.replace((row['id'], row['token_version']) for row in rows)
+
+async def refresh_token_versions_forever():
+    # Flask의 VersionMap이 refresh_interval마다 하던 전체 재조회를 여기서 미리 해 두므로,
+    # 요청 처리 중(이벤트 루프)에는 표를 동기로 다시 읽을 일이 없습니다.
+    while True:
+        await asyncio.sleep(flask_module.TOKEN_VERSION_REFRESH_SECONDS / 2)
+        try:
+            await refresh_token_versions()
+        except Exception as e:
+            logger.warning('token_version_refresh_failed', extra={'fields': {'error': str(e)}})
+
+
+# == Inspections ==
+def paginated_inspections(request):
+    # 페이지 단위 조회만 여기서 처리합니다. 전체 목록(limit/cursor 없음)과 updated_since 동기화는 Flask가 처리합니다.
+    args = request.query_params
+    return ('limit' in args or 'cursor' in args) and 'updated_since' not in args
+
+@token_required
+async def get_inspections(request, current_user):
+    args = request_args(request)
+    order = args.get('order', 'desc').lower()
+    if order not in ('asc', 'desc'):
+        return json_response({"message": "order must be 'asc' or 'desc'"}, 400)
+
+    try:
+        where, params = flask_module.build_inspection_filters(args)
+        page_size = flask_module.parse_page_size(args.get('limit'))
+        if args.get('cursor'):
+            cursor_created_at, cursor_id = flask_module.decode_cursor(args['cursor'])
+            where.append(flask_module.inspection_cursor_clause(order))
+            params.extend([cursor_created_at, cursor_id])
+    except ValueError as e:
+        return json_response({"message": str(e)}, 400)
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+    params.append(page_size + 1)
+
+    async with database.connection() as conn:
+        try:
+            etag = await version_etag(conn, request, ['inspection'])
+            if is_not_modified(request, etag):
+                return not_modified_response(etag)
+
+            query = flask_module.INSPECTION_LIST_QUERY.format(where_clause=where_clause, order=order.upper(), limit_clause="LIMIT %s")
+            flask_module.log_query('get_inspections', query, params)
+            inspections, next_cursor = flask_module.split_page(await database.fetch(query, params, conn), page_size)
+            return with_validators(json_response({'items': inspections, 'next_cursor': next_cursor, 'limit': page_size}), etag)
+        except Exception as e:
+            logger.exception("Error in get_inspections")
+            return json_response({"message": f"An error occurred: {e}"}, 500)
+
+async def fetch_inspection_filter_options(conn):
+    generation = flask_module.ref_list_cache.generation()
+    options = flask_module.ref_list_cache.get('inspection_filter_options')
+    if options is None:
+        options = await database.fetchrow(flask_module.INSPECTION_FILTER_OPTIONS_QUERY, (), conn)
+        options['statuses'] = list(flask_module.VALID_STATUSES)
+        flask_module.ref_list_cache.set('inspection_filter_options', options, generation=generation)
+    return options
+
+@token_required
+async def get_inspection_bootstrap(request, current_user):
+    args = request_args(request)
+    try:
+        where, params = flask_module.build_inspection_filters(args)
+        page_size = flask_module.parse_page_size(args.get('limit'))
+    except ValueError as e:
+        return json_response({"message": str(e)}, 400)
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+    async with database.connection() as conn:
+        try:
+            etag = await version_etag(conn, request, ['inspection'])
+            if is_not_modified(request, etag):
+                return not_modified_response(etag)
+
+            kpis = flask_module.summarize_kpis(await database.fetch(flask_module.INSPECTION_KPIS_QUERY.format(where_clause=''), (), conn))
+            query = flask_module.INSPECTION_LIST_QUERY.format(where_clause=where_clause, order='DESC', limit_clause='LIMIT %s')
+            flask_module.log_query('get_inspection_bootstrap', query, params + [page_size + 1])
+            items, next_cursor = flask_module.split_page(await database.fetch(query, params + [page_size + 1], conn), page_size)
+            filter_options = await fetch_inspection_filter_options(conn)
+            return with_validators(json_response({
+                'kpis': kpis,
+                'items': items,
+                'next_cursor': next_cursor,
+                'limit': page_size,
+                'filter_options': filter_options,
+            }), etag)
+        except Exception as e:
+            logger.exception("Error in get_inspection_bootstrap")
+            return json_response({"message": f"An error occurred: {e}"}, 500)
+
+
+# == Detail Bundle ==
+@token_required
+async def get_detail_bundle(request, current_user):
+    parent_type = request.path_params['parent_type']
+    parent_id = request.path_params['parent_id']
+    if parent_type not in flask_module.DETAIL_BUNDLE_SOURCES:
+        return json_response({"message": "Invalid parent type"}, 400)
+    table, item_query = flask_module.DETAIL_BUNDLE_SOURCES[parent_type]
+    params = {'id': parent_id, 'parent_type': parent_type}
+
+    async with database.connection() as conn:
+        try:
+            state = await database.fetchrow(flask_module.DETAIL_BUNDLE_STATE_QUERY.format(table=table), params, conn)
+            if state['item_modified'] is None:
+                return json_response({"message": "Item not found"}, 404)
+            etag = flask_module.make_etag('bundle', parent_type, parent_id, *state.values())
+            modified = max(value for value in (state['item_modified'], state['comment_modified'], state['history_modified']) if value)
+            if is_not_modified(request, etag, modified):
+                return not_modified_response(etag, modified)
+
+            query = item_query.format(extra=flask_module.DETAIL_BUNDLE_CHILDREN)
+            flask_module.log_query('get_detail_bundle', query, params)
+            item = await database.fetchrow(query, params, conn)
+            if not item:
+                return json_response({"message": "Item not found"}, 404)
+            comments = flask_module.parse_json_timestamps(item.pop('bundle_comments'), 'created_at', 'updated_at')
+            histories = flask_module.parse_json_timestamps(item.pop('bundle_histories'), 'created_at')
+            return with_validators(json_response({'item': item, 'comments': comments, 'histories': histories}), etag, modified)
+        except Exception as e:
+            logger.exception("Error in get_detail_bundle")
+            return json_response({"message": f"An error occurred: {e}"}, 500)
+
+
+# == Change Feed (SSE) ==
+async def stream_events(request):
+    # EventSource는 Authorization 헤더를 보낼 수 없어서 token 쿼리 파라미터도 허용합니다.
+    args = request_args(request)
+    token = args.get('token')
+    auth_header = request.headers.get('authorization', '')
+    if auth_header.startswith('Bearer '):
+        token = auth_header.split(" ")[1]
+    if not token:
+        return json_response({'message': 'Token is missing!'}, 401)
+    try:
+        await authenticate(token)
+    except jwt.InvalidTokenError as e:
+        return json_response({'message': f'Token is invalid! Error: {e}'}, 401)
+
+    last_event_id = request.headers.get('Last-Event-ID') or args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return json_response({"message": "Invalid Last-Event-ID"}, 400)
+
+    # 재전송 조회보다 먼저 구독해야 그 사이에 커밋된 이벤트를 놓치지 않습니다.
+    subscription = change_feed.subscribe()
+    try:
+        missed = []
+        if last_event_id is not None:
+            missed = await database.fetch(flask_module.MISSED_EVENTS_QUERY, flask_module.missed_events_params(last_event_id))
+    except BaseException:
+        change_feed.unsubscribe(subscription)
+        raise
+
+    async def generate():
+        # 실시간 이벤트는 커밋 순서대로 오므로 id로 거르지 않고, 재전송한 이벤트와 겹치는 것만 건너뜁니다.
+        replayed = set()
+        try:
+            yield "retry: 3000\n\n"
+            if len(missed) > flask_module.SSE_REPLAY_LIMIT:
+                # 놓친 이벤트가 너무 많으면 전체 새로고침을 요청합니다.
+                yield "event: reset\ndata: {}\n\n"
+            else:
+                for event in missed:
+                    replayed.add(event['id'])
+                    yield format_sse(event)
+            while True:
+                if subscription.lagging:
+                    yield "event: reset\ndata: {}\n\n"
+                    return
+                event = await subscription.get(timeout=flask_module.SSE_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                if event['id'] in replayed:
+                    replayed.discard(event['id'])
+                    continue
+                yield format_sse(event)
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    # 클라이언트가 연결을 끊으면 Starlette가 generate()를 취소하고, finally에서 구독이 해제됩니다.
+    return StreamingResponse(generate(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+# == Health / Warm-up ==
+warm_up_state = {'done': False, 'seconds': None}
+
+async def warm_up():
+    # asyncpg 풀을 열고 토큰 버전 표를 채운 뒤, Flask 쪽 워밍업(psycopg2 풀, 참조 목록 캐시)을 스레드에서 실행합니다.
+    started = time.perf_counter()
+    await database.open()
+    await refresh_token_versions()
+    if not await asyncio.to_thread(flask_module.warm_up):
+        raise RuntimeError("Database connection failed")
+    warm_up_state.update(done=True, seconds=round(time.perf_counter() - started, 3))
+    logger.info('warm_up', extra={'fields': {'seconds': warm_up_state['seconds'], 'async_db_pool': database.stats()}})
+
+async def warm_up_forever():
+    # DB가 아직 뜨지 않았을 수 있으므로 성공할 때까지 재시도합니다. 그동안 readiness는 503입니다.
+    delay = 0.5
+    while True:
+        try:
+            await warm_up()
+            return
+        except Exception as e:
+            logger.warning('warm_up_failed', extra={'fields': {'error': str(e)}})
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 5.0)
+
+async def health_live(request):
+    return json_response({"status": "ok"})
+
+async def health_ready(request):
+    if not warm_up_state['done']:
+        return json_response({"status": "starting"}, 503)
+    try:
+        await database.fetch("SELECT 1")
+    except Exception as e:
+        return json_response({"status": "unavailable", "message": str(e)}, 503)
+    return json_response({"status": "ready", "warm_up_seconds": warm_up_state['seconds'],
+                          "db_pool": flask_module.db_pool.stats(), "async_db_pool": database.stats()})
+
+
+# == 라우팅 ==
+class Native:
+    # 이벤트 루프에서 직접 처리하는 라우트. when(request)가 False인 요청은 같은 경로라도 Flask로 넘깁니다.
+    # rule은 Flask의 url_rule과 같은 이름으로 /metrics에 기록하기 위한 값입니다.
+    def __init__(self, handler, rule, when=None):
+        self.handler = handler
+        self.rule = rule
+        self.when = when
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        if self.when is not None and not self.when(request):
+            await flask_wsgi(scope, receive, send)
+            return
+        stats = metrics.begin_request()
+        try:
+            response = await self.handler(request)
+        except PoolTimeout:
+            response = json_response({"message": "Server is busy, please try again shortly."}, 503)
+        except flask_module.TokenCheckUnavailable as e:
+            logger.error("Token version check failed", extra={'fields': {'error': str(e)}})
+            response = json_response({"message": "Server is busy, please try again shortly."}, 503)
+        except Exception as e:
+            logger.exception("Unhandled error in %s", self.rule)
+            response = json_response({"message": f"An error occurred: {e}"}, 500)
+        finally:
+            metrics.end_request()
+        response_bytes = None if isinstance(response, StreamingResponse) else len(response.body)
+        flask_module.request_metrics.record(request.method, self.rule, response.status_code,
+                                            time.perf_counter() - stats.started, stats, response_bytes)
+        add_cors_headers(request, response)
+        await response(scope, receive, send)
+
+
+flask_wsgi = WSGIMiddleware(flask_module.app, workers=ASGI_WSGI_THREADS)
+
+@contextlib.asynccontextmanager
+async def lifespan(router):
+    warm_up_task = asyncio.create_task(warm_up_forever())
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(asyncio.shield(warm_up_task), ASGI_WARMUP_TIMEOUT)
+    refresh_task = asyncio.create_task(refresh_token_versions_forever())
+    logger.info('serve', extra={'fields': {
+        'mode': 'asgi', 'wsgi_threads': ASGI_WSGI_THREADS, 'ready': warm_up_state['done'],
+        'db_pool_max_size': flask_module.DB_POOL_MAX_SIZE, 'async_db_pool_max_size': ASYNC_DB_POOL_MAX_SIZE,
+    }})
+    try:
+        yield
+    finally:
+        for task in (warm_up_task, refresh_task):
+            task.cancel()
+        await change_feed.close()
+        await database.close()
+
+# 같은 경로의 다른 메서드(POST /api/inspections 등)는 Route가 부분 일치만 하므로 마지막 Mount(Flask)가 처리합니다.
+application = Router(routes=[
+    Route('/api/health/live', Native(health_live, '/api/health/live'), methods=['GET']),
+    Route('/api/health/ready', Native(health_ready, '/api/health/ready'), methods=['GET']),
+    Route('/api/inspections', Native(get_inspections, '/api/inspections', when=paginated_inspections), methods=['GET']),
+    Route('/api/inspections/bootstrap', Native(get_inspection_bootstrap, '/api/inspections/bootstrap'), methods=['GET']),
+    Route('/api/details/{parent_type}/{parent_id:int}',
+          Native(get_detail_bundle, '/api/details/<parent_type>/<int:parent_id>'), methods=['GET']),
+    Route('/api/events', Native(stream_events, '/api/events'), methods=['GET']),
+    Mount('/', app=flask_wsgi),
+], redirect_slashes=False, lifespan=lifespan)
@@ -0,0 +1,336 @@
+"""동기(waitress + Flask) / 비동기(uvicorn + asgi.py) 서버 모드 비교 벤치마크.
+
+임시 PostgreSQL 데이터베이스를 만들어 시드한 뒤 같은 데이터로 두 서버를 차례로 실제 프로세스로 띄우고,
+SSE 스트림 N개를 열어 둔 상태에서 대시보드/상세 클라이언트 C개가 HTTP로 요청을 보내
+p50/p95/p99 지연 시간, 처리량, 오류(시간 초과 포함) 수, 끝까지 유지된 스트림 수를 비교합니다.
+
+    cd backend
+    pip install -r requirements-async.txt
+    python -m bench.compare_async --admin-dsn postgresql://postgres@localhost/postgres --size 10000 \\
+        --concurrency 64 --streams 200 --threads 8
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import psycopg2
+
+from bench import seed as seeding
+from bench.run import create_database, drop_database, percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sync_command(args):
+    # SSE 연결도 waitress의 연결 수 제한에 걸리지 않도록 넉넉히 둡니다. (제한은 --threads)
+    return [sys.executable, 'serve.py', '--host', '127.0.0.1', '--port', str(args.port), '--threads', str(args.threads),
+            '--connection-limit', str(args.concurrency + args.streams + 50)]
+
+
+def async_command(args):
+    return [sys.executable, '-m', 'uvicorn', 'asgi:application', '--host', '127.0.0.1', '--port', str(args.port),
+            '--log-level', 'warning', '--no-access-log']
+
+
+MODES = {
+    # name: (description, command)
+    'sync': ('waitress + Flask (serve.py)', sync_command),
+    'async': ('uvicorn + asyncpg (asgi.py)', async_command),
+}
+
+
+def server_env(args, dsn):
+    env = dict(os.environ)
+    env.update({
+        'DOTENV': '0',
+        'DATABASE_URI': dsn,
+        'SECRET_KEY': env.get('SECRET_KEY') or 'bench-secret-key-0123456789abcdef0123',
+        'LOG_LEVEL': 'WARNING',
+        'DB_POOL_MAX_SIZE': str(args.threads + 2),
+        'ASYNC_DB_POOL_MAX_SIZE': str(args.async_pool_size),
+        'ASGI_WSGI_THREADS': str(args.threads),
+    })
+    return env
+
+
+class HttpClient:
+    # 클라이언트마다 keep-alive 커넥션 하나. 시간 초과/연결 오류는 상태 0으로 기록하고 다시 연결합니다.
+    def __init__(self, port, token, timeout):
+        self.port = port
+        self.timeout = timeout
+        self.headers = {'Authorization': f"Bearer {token}"} if token else {}
+        self.conn = None
+
+    def request(self, method, path, body=None):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.timeout)
+        headers = dict(self.headers)
+        if body is not None:
+            body = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            return 0, b''
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class Stream(threading.Thread):
+    # /api/events에 연결해서 첫 줄(retry)을 받으면 열린 것으로 보고, 끝날 때까지 읽기만 합니다.
+    def __init__(self, port, token, timeout):
+        super().__init__(daemon=True)
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+        self.attempted = threading.Event()
+        self.opened = False
+        self.failed = False
+        self.stopping = False
+        self.conn = None
+
+    def run(self):
+        try:
+            self.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.timeout)
+            self.conn.request('GET', f"/api/events?token={self.token}")
+            response = self.conn.getresponse()
+            self.opened = response.status == 200 and response.readline().startswith(b'retry:')
+            # 열린 뒤에는 하트비트(SSE_HEARTBEAT_SECONDS)보다 긴 읽기 시간 초과를 씁니다.
+            self.conn.sock.settimeout(60)
+            self.attempted.set()
+            while self.opened and not self.stopping:
+                if not response.readline():
+                    break
+        except (OSError, http.client.HTTPException, AttributeError):
+            pass
+        finally:
+            self.failed = not self.stopping
+            self.attempted.set()
+
+    def stop(self):
+        self.stopping = True
+        try:
+            self.conn.sock.shutdown(socket.SHUT_RDWR)
+        except (OSError, AttributeError):
+            pass
+
+
+class Worker:
+    def __init__(self, client, counts, rng, record):
+        self.client = client
+        self.counts = counts
+        self.rng = rng
+        self.record = record
+
+    def call(self, label, path):
+        started = time.perf_counter()
+        status, body = self.client.request('GET', path)
+        self.record(label, time.perf_counter() - started, status)
+        return status, body
+
+    def dashboard(self):
+        status, body = self.call('GET /api/inspections/bootstrap', '/api/inspections/bootstrap?limit=20')
+        next_cursor = json.loads(body).get('next_cursor') if status == 200 else None
+        if next_cursor and self.rng.random() < 0.3:
+            self.call('GET /api/inspections?cursor', f'/api/inspections?limit=20&cursor={next_cursor}')
+
+    def detail(self):
+        # 최근 항목일수록 자주 조회되도록 치우치게 고릅니다. (bench.run과 같은 분포)
+        size = self.counts['inspections']
+        item_id = max(1, size - int(size * self.rng.random() ** 3))
+        self.call('GET /api/details/inspection/<id>', f'/api/details/inspection/{item_id}')
+
+    def step(self):
+        if self.rng.random() < 0.5:
+            self.dashboard()
+        else:
+            self.detail()
+
+
+def wait_until_ready(port, process, timeout):
+    client = HttpClient(port, None, timeout=2)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        status, _ = client.request('GET', '/api/health/ready')
+        if status == 200:
+            client.close()
+            return
+        time.sleep(0.5)
+    raise RuntimeError("server did not become ready")
+
+
+def login(port):
+    client = HttpClient(port, None, timeout=30)
+    status, body = client.request('POST', '/api/login', {'username': seeding.ADMIN_USERNAME, 'password': seeding.BENCH_PASSWORD})
+    client.close()
+    if status != 200:
+        raise RuntimeError(f"login failed with status {status}")
+    return json.loads(body)['token']
+
+
+def run_mode(args, mode, dsn, counts):
+    description, command = MODES[mode]
+    process = subprocess.Popen(command(args), cwd=BACKEND_DIR, env=server_env(args, dsn),
+                               stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL)
+    streams = []
+    try:
+        wait_until_ready(args.port, process, args.ready_timeout)
+        token = login(args.port)
+
+        samples = {}
+        errors = {}
+        lock = threading.Lock()
+
+        def record(label, elapsed, status):
+            with lock:
+                samples.setdefault(label, []).append(elapsed)
+                if status == 0 or status >= 400:
+                    errors[label] = errors.get(label, 0) + 1
+
+        # 워밍업은 스트림을 열기 전에 합니다. (동기 모드에서는 스트림마다 요청 스레드 하나를 계속 차지합니다)
+        workers = [Worker(HttpClient(args.port, token, args.timeout), counts, random.Random(1000 + i), record)
+                   for i in range(args.concurrency)]
+        for worker in workers:
+            for _ in range(args.warmup):
+                worker.step()
+        samples.clear()
+        errors.clear()
+
+        streams = [Stream(args.port, token, args.timeout) for _ in range(args.streams)]
+        for stream in streams:
+            stream.start()
+        for stream in streams:
+            stream.attempted.wait(args.timeout + 5)
+        opened = sum(stream.opened for stream in streams)
+
+        deadline = time.perf_counter() + args.duration
+
+        def loop(worker):
+            while time.perf_counter() < deadline:
+                worker.step()
+
+        threads = [threading.Thread(target=loop, args=(worker,)) for worker in workers]
+        run_started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - run_started
+        held = sum(stream.opened and not stream.failed for stream in streams)
+        for worker in workers:
+            worker.client.close()
+
+        endpoints = {}
+        all_values = []
+        for label, values in sorted(samples.items()):
+            values.sort()
+            all_values.extend(values)
+            endpoints[label] = {
+                'requests': len(values),
+                'errors': errors.get(label, 0),
+                'throughput_rps': round(len(values) / elapsed, 2),
+                'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+            }
+        all_values.sort()
+        return {
+            'mode': mode,
+            'server': description,
+            'duration_seconds': round(elapsed, 2),
+            'requests': len(all_values),
+            'errors': sum(errors.values()),
+            'throughput_rps': round(len(all_values) / elapsed, 2),
+            'p50_ms': round(percentile(all_values, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(all_values, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(all_values, 0.99) * 1000, 2),
+            'streams': {'requested': args.streams, 'opened': opened, 'held': held},
+            'endpoints': endpoints,
+        }
+    finally:
+        for stream in streams:
+            stream.stop()
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def print_report(args, counts, results):
+    print(f"\n=== size={counts['inspections']} inspections  concurrency={args.concurrency}  streams={args.streams}  "
+          f"sync threads={args.threads}  async pool={args.async_pool_size}  duration={args.duration}s")
+    print(f"{'mode':34} {'reqs':>7} {'err':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'streams':>9}")
+    for result in results:
+        streams = result['streams']
+        print(f"{result['server']:34} {result['requests']:>7} {result['errors']:>5} {result['throughput_rps']:>8} "
+              f"{result['p50_ms']:>8} {result['p95_ms']:>8} {result['p99_ms']:>8} {streams['held']:>4}/{streams['requested']:<4}")
+    for result in results:
+        print(f"\n[{result['mode']}] {'endpoint':42} {'reqs':>7} {'err':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for label, row in result['endpoints'].items():
+            print(f"{'':{len(result['mode']) + 3}}{label:42} {row['requests']:>7} {row['errors']:>5} {row['throughput_rps']:>8} "
+                  f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the sync (waitress) and async (uvicorn/asyncpg) serving modes.')
+    parser.add_argument('--admin-dsn', default=os.getenv('BENCH_ADMIN_DSN', 'postgresql://postgres@localhost/postgres'),
+                        help='DSN with permission to CREATE/DROP DATABASE')
+    parser.add_argument('--size', type=int, default=10000, help='Number of inspections')
+    parser.add_argument('--modes', default='sync,async', help='Comma separated modes to run, in order')
+    parser.add_argument('--duration', type=float, default=20.0, help='Seconds to run each mode')
+    parser.add_argument('--concurrency', type=int, default=32, help='Dashboard/detail clients')
+    parser.add_argument('--streams', type=int, default=50, help='SSE streams held open during the run')
+    parser.add_argument('--threads', type=int, default=8, help='waitress threads (sync) / Flask fallback threads (async)')
+    parser.add_argument('--async-pool-size', type=int, default=20, help='ASYNC_DB_POOL_MAX_SIZE for the async mode')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Client timeout; slower requests count as errors')
+    parser.add_argument('--warmup', type=int, default=3, help='Warm-up steps per client')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--ready-timeout', type=float, default=60.0)
+    parser.add_argument('--json', help='Write the full report to this file')
+    parser.add_argument('--keep', action='store_true', help='Keep the benchmark database')
+    parser.add_argument('--verbose', action='store_true', help='Show server stderr')
+    args = parser.parse_args()
+    modes = args.modes.split(',')
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode {mode!r} (choose from {', '.join(MODES)})")
+
+    name = f"qw_bench_async_{args.size}"
+    dsn = create_database(args.admin_dsn, name)
+    try:
+        conn = psycopg2.connect(dsn)
+        try:
+            seeding.apply_schema(conn)
+            counts = seeding.seed(conn, args.size)
+        finally:
+            conn.close()
+
+        results = [run_mode(args, mode, dsn, counts) for mode in modes]
+        print_report(args, counts, results)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({'counts': counts, 'results': results}, f, ensure_ascii=False, indent=2)
+    finally:
+        if not args.keep:
+            drop_database(args.admin_dsn, name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+"""Flask API 벤치마크.
+
+데이터 크기별로 임시 PostgreSQL 데이터베이스를 만들고 시드한 뒤, 여러 스레드에서 시나리오를 실행해
+엔드포인트별 p50/p95/p99 지연 시간, 처리량, 요청당 DB 왕복 횟수를 보고합니다.
+
+    cd backend
+    python -m bench.run --admin-dsn postgresql://postgres@localhost/postgres --sizes 1000,10000,100000
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+from bench import seed as seeding
+
+SCENARIOS = {
+    # name: (weight, function)
+}
+
+
+def scenario(name, weight):
+    def register(func):
+        SCENARIOS[name] = (weight, func)
+        return func
+    return register
+
+
+class Worker:
+    def __init__(self, app_module, counts, delete_ids, rng, record):
+        self.client = app_module.app.test_client()
+        self.counts = counts
+        self.delete_ids = delete_ids
+        self.rng = rng
+        self.record = record
+        self.headers = {'Authorization': f"Bearer {self.login(seeding.ADMIN_USERNAME)}"}
+
+    def call(self, label, method, url, **kwargs):
+        started = time.perf_counter()
+        response = self.client.open(url, method=method, **kwargs)
+        elapsed = time.perf_counter() - started
+        self.record(label, elapsed, response.status_code)
+        return response
+
+    def login(self, username):
+        response = self.client.post('/api/login', json={'username': username, 'password': seeding.BENCH_PASSWORD})
+        return response.get_json()['token']
+
+    def random_inspection_id(self):
+        # 최근 항목일수록 자주 조회되도록 치우치게 고릅니다.
+        size = self.counts['inspections']
+        return max(1, size - int(size * self.rng.random() ** 3))
+
+
+@scenario('login', 1)
+def run_login(worker):
+    username = seeding.ADMIN_USERNAME if worker.rng.random() < 0.2 else f"user{worker.rng.randrange(2, worker.counts['users'] + 1):05d}"
+    worker.call('POST /api/login', 'POST', '/api/login', json={'username': username, 'password': seeding.BENCH_PASSWORD})
+
+
+@scenario('dashboard', 6)
+def run_dashboard(worker):
+    response = worker.call('GET /api/inspections/bootstrap', 'GET', '/api/inspections/bootstrap?limit=20', headers=worker.headers)
+    next_cursor = (response.get_json() or {}).get('next_cursor')
+    if next_cursor and worker.rng.random() < 0.3:
+        worker.call('GET /api/inspections?cursor', 'GET', '/api/inspections', headers=worker.headers,
+                    query_string={'limit': 20, 'cursor': next_cursor})
+
+
+@scenario('dashboard_full_list', 1)
+def run_full_list(worker):
+    worker.call('GET /api/inspections (full)', 'GET', '/api/inspections', headers=worker.headers)
+
+
+@scenario('detail', 6)
+def run_detail(worker):
+    item_id = worker.random_inspection_id()
+    worker.call('GET /api/inspections/<id>', 'GET', f'/api/inspections/{item_id}', headers=worker.headers)
+    worker.call('GET /api/comments/inspection/<id>', 'GET', f'/api/comments/inspection/{item_id}', headers=worker.headers)
+    worker.call('GET /api/histories/inspection/<id>', 'GET', f'/api/histories/inspection/{item_id}', headers=worker.headers)
+
+
+@scenario('detail_bundle', 6)
+def run_detail_bundle(worker):
+    item_id = worker.random_inspection_id()
+    worker.call('GET /api/details/inspection/<id>', 'GET', f'/api/details/inspection/{item_id}', headers=worker.headers)
+
+
+@scenario('my_posts', 2)
+def run_my_posts(worker):
+    response = worker.call('GET /api/my-posts', 'GET', '/api/my-posts?limit=10', headers=worker.headers)
+    next_cursor = (response.get_json() or {}).get('next_cursor')
+    if next_cursor and worker.rng.random() < 0.5:
+        worker.call('GET /api/my-posts?cursor', 'GET', '/api/my-posts', headers=worker.headers,
+                    query_string={'limit': 10, 'cursor': next_cursor})
+
+
+@scenario('search', 1)
+def run_search(worker):
+    term = worker.rng.choice(seeding.DEFECT_REASONS + seeding.SOLUTIONS).split()[0]
+    worker.call('GET /api/search', 'GET', '/api/search', headers=worker.headers, query_string={'q': term, 'limit': 20})
+
+
+@scenario('analytics', 1)
+def run_analytics(worker):
+    bucket = worker.rng.choice(['day', 'week', 'month'])
+    group_by = worker.rng.choice(['none', 'company', 'product', 'inspector'])
+    worker.call('GET /api/analytics/defects', 'GET', '/api/analytics/defects', headers=worker.headers,
+                query_string={'bucket': bucket, 'group_by': group_by})
+
+
+@scenario('update', 2)
+def run_update(worker):
+    item_id = worker.random_inspection_id()
+    worker.call('PUT /api/inspections/<id>', 'PUT', f'/api/inspections/{item_id}', headers=worker.headers,
+                json={'progress_percentage': worker.rng.choice([10, 30, 50, 70, 90, 100]),
+                      'solution': worker.rng.choice(seeding.SOLUTIONS)})
+
+
+@scenario('delete', 1)
+def run_delete(worker):
+    if not worker.delete_ids:
+        return
+    item_id = worker.delete_ids.pop()
+    worker.call('DELETE /api/inspections/<id>', 'DELETE', f'/api/inspections/{item_id}', headers=worker.headers)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def create_database(admin_dsn, name):
+    conn = psycopg2.connect(admin_dsn)
+    conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f'DROP DATABASE IF EXISTS "{name}"')
+            cursor.execute(f'CREATE DATABASE "{name}"')
+    finally:
+        conn.close()
+    return psycopg2.extensions.make_dsn(admin_dsn, dbname=name)
+
+
+def drop_database(admin_dsn, name):
+    conn = psycopg2.connect(admin_dsn)
+    conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f'DROP DATABASE IF EXISTS "{name}"')
+    finally:
+        conn.close()
+
+
+def bind_app(dsn, pool_size, token_cache_size=None):
+    # app 모듈은 import 시점에 DATABASE_URI로 풀을 만듭니다. 크기별로 새 DB를 가리키도록 풀과 캐시를 교체합니다.
+    os.environ['DATABASE_URI'] = dsn
+    os.environ['DB_POOL_MAX_SIZE'] = str(pool_size)
+    if 'app' not in sys.modules:
+        app_module = importlib.import_module('app')
+    else:
+        app_module = sys.modules['app']
+        app_module.db_pool.closeall()
+        app_module.db_pool = app_module.ConnectionPool(
+            dsn, maxconn=pool_size, timeout=app_module.DB_POOL_TIMEOUT, cursor_wrapper=app_module.metrics.InstrumentedCursor,
+        )
+    for cache in app_module.REF_CACHES + (app_module.verified_token_cache, app_module.token_versions):
+        cache.clear()
+    if token_cache_size is not None:
+        app_module.verified_token_cache.max_size = token_cache_size
+    # 벤치마크는 모든 요청이 한 IP, 몇 개의 계정에서 오므로 로그인 시도 제한을 사실상 끕니다.
+    for limiter in (app_module.login_user_limiter, app_module.login_ip_limiter):
+        limiter.clear()
+        limiter.burst = 10 ** 9
+    return app_module
+
+
+def measure_auth(app_module, token, rounds=2000):
+    # token_required의 인증 비용: 매번 HMAC 검증을 하는 경우와 검증된 토큰 캐시에 맞은 경우의 평균 시간
+    cache = app_module.verified_token_cache
+    started = time.perf_counter()
+    for _ in range(rounds):
+        cache.delete(token)
+        app_module.decode_token(token)
+    verify_seconds = (time.perf_counter() - started) / rounds
+    started = time.perf_counter()
+    for _ in range(rounds):
+        app_module.decode_token(token)
+    cached_seconds = (time.perf_counter() - started) / rounds
+    return {'verify_us': round(verify_seconds * 1e6, 2), 'cached_us': round(cached_seconds * 1e6, 2)}
+
+
+def run_size(args, size):
+    name = f"qw_bench_{size}"
+    dsn = create_database(args.admin_dsn, name)
+    try:
+        conn = psycopg2.connect(dsn)
+        try:
+            started = time.perf_counter()
+            seeding.apply_schema(conn)
+            counts = seeding.seed(conn, size)
+            seed_seconds = time.perf_counter() - started
+        finally:
+            conn.close()
+
+        app_module = bind_app(dsn, args.concurrency + 2, args.token_cache_size)
+        app_module.request_metrics = app_module.metrics.MetricsRegistry()
+
+        samples = {}
+        errors = {}
+        lock = threading.Lock()
+
+        def record(label, elapsed, status):
+            with lock:
+                samples.setdefault(label, []).append(elapsed)
+                if status >= 400:
+                    errors[label] = errors.get(label, 0) + 1
+
+        # 삭제 대상은 스레드마다 겹치지 않게 나눠줍니다. (가장 오래된 항목부터)
+        delete_pool = list(range(1, min(size, args.concurrency * 500) + 1))
+        names = list(SCENARIOS)
+        weights = [SCENARIOS[n][0] for n in names]
+
+        workers = [
+            Worker(app_module, counts, delete_pool[i::args.concurrency], random.Random(1000 + i), record)
+            for i in range(args.concurrency)
+        ]
+
+        # 워밍업: 커넥션과 캐시를 채운 뒤 측정값을 초기화합니다.
+        for worker in workers:
+            for _ in range(args.warmup):
+                SCENARIOS[worker.rng.choices(names, weights)[0]][1](worker)
+        samples.clear()
+        errors.clear()
+        app_module.request_metrics = app_module.metrics.MetricsRegistry()
+        auth = measure_auth(app_module, workers[0].headers['Authorization'].split(' ')[1])
+        token_cache = app_module.verified_token_cache
+        token_cache.hits = token_cache.misses = 0
+
+        deadline = time.perf_counter() + args.duration
+
+        def loop(worker):
+            while time.perf_counter() < deadline:
+                SCENARIOS[worker.rng.choices(names, weights)[0]][1](worker)
+
+        threads = [threading.Thread(target=loop, args=(worker,)) for worker in workers]
+        run_started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - run_started
+
+        db_stats = {f"{method} {endpoint}": value for (method, endpoint), value in app_module.request_metrics.snapshot().items()}
+        endpoints = {}
+        for label, values in sorted(samples.items()):
+            values.sort()
+            endpoints[label] = {
+                'requests': len(values),
+                'errors': errors.get(label, 0),
+                'throughput_rps': round(len(values) / elapsed, 2),
+                'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+            }
+        total_requests = sum(len(v) for v in samples.values())
+        return {
+            'size': size,
+            'counts': counts,
+            'seed_seconds': round(seed_seconds, 2),
+            'duration_seconds': round(elapsed, 2),
+            'concurrency': args.concurrency,
+            'throughput_rps': round(total_requests / elapsed, 2),
+            'endpoints': endpoints,
+            'db': db_stats,
+            'auth': {**auth, 'token_cache': token_cache.stats(), 'kdf_pool': app_module.kdf_pool.stats()},
+        }
+    finally:
+        if 'app' in sys.modules:
+            sys.modules['app'].db_pool.closeall()
+        if not args.keep:
+            drop_database(args.admin_dsn, name)
+
+
+def print_report(result):
+    print(f"\n=== size={result['size']} inspections  concurrency={result['concurrency']}  "
+          f"duration={result['duration_seconds']}s  total={result['throughput_rps']} req/s  (seed {result['seed_seconds']}s)")
+    print(f"{'endpoint':42} {'reqs':>7} {'err':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, row in result['endpoints'].items():
+        print(f"{label:42} {row['requests']:>7} {row['errors']:>5} {row['throughput_rps']:>8} "
+              f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}")
+    auth = result['auth']
+    print(f"\nauth: jwt verify {auth['verify_us']} us, cached {auth['cached_us']} us, "
+          f"token cache hit rate {auth['token_cache']['hit_rate']} (size {auth['token_cache']['max_size']}), "
+          f"kdf {auth['kdf_pool']['run_ms_avg']} ms avg, {auth['kdf_pool']['rejected']} rejected")
+    print(f"\n{'route':60} {'db trips':>9} {'db ms':>8} {'rows':>9}")
+    for route, row in sorted(result['db'].items()):
+        print(f"{route:60} {row['db_queries_avg']:>9.2f} {row['db_ms_avg']:>8.2f} {row['rows_avg']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Flask API against throwaway local PostgreSQL databases.')
+    parser.add_argument('--admin-dsn', default=os.getenv('BENCH_ADMIN_DSN', 'postgresql://postgres@localhost/postgres'),
+                        help='DSN with permission to CREATE/DROP DATABASE')
+    parser.add_argument('--sizes', default='1000,10000,100000', help='Comma separated inspection counts')
+    parser.add_argument('--duration', type=float, default=20.0, help='Seconds to run each size')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=5, help='Warm-up scenarios per worker')
+    parser.add_argument('--json', help='Write the full report to this file')
+    parser.add_argument('--keep', action='store_true', help='Keep the benchmark databases')
+    parser.add_argument('--token-cache-size', type=int,
+                        help='Override TOKEN_CACHE_SIZE (0 disables the verified-token cache for comparison runs)')
+    args = parser.parse_args()
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(',')):
+        result = run_size(args, size)
+        print_report(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
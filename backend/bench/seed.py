@@ -0,0 +1,174 @@
+"""벤치마크용 스키마 생성 및 시드 데이터 생성기.
+
+사용자/업체/제품은 소수가 대부분의 데이터를 차지하도록(Zipf 분포) 치우치게 생성합니다.
+"""
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import random
+from datetime import date, datetime, timedelta
+
+import psycopg2
+from passlib.hash import pbkdf2_sha256 as sha256
+
+import migrate
+
+BENCH_PASSWORD = 'bench-password'
+ADMIN_USERNAME = 'test'  # is_admin()이 관리자로 인식하는 계정
+
+DEFECT_REASONS = ['치수 불량', '도장 불량', '용접 불량', '이물 혼입', '조립 불량', '표면 스크래치', '버(Burr) 발생', '변형']
+SOLUTIONS = ['전수 검사 후 선별', '공정 조건 재설정', '작업자 재교육', '금형 수리', '협력사 개선 요청', '포장 방법 변경']
+
+# 원본 테이블에서 백필하는 파생 테이블 마이그레이션
+DERIVED_MIGRATIONS = ('0004_search.sql', '0005_inspection_rollups.sql')
+
+
+def zipf_picker(rng, values, exponent=1.1):
+    # 누적 가중치를 한 번만 계산해 두고 매번 O(log n)으로 뽑습니다.
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) ** exponent for rank in range(len(values))))
+    return lambda: rng.choices(values, cum_weights=cum_weights)[0]
+
+
+def scaled_counts(size):
+    # size = 검수 건수. 나머지 테이블은 현실적인 비율로 맞춥니다.
+    return {
+        'users': max(5, size // 500),
+        'companies': max(5, size // 200),
+        'products': max(10, size // 50),
+        'inspections': size,
+        'quality': max(10, size // 5),
+        'comments': size * 2,
+        'histories': size * 3,
+    }
+
+
+def copy_rows(cursor, table, columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(['' if value is None else value for value in row])
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '')", buffer)
+
+
+def apply_schema(conn):
+    migrate.migrate(conn, log=lambda message: None)
+
+
+def seed(conn, size, rng=None):
+    rng = rng or random.Random(42)
+    counts = scaled_counts(size)
+    now = datetime.now()
+    today = date.today()
+    password_hash = sha256.hash(BENCH_PASSWORD)  # 모든 사용자가 같은 해시를 공유 (KDF는 한 번만 계산)
+
+    company_ids = list(range(1, counts['companies'] + 1))
+    product_ids = list(range(1, counts['products'] + 1))
+    pick_user = zipf_picker(rng, list(range(1, counts['users'] + 1)))
+    pick_company = zipf_picker(rng, company_ids)
+    pick_product = zipf_picker(rng, product_ids)
+
+    def random_created():
+        return now - timedelta(days=rng.random() ** 2 * 3 * 365, seconds=rng.randrange(86400))
+
+    with conn.cursor() as cursor:
+        users = [(ADMIN_USERNAME, password_hash, '품질팀')]
+        users += [(f'user{i:05d}', password_hash, rng.choice(['품질팀', '생산팀', '구매팀'])) for i in range(2, counts['users'] + 1)]
+        copy_rows(cursor, 'Users', ('username', 'password_hash', 'team'), users)
+
+        copy_rows(cursor, 'Companies', ('company_name',), [(f'협력사{i:05d}',) for i in company_ids])
+        copy_rows(cursor, 'Products', ('product_name', 'product_code'), [(f'부품{i:05d}', f'P-{i:06d}') for i in product_ids])
+
+        inspections = []
+        for _ in range(counts['inspections']):
+            created = random_created()
+            received = created.date()
+            target = received + timedelta(days=rng.randrange(3, 60))
+            progress = 100 if target < today and rng.random() < 0.7 else rng.choice([0, 10, 30, 50, 70, 90, 100])
+            inspected = rng.randrange(10, 5000)
+            inspections.append((
+                pick_company(),
+                pick_product(),
+                pick_user(),
+                inspected, int(inspected * rng.random() * 0.1),
+                rng.choice(DEFECT_REASONS), rng.choice(SOLUTIONS),
+                received, target, progress, 'inProgress',
+                created, created + timedelta(days=rng.randrange(0, 10)) if rng.random() < 0.5 else None,
+            ))
+        copy_rows(cursor, 'Inspections', (
+            'company_id', 'product_id', 'user_id', 'inspected_quantity', 'defective_quantity', 'defect_reason',
+            'solution', 'received_date', 'target_date', 'progress_percentage', 'status', 'created_at', 'updated_at',
+        ), inspections)
+
+        quality = []
+        for _ in range(counts['quality']):
+            created = random_created()
+            start = created.date()
+            quality.append((
+                pick_user(), pick_company(),
+                f"{rng.choice(DEFECT_REASONS)} 개선 - {rng.choice(SOLUTIONS)}",
+                start, start + timedelta(days=rng.randrange(7, 120)), rng.choice([0, 20, 40, 60, 80, 100]),
+                'inProgress', created, None,
+            ))
+        copy_rows(cursor, 'QualityImprovements', (
+            'user_id', 'company_id', 'item_description', 'start_date', 'end_date', 'progress', 'status',
+            'created_at', 'updated_at',
+        ), quality)
+
+        # 댓글/이력도 일부 항목에 몰리도록 parent_id를 치우치게 선택합니다.
+        pick_inspection = zipf_picker(rng, range(1, counts['inspections'] + 1), exponent=0.8)
+        quality_id_range = range(1, counts['quality'] + 1)
+
+        def random_parent():
+            if rng.random() < 0.8:
+                return 'inspection', pick_inspection()
+            return 'quality', rng.choice(quality_id_range)
+
+        comments = []
+        for _ in range(counts['comments']):
+            parent_type, parent_id = random_parent()
+            comments.append((pick_user(), parent_id, parent_type,
+                             f"확인했습니다. {rng.choice(SOLUTIONS)} 진행 예정입니다.", random_created(), None))
+        copy_rows(cursor, 'Comments', ('user_id', 'parent_id', 'parent_type', 'content', 'created_at', 'updated_at'), comments)
+
+        histories = []
+        for _ in range(counts['histories']):
+            parent_type, parent_id = random_parent()
+            old, new = sorted(rng.sample(range(0, 101, 10), 2))
+            field = 'progress_percentage' if parent_type == 'inspection' else 'progress'
+            changes = [{'field': field, 'label': '진행률', 'old': str(old), 'new': str(new)}]
+            histories.append((pick_user(), parent_id, parent_type,
+                              json.dumps(changes, ensure_ascii=False), random_created()))
+        copy_rows(cursor, 'Histories', ('user_id', 'parent_id', 'parent_type', 'changes', 'created_at'), histories)
+
+        # 검색 색인/분석 합계처럼 원본에서 파생되는 테이블은 COPY로는 채워지지 않으므로,
+        # 해당 마이그레이션의 백필(ON CONFLICT DO NOTHING)을 다시 실행합니다.
+        for filename in DERIVED_MIGRATIONS:
+            with open(os.path.join(migrate.MIGRATIONS_DIR, filename), encoding='utf-8') as f:
+                cursor.execute(f.read())
+
+        cursor.execute("ANALYZE")
+    conn.commit()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create the schema and seed a benchmark database.')
+    parser.add_argument('--dsn', required=True, help='Target (empty) database DSN')
+    parser.add_argument('--size', type=int, default=10000, help='Number of inspections')
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(args.dsn)
+    try:
+        apply_schema(conn)
+        counts = seed(conn, args.size)
+        print(counts)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+import json
+import logging
+import queue
+import select
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+CHANNEL = 'qw_changes'
+
+logger = logging.getLogger('qw.change_feed')
+
+
+class Subscription:
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize=maxsize)
+        # 큐가 가득 차서 이벤트를 놓친 구독자는 lagging으로 표시하고, 클라이언트가 재접속해서
+        # Last-Event-ID로 DB에서 다시 받아가도록 합니다.
+        self.lagging = False
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class ChangeFeed:
+    # 프로세스당 하나의 LISTEN 커넥션과 리스너 스레드로 모든 구독자에게 이벤트를 나눠줍니다.
+    def __init__(self, dsn, channel=CHANNEL, subscriber_queue_size=256, poll_interval=5.0,
+                 retention_hours=24, prune_interval=600.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.retention_hours = retention_hours
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        self.subscriber_queue_size = subscriber_queue_size
+        self.poll_interval = poll_interval
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.delivered = 0
+        self.dropped = 0
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._listen_forever, name='change-feed-listener', daemon=True)
+                self._thread.start()
+
+    def _listen_forever(self):
+        backoff = 1.0
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel};")
+                backoff = 1.0
+                while True:
+                    if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                        self._prune(conn)
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self._dispatch(notify.payload)
+            except Exception as e:
+                logger.error("Change feed listener error", extra={'fields': {'error': str(e)}})
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _prune(self, conn):
+        # 재전송용으로 보관하는 ChangeEvents 중 보관 기간이 지난 행을 한가할 때 정리합니다.
+        now = time.monotonic()
+        if now - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = now
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM ChangeEvents WHERE created_at < NOW() - make_interval(hours => %s)",
+                (self.retention_hours,)
+            )
+
+    def _dispatch(self, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(event)
+                self.delivered += 1
+            except queue.Full:
+                subscription.lagging = True
+                self.dropped += 1
+
+    def subscribe(self):
+        self._ensure_listener()
+        subscription = Subscription(self.subscriber_queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'listening': self._thread is not None and self._thread.is_alive(),
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+            }
+
+
+def format_sse(event):
+    return f"id: {event['id']}\nevent: {event['entity']}\ndata: {json.dumps(event, default=str)}\n\n"
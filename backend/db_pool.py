@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import deque
+
+import psycopg2
+import psycopg2.extensions
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the pool timeout."""
+
+
+class PooledConnection:
+    # psycopg2 커넥션을 감싸서 close() 호출 시 실제로 닫지 않고 풀에 반납합니다.
+    # 기존 핸들러의 `finally: conn.close()` 패턴을 그대로 사용할 수 있습니다.
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._returned = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._raw.cursor(*args, **kwargs)
+        wrapper = self._pool.cursor_wrapper
+        return wrapper(cursor) if wrapper else cursor
+
+    def close(self):
+        if self._returned:
+            return
+        self._returned = True
+        self._pool.putconn(self._raw)
+
+
+class ConnectionPool:
+    def __init__(self, dsn, minconn=1, maxconn=10, timeout=5.0, healthcheck_interval=30.0, max_lifetime=1800.0,
+                 cursor_wrapper=None):
+        if maxconn < 1:
+            raise ValueError("maxconn must be at least 1")
+        self.dsn = dsn
+        # 빌려준 커넥션의 cursor()를 감쌀 함수 (예: 쿼리 계측)
+        self.cursor_wrapper = cursor_wrapper
+        self.minconn = max(0, min(minconn, maxconn))
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.healthcheck_interval = healthcheck_interval
+        self.max_lifetime = max_lifetime
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, last_used_at)
+        self._created_at = {}  # id(conn) -> created_at
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # -- connection lifecycle --
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn)
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn):
+        # _created_at/_discarded를 바꾸므로 self._cond를 잡은 상태에서 호출합니다.
+        self._created_at.pop(id(conn), None)
+        self._discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_alive(self, conn):
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _needs_check(self, last_used):
+        return time.monotonic() - last_used >= self.healthcheck_interval
+
+    def _expired(self, conn):
+        created = self._created_at.get(id(conn))
+        return self.max_lifetime and created is not None and time.monotonic() - created >= self.max_lifetime
+
+    def warm_up(self):
+        with self._cond:
+            while self._size < self.minconn:
+                conn = self._connect()
+                self._size += 1
+                self._idle.append((conn, time.monotonic()))
+
+    # -- checkout / return --
+    def getconn(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        if self._expired(conn) or conn.closed:
+                            self._discard(conn)
+                            self._size -= 1
+                            continue
+                        break
+                    if self._size < self.maxconn:
+                        # 슬롯을 먼저 예약하고, 네트워크 연결은 락 밖에서 수행합니다.
+                        self._size += 1
+                        conn, last_used = None, None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(f"No database connection available within {self.timeout}s")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._in_use += 1
+
+        try:
+            if conn is None:
+                conn = self._connect()
+            elif self._needs_check(last_used) and not self._is_alive(conn):
+                # 상태 확인(SELECT 1)은 락 밖에서, 장부 정리는 putconn처럼 락 안에서 합니다.
+                with self._cond:
+                    self._discard(conn)
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return PooledConnection(self, conn)
+
+    def putconn(self, conn):
+        keep = not conn.closed and not self._expired(conn)
+        if keep:
+            try:
+                status = conn.info.transaction_status
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    keep = False
+                elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                keep = False
+
+        with self._cond:
+            self._in_use -= 1
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._discard(conn)
+                self._size -= 1
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+                self._size -= 1
+
+    # -- observability --
+    def stats(self):
+        with self._cond:
+            return {
+                'max_size': self.maxconn,
+                'min_size': self.minconn,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'discarded': self._discarded,
+                'wait_ms_avg': round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                'wait_ms_max': round(self._wait_max * 1000, 3),
+            }
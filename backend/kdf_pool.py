@@ -0,0 +1,106 @@
+"""비밀번호 해시(KDF) 전용 작업 풀.
+
+pbkdf2 계산은 요청 스레드가 아니라 크기가 정해진 풀에서 실행하고, 대기열까지 가득 차면 바로 KdfPoolBusy를
+올려서 (503) 로그인 폭주가 다른 요청을 처리할 스레드를 모두 붙잡지 않도록 합니다.
+hashlib.pbkdf2_hmac은 계산하는 동안 GIL을 놓으므로 스레드 풀로도 여러 코어를 씁니다.
+
+    python kdf_pool.py --target-ms 50   # 이 서버에서 해시 1회가 약 50ms가 되는 rounds 값 출력
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+
+class KdfPoolBusy(Exception):
+    """Raised when the KDF pool queue is full or a job did not finish within the timeout."""
+
+
+class KdfPool:
+    def __init__(self, workers=2, queue_size=16, timeout=5.0):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='kdf')
+        # 실행 중 + 대기 중인 작업 수를 workers + queue_size로 제한합니다.
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._run_total = 0.0
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise KdfPoolBusy("KDF pool is saturated")
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._executor.submit(self._call, func, args)
+        except Exception:
+            self._release()
+            raise
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # 작업은 풀에서 끝까지 실행되고 슬롯도 그때 반납됩니다.
+            with self._lock:
+                self._timeouts += 1
+            raise KdfPoolBusy("KDF job timed out")
+
+    def _call(self, func, args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._run_total += time.perf_counter() - started
+                self._completed += 1
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'pending': self._pending,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts,
+                'run_ms_avg': round(self._run_total / self._completed * 1000, 3) if self._completed else 0.0,
+            }
+
+
+def calibrate_rounds(target_ms, sample_rounds=20000):
+    # sample_rounds로 한 번 재서 목표 시간에 맞게 비례 계산합니다. (1000 단위로 반올림)
+    from passlib.hash import pbkdf2_sha256
+
+    hasher = pbkdf2_sha256.using(rounds=sample_rounds)
+    started = time.perf_counter()
+    hasher.hash('calibration-password')
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return max(1000, int(round(sample_rounds * target_ms / elapsed_ms, -3)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Suggest a PASSWORD_HASH_ROUNDS value for this machine.')
+    parser.add_argument('--target-ms', type=float, default=50.0, help='Target time for one hash/verify')
+    args = parser.parse_args()
+    print(calibrate_rounds(args.target_ms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+import contextvars
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# 현재 요청의 DB 사용량. 요청 스레드(또는 task)마다 따로 유지됩니다.
+_request_stats = contextvars.ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = ('started', 'db_queries', 'db_time', 'db_rows', 'queries')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.db_rows = 0
+        self.queries = []  # (sql, seconds) - 느린 요청 로그용
+
+
+def begin_request():
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def end_request():
+    stats = _request_stats.get()
+    _request_stats.set(None)
+    return stats
+
+
+def current_request():
+    return _request_stats.get()
+
+
+class InstrumentedCursor:
+    # psycopg2 커서를 감싸서 execute 시간과 가져온 행 수를 현재 요청에 기록합니다.
+    MAX_RECORDED_QUERIES = 50
+
+    def __init__(self, cursor):
+        object.__setattr__(self, '_cursor', cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._cursor.__exit__(*exc)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._count_rows(1)
+            yield row
+
+    def _timed(self, method, sql, *args):
+        started = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            stats = _request_stats.get()
+            if stats is not None:
+                elapsed = time.perf_counter() - started
+                stats.db_queries += 1
+                stats.db_time += elapsed
+                if len(stats.queries) < self.MAX_RECORDED_QUERIES:
+                    stats.queries.append((sql, elapsed))
+
+    def execute(self, sql, *args):
+        return self._timed(self._cursor.execute, sql, *args)
+
+    def executemany(self, sql, *args):
+        return self._timed(self._cursor.executemany, sql, *args)
+
+    def _count_rows(self, count):
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_rows += count
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._count_rows(1)
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        self._count_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._count_rows(len(rows))
+        return rows
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+
+def _labels(**labels):
+    return ','.join(f'{key}="{str(value)}"' for key, value in labels.items())
+
+
+class MetricsRegistry:
+    HISTOGRAMS = (
+        ('http_request_duration_seconds', 'Request latency in seconds', LATENCY_BUCKETS),
+        ('http_request_db_queries', 'DB round trips per request', COUNT_BUCKETS),
+        ('http_request_db_seconds', 'Time spent in cursor.execute per request', DB_TIME_BUCKETS),
+        ('http_request_db_rows', 'Rows fetched from the DB per request', ROW_BUCKETS),
+        ('http_response_size_bytes', 'Response body size in bytes', BYTE_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}  # (method, endpoint, status) -> count
+        self._histograms = {name: {} for name, _, _ in self.HISTOGRAMS}
+
+    def _observe(self, name, key, value):
+        histograms = self._histograms[name]
+        histogram = histograms.get(key)
+        if histogram is None:
+            buckets = next(b for n, _, b in self.HISTOGRAMS if n == name)
+            histogram = histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+
+    def record(self, method, endpoint, status, duration, stats, response_bytes):
+        key = (method, endpoint)
+        with self._lock:
+            request_key = (method, endpoint, status)
+            self._requests[request_key] = self._requests.get(request_key, 0) + 1
+            self._observe('http_request_duration_seconds', key, duration)
+            self._observe('http_request_db_queries', key, stats.db_queries)
+            self._observe('http_request_db_seconds', key, stats.db_time)
+            self._observe('http_request_db_rows', key, stats.db_rows)
+            if response_bytes is not None:
+                self._observe('http_response_size_bytes', key, response_bytes)
+
+    def snapshot(self):
+        # {(method, endpoint): {'requests': n, 'db_queries_avg': x, 'db_ms_avg': y, 'rows_avg': z}}
+        with self._lock:
+            summary = {}
+            for key, latency in self._histograms['http_request_duration_seconds'].items():
+                queries = self._histograms['http_request_db_queries'][key]
+                db_time = self._histograms['http_request_db_seconds'][key]
+                rows = self._histograms['http_request_db_rows'][key]
+                summary[key] = {
+                    'requests': latency.count,
+                    'db_queries_avg': queries.total / queries.count,
+                    'db_ms_avg': db_time.total / db_time.count * 1000,
+                    'rows_avg': rows.total / rows.count,
+                }
+            return summary
+
+    def render(self, extra_gauges=None):
+        lines = []
+        with self._lock:
+            lines.append('# HELP http_requests_total Requests by endpoint and status')
+            lines.append('# TYPE http_requests_total counter')
+            for (method, endpoint, status), count in sorted(self._requests.items()):
+                lines.append(f'http_requests_total{{{_labels(method=method, endpoint=endpoint, status=status)}}} {count}')
+            for name, help_text, _ in self.HISTOGRAMS:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (method, endpoint), histogram in sorted(self._histograms[name].items()):
+                    labels = _labels(method=method, endpoint=endpoint)
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.total}')
+                    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        for name, (help_text, values) in (extra_gauges or {}).items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            for labels, value in values:
+                suffix = f'{{{_labels(**labels)}}}' if labels else ''
+                lines.append(f'{name}{suffix} {value}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,222 @@
+"""버전별 스키마 마이그레이션.
+
+migrations/NNNN_name.sql 파일을 번호 순서대로 한 번씩 적용하고 SchemaMigrations 테이블에 기록합니다.
+
+    python migrate.py              # 적용되지 않은 마이그레이션 적용
+    python migrate.py --status     # 적용 상태 확인
+    python migrate.py --explain    # 주요 쿼리에 Seq Scan이 남아 있는지 EXPLAIN으로 확인 (있으면 exit 1)
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+import psycopg2
+from dotenv import load_dotenv
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d{4})_([\w-]+)\.sql$')
+# 여러 프로세스가 동시에 마이그레이션을 실행하지 않도록 하는 advisory lock 키
+LOCK_KEY = 7311001
+
+def hot_queries():
+    # (이름, SQL, 파라미터) - app.py의 쿼리 상수/빌더로 핸들러와 똑같은 SQL을 만듭니다.
+    # 필터 없는 전체 목록은 원래 전체를 읽어야 하므로 제외합니다. (목록 ETag는 버전 시퀀스만 읽습니다.)
+    # app은 임포트할 때 DB에 접속하지 않지만, 마이그레이션만 할 때는 필요 없으므로 여기서 임포트합니다.
+    import app
+
+    now = datetime.now()
+    page = app.DEFAULT_PAGE_SIZE + 1
+
+    def inspection_list(*filters, cursor=False, limit=True):
+        where, params = app.build_inspection_filters(dict(filters))
+        if cursor:
+            where.append(app.inspection_cursor_clause('desc'))
+            params.extend([now, 0])
+        if not limit:
+            where.append(app.updated_since_clause('i'))
+            params.append(now)
+        else:
+            params.append(page)
+        sql = app.INSPECTION_LIST_QUERY.format(where_clause=f"WHERE {' AND '.join(where)}" if where else "",
+                                               order='DESC', limit_clause='LIMIT %s' if limit else '')
+        return sql, tuple(params)
+
+    def quality_list(*filters, delta=False):
+        where, params = app.build_quality_filters(dict(filters))
+        if delta:
+            where.append(app.updated_since_clause('q'))
+            params.append(now)
+        return app.QUALITY_LIST_QUERY.format(where_clause=f"WHERE {' AND '.join(where)}"), tuple(params)
+
+    def my_posts(cursor_kind):
+        cursor_value = (now, cursor_kind, 0)
+        inspection_after, inspection_params = app.feed_after_clause('inspection', 'i', cursor_value)
+        quality_after, quality_params = app.feed_after_clause('quality', 'q', cursor_value)
+        sql = app.MY_POSTS_QUERY.format(inspection_after=inspection_after, quality_after=quality_after)
+        return sql, tuple([1] + inspection_params + [page] + [1] + quality_params + [page] + [page])
+
+    detail_params = {'id': 1, 'parent_type': 'inspection'}
+    table, item_query = app.DETAIL_BUNDLE_SOURCES['inspection']
+    search_params = {'q': '불량', 'pattern': '%불량%', 'kinds': list(app.SEARCH_KINDS), 'limit': page, 'offset': 0}
+    analytics_params = {'bucket': 'month', 'from': now.date() - timedelta(days=app.ANALYTICS_DEFAULT_DAYS), 'to': now.date()}
+    totals_query, delayed_query = app.analytics_queries('company')
+
+    return [
+        ('inspections first page', *inspection_list()),
+        ('inspections next page', *inspection_list(cursor=True)),
+        ('inspections by company', *inspection_list(('company_name', 'x'))),
+        ('inspections by product code', *inspection_list(('product_code', 'x'))),
+        ('inspections by product name', *inspection_list(('product_name', 'x'))),
+        ('inspections by user', *inspection_list(('user_id', '1'))),
+        ('inspections delta sync', *inspection_list(limit=False)),
+        ('dashboard filter options', app.INSPECTION_FILTER_OPTIONS_QUERY, ()),
+        ('my inspections', app.MY_INSPECTIONS_QUERY, (1,)),
+        ('my posts page (same kind)', *my_posts('inspection')),
+        ('my posts page (other kind)', *my_posts('quality')),
+        ('inspection detail state', app.DETAIL_BUNDLE_STATE_QUERY.format(table=table), detail_params),
+        ('inspection detail', item_query.format(extra=app.DETAIL_BUNDLE_CHILDREN), detail_params),
+        ('quality by company', *quality_list(('company_name', 'x'))),
+        ('quality delta sync', *quality_list(delta=True)),
+        ('my quality improvements', app.MY_QUALITY_QUERY, (1,)),
+        ('comments for item', app.COMMENTS_QUERY, ('inspection', 1)),
+        ('histories for item', app.HISTORIES_QUERY, ('inspection', 1)),
+        ('tombstones since', app.TOMBSTONES_SINCE_QUERY, ('inspection', now)),
+        ('change events replay', app.MISSED_EVENTS_QUERY, app.missed_events_params(0)),
+        ('search', app.SEARCH_QUERY, search_params),
+        ('analytics rollup range', totals_query, analytics_params),
+        ('analytics delayed', delayed_query, analytics_params),
+        ('company lookup', app.COMPANY_ID_QUERY, ('x',)),
+        ('product lookup', app.PRODUCT_ID_QUERY, ('x',)),
+        ('login', app.LOGIN_USER_QUERY, ('x',)),
+    ]
+
+
+def available_migrations():
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    return migrations
+
+
+def ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaMigrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """)
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM SchemaMigrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(conn, log=print):
+    # 마이그레이션마다 별도 트랜잭션으로 적용하고, 실패하면 해당 마이그레이션만 롤백하고 멈춥니다.
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", (LOCK_KEY,))
+    try:
+        with conn.cursor() as cursor:
+            ensure_version_table(cursor)
+            conn.commit()
+            done = applied_versions(cursor)
+        applied = []
+        for version, name, path in available_migrations():
+            if version in done:
+                continue
+            with open(path, encoding='utf-8') as f:
+                sql = f.read()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql)
+                    cursor.execute("INSERT INTO SchemaMigrations (version, name) VALUES (%s, %s)", (version, name))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            log(f"applied {version:04d}_{name}")
+            applied.append(version)
+        return applied
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (LOCK_KEY,))
+        conn.commit()
+
+
+def status(conn):
+    with conn.cursor() as cursor:
+        ensure_version_table(cursor)
+        conn.commit()
+        done = applied_versions(cursor)
+    return [(version, name, version in done) for version, name, _ in available_migrations()]
+
+
+def _seq_scans(plan, found):
+    if plan.get('Node Type') == 'Seq Scan':
+        found.append(plan.get('Relation Name'))
+    for child in plan.get('Plans', []):
+        _seq_scans(child, found)
+    return found
+
+
+def explain_hot_queries(conn):
+    # 테이블이 작으면 플래너는 인덱스가 있어도 Seq Scan을 고르므로, enable_seqscan을 끄고 확인합니다.
+    # 그래도 Seq Scan이 남으면 그 쿼리를 받쳐줄 인덱스가 없다는 뜻입니다.
+    results = []
+    with conn.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        for name, sql, params in hot_queries():
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql.strip().rstrip(';')}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            root = plan[0]['Plan']
+            results.append((name, _seq_scans(root, []), root.get('Total Cost')))
+    conn.rollback()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply versioned schema migrations.')
+    parser.add_argument('--dsn', help='Database DSN (default: DATABASE_URI)')
+    parser.add_argument('--status', action='store_true', help='Show which migrations are applied')
+    parser.add_argument('--explain', action='store_true', help='Report sequential scans on hot queries and exit 1 if any')
+    args = parser.parse_args()
+
+    load_dotenv()
+    dsn = args.dsn or os.getenv('DATABASE_URI')
+    if not dsn:
+        parser.error('DATABASE_URI is not set')
+
+    conn = psycopg2.connect(dsn)
+    try:
+        if args.status:
+            for version, name, is_applied in status(conn):
+                print(f"{version:04d}_{name:40} {'applied' if is_applied else 'pending'}")
+            return 0
+        if args.explain:
+            failed = 0
+            for name, seq_tables, cost in explain_hot_queries(conn):
+                if seq_tables:
+                    failed += 1
+                    print(f"SEQ SCAN  {name:32} on {', '.join(seq_tables)} (cost {cost})")
+                else:
+                    print(f"ok        {name:32} (cost {cost})")
+            return 1 if failed else 0
+        applied = migrate(conn)
+        if not applied:
+            print("schema is up to date")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
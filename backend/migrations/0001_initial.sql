@@ -0,0 +1,91 @@
+-- 0001: 불량 관리 시스템 기본 테이블
+-- 모든 문장이 IF NOT EXISTS이므로 수동으로 스키마를 만든 기존 DB에도 그대로 적용할 수 있습니다.
+
+CREATE TABLE IF NOT EXISTS Users (
+    id SERIAL PRIMARY KEY,
+    username VARCHAR(100) NOT NULL UNIQUE,
+    password_hash VARCHAR(255) NOT NULL,
+    team VARCHAR(100),
+    last_login TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS Companies (
+    id SERIAL PRIMARY KEY,
+    company_name VARCHAR(255) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS Products (
+    id SERIAL PRIMARY KEY,
+    product_name VARCHAR(255) NOT NULL,
+    product_code VARCHAR(100) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS Inspections (
+    id SERIAL PRIMARY KEY,
+    company_id INTEGER NOT NULL REFERENCES Companies(id),
+    product_id INTEGER NOT NULL REFERENCES Products(id),
+    user_id INTEGER NOT NULL REFERENCES Users(id),
+    inspected_quantity INTEGER,
+    defective_quantity INTEGER,
+    defect_reason TEXT,
+    solution TEXT,
+    received_date DATE,
+    target_date DATE,
+    progress_percentage INTEGER DEFAULT 0,
+    status VARCHAR(20) DEFAULT 'inProgress',
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS QualityImprovements (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES Users(id),
+    company_id INTEGER NOT NULL REFERENCES Companies(id),
+    item_description TEXT,
+    start_date DATE,
+    end_date DATE,
+    progress INTEGER DEFAULT 0,
+    status VARCHAR(20) DEFAULT 'inProgress',
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP
+);
+
+-- parent_type: 'inspection' | 'quality'
+CREATE TABLE IF NOT EXISTS Comments (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES Users(id),
+    parent_id INTEGER NOT NULL,
+    parent_type VARCHAR(20) NOT NULL,
+    content TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS Histories (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES Users(id),
+    parent_id INTEGER NOT NULL,
+    parent_type VARCHAR(20) NOT NULL,
+    action TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- 삭제된 항목 기록 (updated_since 동기화에서 삭제를 전달하기 위한 tombstone)
+CREATE TABLE IF NOT EXISTS Tombstones (
+    id BIGSERIAL PRIMARY KEY,
+    parent_type VARCHAR(20) NOT NULL,
+    item_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- 실시간 변경 피드(/api/events) 이벤트 기록. 재접속 시 Last-Event-ID 이후 이벤트를 다시 보내는 데 사용합니다.
+CREATE TABLE IF NOT EXISTS ChangeEvents (
+    id BIGSERIAL PRIMARY KEY,
+    entity VARCHAR(20) NOT NULL,
+    action VARCHAR(20) NOT NULL,
+    item_id INTEGER,
+    parent_type VARCHAR(20),
+    parent_id INTEGER,
+    user_id INTEGER,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,33 @@
+-- 0002: API가 실제로 실행하는 쿼리의 접근 경로에 맞춘 인덱스
+-- 확인: python migrate.py --explain
+
+-- 수동으로 만든 DB에는 UNIQUE 제약이 없을 수 있습니다. (0001로 만든 DB는 같은 이름의 인덱스가 이미 있어 건너뜁니다.)
+-- get_or_create_company / get_or_create_product 조회와 import의 ON CONFLICT가 사용합니다.
+CREATE UNIQUE INDEX IF NOT EXISTS companies_company_name_key ON Companies (company_name);
+CREATE UNIQUE INDEX IF NOT EXISTS products_product_code_key ON Products (product_code);
+CREATE INDEX IF NOT EXISTS products_product_name_idx ON Products (product_name);
+
+-- 검사 목록: ORDER BY created_at, id 키셋 페이지네이션 (asc/desc 모두 같은 인덱스를 사용)
+CREATE INDEX IF NOT EXISTS inspections_created_at_id_idx ON Inspections (created_at, id);
+-- 내 검사 목록 / user_id 필터 / 사용자 삭제 전 확인 / 내 목록 ETag
+CREATE INDEX IF NOT EXISTS inspections_user_id_created_at_idx ON Inspections (user_id, created_at);
+-- 업체/제품 필터 후 최신순 정렬
+CREATE INDEX IF NOT EXISTS inspections_company_id_created_at_idx ON Inspections (company_id, created_at);
+CREATE INDEX IF NOT EXISTS inspections_product_id_created_at_idx ON Inspections (product_id, created_at);
+-- updated_since 델타 동기화와 ETag의 MAX(GREATEST(created_at, updated_at))
+CREATE INDEX IF NOT EXISTS inspections_modified_idx ON Inspections ((GREATEST(created_at, updated_at)));
+
+CREATE INDEX IF NOT EXISTS quality_created_at_id_idx ON QualityImprovements (created_at, id);
+CREATE INDEX IF NOT EXISTS quality_user_id_created_at_idx ON QualityImprovements (user_id, created_at);
+CREATE INDEX IF NOT EXISTS quality_company_id_created_at_idx ON QualityImprovements (company_id, created_at);
+CREATE INDEX IF NOT EXISTS quality_modified_idx ON QualityImprovements ((GREATEST(created_at, updated_at)));
+
+-- 상세 화면의 댓글/이력 (parent_type, parent_id) 조회는 created_at 순서까지 인덱스에서 가져옵니다.
+CREATE INDEX IF NOT EXISTS comments_parent_created_at_idx ON Comments (parent_type, parent_id, created_at);
+CREATE INDEX IF NOT EXISTS histories_parent_created_at_idx ON Histories (parent_type, parent_id, created_at);
+
+-- 델타 동기화의 삭제 목록은 item_id까지 인덱스만으로 읽습니다. (index-only scan)
+CREATE INDEX IF NOT EXISTS tombstones_parent_type_deleted_at_idx ON Tombstones (parent_type, deleted_at) INCLUDE (item_id);
+-- 보관 기간이 지난 행 정리
+CREATE INDEX IF NOT EXISTS tombstones_deleted_at_idx ON Tombstones (deleted_at);
+CREATE INDEX IF NOT EXISTS change_events_created_at_idx ON ChangeEvents (created_at);
@@ -0,0 +1,6 @@
+-- 0003: "내 작성 내역" 통합 피드 (/api/my-posts)
+-- 사용자별로 최근 활동 시각(GREATEST(created_at, updated_at)), id 순서로 읽어서 페이지마다 필요한 행만 가져옵니다.
+CREATE INDEX IF NOT EXISTS inspections_user_activity_idx
+    ON Inspections (user_id, (GREATEST(created_at, updated_at)), id);
+CREATE INDEX IF NOT EXISTS quality_user_activity_idx
+    ON QualityImprovements (user_id, (GREATEST(created_at, updated_at)), id);
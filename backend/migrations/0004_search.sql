@@ -0,0 +1,62 @@
+-- 0004: 검색 (/api/search)
+-- 검사(불량 원인/해결 방안), 품질개선(개선항목), 댓글 본문을 한 테이블에 모아 전문 검색(tsvector)과
+-- 부분/유사 일치(pg_trgm)를 하나의 GIN 인덱스 쌍으로 처리합니다. 행은 app.py의 sync_search_documents가
+-- 추가/수정/삭제 핸들러 안에서 같은 트랜잭션으로 갱신합니다.
+-- 한국어 사전이 없으므로 'simple' 설정(공백 단위 토큰)을 쓰고, 조사가 붙은 단어 등은 trigram 일치로 보완합니다.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS SearchDocuments (
+    kind VARCHAR(20) NOT NULL,          -- 'inspection' | 'quality' | 'comment'
+    item_id INTEGER NOT NULL,
+    parent_type VARCHAR(20) NOT NULL,   -- 댓글이면 댓글이 달린 항목, 아니면 kind와 같음
+    parent_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    title TEXT,
+    body TEXT NOT NULL,
+    search_vector TSVECTOR NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (kind, item_id)
+);
+
+CREATE INDEX IF NOT EXISTS search_documents_vector_idx ON SearchDocuments USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS search_documents_body_trgm_idx ON SearchDocuments USING GIN (body gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS search_documents_parent_idx ON SearchDocuments (parent_type, parent_id);
+
+-- 기존 데이터 색인 (app.py의 SEARCH_SOURCES와 같은 내용)
+INSERT INTO SearchDocuments (kind, item_id, parent_type, parent_id, user_id, title, body, search_vector, created_at)
+SELECT 'inspection', i.id, 'inspection', i.id, i.user_id,
+       c.company_name || ' / ' || p.product_name,
+       concat_ws(E'\n', i.defect_reason, i.solution),
+       setweight(to_tsvector('simple', coalesce(i.defect_reason, '')), 'A')
+           || setweight(to_tsvector('simple', coalesce(i.solution, '')), 'B')
+           || setweight(to_tsvector('simple', c.company_name || ' ' || p.product_name), 'C'),
+       i.created_at
+FROM Inspections i
+JOIN Companies c ON i.company_id = c.id
+JOIN Products p ON i.product_id = p.id
+ON CONFLICT (kind, item_id) DO NOTHING;
+
+INSERT INTO SearchDocuments (kind, item_id, parent_type, parent_id, user_id, title, body, search_vector, created_at)
+SELECT 'quality', q.id, 'quality', q.id, q.user_id,
+       c.company_name,
+       coalesce(q.item_description, ''),
+       setweight(to_tsvector('simple', coalesce(q.item_description, '')), 'A')
+           || setweight(to_tsvector('simple', c.company_name), 'C'),
+       q.created_at
+FROM QualityImprovements q
+JOIN Companies c ON q.company_id = c.id
+ON CONFLICT (kind, item_id) DO NOTHING;
+
+INSERT INTO SearchDocuments (kind, item_id, parent_type, parent_id, user_id, title, body, search_vector, created_at)
+SELECT 'comment', cm.id, cm.parent_type, cm.parent_id, cm.user_id,
+       NULL,
+       cm.content,
+       setweight(to_tsvector('simple', cm.content), 'B'),
+       cm.created_at
+FROM Comments cm
+-- 항목이 삭제되면서 남은 댓글은 색인하지 않습니다.
+WHERE (cm.parent_type = 'inspection' AND EXISTS (SELECT 1 FROM Inspections WHERE id = cm.parent_id))
+   OR (cm.parent_type = 'quality' AND EXISTS (SELECT 1 FROM QualityImprovements WHERE id = cm.parent_id))
+ON CONFLICT (kind, item_id) DO NOTHING;
+
+ANALYZE SearchDocuments;
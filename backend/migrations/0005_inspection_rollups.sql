@@ -0,0 +1,30 @@
+-- 0005: 불량률 분석 (/api/analytics/defects)
+-- 일/업체/제품/담당자별 검사 건수와 수량을 미리 합산해 둡니다. 기준일은 접수일(없으면 작성일)입니다.
+-- 행은 app.py의 apply_inspection_rollup이 검사 추가/수정/삭제/가져오기 트랜잭션 안에서 증감합니다.
+CREATE TABLE IF NOT EXISTS InspectionDailyStats (
+    stat_date DATE NOT NULL,
+    company_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    inspections INTEGER NOT NULL DEFAULT 0,
+    inspected_quantity BIGINT NOT NULL DEFAULT 0,
+    defective_quantity BIGINT NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (stat_date, company_id, product_id, user_id)
+);
+
+INSERT INTO InspectionDailyStats AS s
+    (stat_date, company_id, product_id, user_id, inspections, inspected_quantity, defective_quantity, completed)
+SELECT COALESCE(i.received_date, i.created_at::date), i.company_id, i.product_id, i.user_id,
+       COUNT(*), COALESCE(SUM(i.inspected_quantity), 0), COALESCE(SUM(i.defective_quantity), 0),
+       COUNT(*) FILTER (WHERE i.progress_percentage >= 100)
+FROM Inspections i
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (stat_date, company_id, product_id, user_id) DO NOTHING;
+
+-- 지연 건수는 날짜가 지나면 바뀌므로 합산해 둘 수 없습니다. 대신 완료되지 않은 검사만 담는 부분 인덱스로 조회합니다.
+CREATE INDEX IF NOT EXISTS inspections_open_target_date_idx
+    ON Inspections (target_date)
+    WHERE (progress_percentage < 100 OR progress_percentage IS NULL);
+
+ANALYZE InspectionDailyStats;
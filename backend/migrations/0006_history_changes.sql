@@ -0,0 +1,52 @@
+-- 0006: 변경 이력을 구조화된 diff로 저장
+-- 수정 한 번에 바뀐 필드마다 문자열 행을 하나씩 INSERT하던 것을, changes 배열을 가진 한 행으로 기록합니다.
+--   changes = [{"field": "inspected_quantity", "label": "검사수량", "old": "10", "new": "12"}, ...]
+-- 화면에 보여주는 "'검사수량' 변경 (10 -> 12)" 문구는 app.py의 HISTORY_ACTION_SQL이 조회할 때 만듭니다.
+-- action은 형식을 알 수 없는 기존 행을 위해 남겨 둡니다. (changes가 있으면 NULL)
+ALTER TABLE Histories ADD COLUMN IF NOT EXISTS changes JSONB;
+ALTER TABLE Histories ALTER COLUMN action DROP NOT NULL;
+
+-- 기존 문자열 행 변환: 표시 이름을 항목 종류별 필드명으로 되돌립니다. (매핑이 없으면 표시 이름을 그대로 사용)
+WITH labels (parent_type, label, field) AS (
+    VALUES ('inspection', '검사수량', 'inspected_quantity'),
+           ('inspection', '불량수량', 'defective_quantity'),
+           ('inspection', '불량 원인', 'defect_reason'),
+           ('inspection', '해결 방안', 'solution'),
+           ('inspection', '접수일', 'received_date'),
+           ('inspection', '마감일', 'target_date'),
+           ('inspection', '진행률', 'progress_percentage'),
+           ('inspection', '상태', 'status'),
+           ('quality', '개선항목', 'item_description'),
+           ('quality', '시작일', 'start_date'),
+           ('quality', '마감일', 'end_date'),
+           ('quality', '진행률', 'progress'),
+           ('quality', '상태', 'status')
+), parsed AS (
+    SELECT h.id, m[1] AS label, m[2] AS old_value, m[3] AS new_value, COALESCE(l.field, m[1]) AS field
+    FROM Histories h
+    CROSS JOIN LATERAL regexp_match(h.action, '^''(.+)'' 변경 \((.*) -> (.*)\)$', 's') AS m
+    LEFT JOIN labels l ON l.parent_type = h.parent_type AND l.label = m[1]
+    WHERE h.changes IS NULL AND m IS NOT NULL
+)
+UPDATE Histories h
+SET changes = jsonb_build_array(jsonb_build_object(
+        'field', p.field, 'label', p.label, 'old', p.old_value, 'new', p.new_value)),
+    action = NULL
+FROM parsed p
+WHERE h.id = p.id;
+
+-- 같은 수정에서 나온 행(같은 작성자/항목/시각)은 하나로 합칩니다. 필드 순서는 원래 INSERT 순서(id)를 따릅니다.
+WITH grouped AS (
+    SELECT MIN(h.id) AS keep_id, array_agg(DISTINCT h.id) AS ids,
+           jsonb_agg(c.change ORDER BY h.id, c.n) AS changes
+    FROM Histories h
+    CROSS JOIN LATERAL jsonb_array_elements(h.changes) WITH ORDINALITY AS c(change, n)
+    WHERE h.changes IS NOT NULL
+    GROUP BY h.user_id, h.parent_type, h.parent_id, h.created_at
+    HAVING COUNT(DISTINCT h.id) > 1
+), merged AS (
+    UPDATE Histories h SET changes = g.changes FROM grouped g WHERE h.id = g.keep_id
+)
+DELETE FROM Histories h USING grouped g WHERE h.id = ANY(g.ids) AND h.id <> g.keep_id;
+
+ANALYZE Histories;
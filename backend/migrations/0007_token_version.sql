@@ -0,0 +1,4 @@
+-- 0007: 토큰 폐기용 버전
+-- 로그인 토큰의 ver 클레임이 Users.token_version과 다르면 token_required가 거부합니다.
+-- 비밀번호 변경, 팀 변경 시 1 증가시키고, 사용자를 삭제하면 행이 없어져 기존 토큰이 모두 무효가 됩니다.
+ALTER TABLE Users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
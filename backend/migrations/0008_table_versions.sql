@@ -0,0 +1,11 @@
+-- 0008: 목록 검증값(ETag)용 항목 종류별 버전
+-- 목록/부트스트랩/내 글 ETag를 COUNT(*)/MAX(updated_at)로 만들면 요청마다 테이블 전체(또는 사용자 글 전체)를 읽어야 합니다.
+-- 쓰기 경로는 모두 커밋 직전에 app.py의 publish_change를 거치므로, 거기서 해당 종류의 version을 1 올리고
+-- ETag는 이 표의 한 행만 읽습니다. 행 잠금 때문에 버전은 커밋 순서대로 증가합니다.
+CREATE TABLE IF NOT EXISTS TableVersions (
+    name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO TableVersions (name) VALUES ('inspection'), ('quality'), ('comment'), ('history')
+ON CONFLICT (name) DO NOTHING;
@@ -0,0 +1,9 @@
+-- 0009: 목록 ETag 버전을 시퀀스로 변경
+-- 0008의 TableVersions 행을 쓰기 트랜잭션 안에서 UPDATE하면 그 행 잠금이 커밋까지 유지되어
+-- 같은 종류를 쓰는 요청이 모두 줄을 섰습니다. nextval은 행을 잠그지 않고 트랜잭션과 무관하게 증가하므로,
+-- app.py의 bump_version이 커밋한 뒤에 nextval로 올리고 version_etag는 last_value를 읽습니다.
+-- 읽는 곳이 없던 comment/history 버전은 만들지 않습니다. (댓글/이력 ETag는 부모별 COUNT/MAX를 그대로 씁니다)
+CREATE SEQUENCE IF NOT EXISTS inspection_version_seq;
+CREATE SEQUENCE IF NOT EXISTS quality_version_seq;
+
+DROP TABLE IF EXISTS TableVersions;
@@ -0,0 +1,36 @@
+-- 0010: 업체/제품/사용자 이름 변경을 목록 ETag에 반영
+-- 목록/부트스트랩 응답에는 조인한 사용자명/업체명/제품명과 필터 옵션이 들어가는데, 이름만 바뀌면
+-- 검수/품질 개선 버전(0009)이 그대로라 클라이언트가 계속 304로 예전 이름을 봅니다.
+-- 앱에는 이름을 바꾸는 경로가 없고(관리자가 SQL로 직접 수정), 앱 밖의 변경은 트리거로만 잡을 수 있으므로
+-- 이름 컬럼이 바뀔 때 reference_version_seq를 올리고 app.py의 version_etag가 항상 함께 읽습니다.
+-- 지연(DEFERRED) 제약 트리거라 커밋 직전에 올라가므로, 새 버전으로 이전 이름을 캐시할 틈이 거의 없습니다.
+CREATE SEQUENCE IF NOT EXISTS reference_version_seq;
+
+CREATE OR REPLACE FUNCTION bump_reference_version() RETURNS trigger AS $$
+BEGIN
+    PERFORM nextval('reference_version_seq');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_reference_version ON Users;
+CREATE CONSTRAINT TRIGGER users_reference_version
+    AFTER UPDATE OF username ON Users
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW WHEN (OLD.username IS DISTINCT FROM NEW.username)
+    EXECUTE PROCEDURE bump_reference_version();
+
+DROP TRIGGER IF EXISTS companies_reference_version ON Companies;
+CREATE CONSTRAINT TRIGGER companies_reference_version
+    AFTER UPDATE OF company_name ON Companies
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW WHEN (OLD.company_name IS DISTINCT FROM NEW.company_name)
+    EXECUTE PROCEDURE bump_reference_version();
+
+DROP TRIGGER IF EXISTS products_reference_version ON Products;
+CREATE CONSTRAINT TRIGGER products_reference_version
+    AFTER UPDATE OF product_name, product_code ON Products
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW WHEN (OLD.product_name IS DISTINCT FROM NEW.product_name
+                       OR OLD.product_code IS DISTINCT FROM NEW.product_code)
+    EXECUTE PROCEDURE bump_reference_version();
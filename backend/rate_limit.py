@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class RateLimiter:
+    # 키(사용자명, IP 등)별 토큰 버킷. burst번까지 연속으로 허용하고 그 뒤로는 분당 rate_per_minute번씩 채워집니다.
+    # 키는 max_keys개까지만 보관하고, 넘으면 가장 오래 쓰지 않은 키부터 버립니다. (버려진 키는 가득 찬 버킷으로 다시 시작)
+    def __init__(self, name, rate_per_minute=10.0, burst=5, max_keys=10000):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def hit(self, key):
+        # 허용하면 0, 거부하면 다시 시도할 수 있을 때까지의 초를 반환합니다.
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self._buckets.move_to_end(key)
+                self.limited += 1
+                return (1 - tokens) / self.rate if self.rate else 60.0
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            self.allowed += 1
+            return 0
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'keys': len(self._buckets),
+                'rate_per_minute': round(self.rate * 60, 3),
+                'burst': self.burst,
+                'allowed': self.allowed,
+                'limited': self.limited,
+            }
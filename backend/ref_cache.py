@@ -0,0 +1,205 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    # 프로세스 내부 LRU 캐시. 항목마다 TTL이 있고, max_size를 넘으면 가장 오래 쓰지 않은 항목부터 제거합니다.
+    def __init__(self, name, ttl=300.0, max_size=1024):
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_sets = 0
+        # delete/clear마다 1씩 증가. 읽기 전에 받아 둔 값과 다르면 그 사이에 무효화가 있었던 것입니다.
+        self._generation = 0
+
+    def generation(self):
+        return self._generation
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[1] <= now:
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None, generation=None):
+        # ttl을 주면 이 항목만 기본 TTL 대신 사용합니다. (예: 토큰 만료 시각까지 남은 시간)
+        # generation을 주면 DB를 읽는 동안 delete/clear가 있었을 때 (읽은 값이 이미 낡았을 수 있으므로) 넣지 않습니다.
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self.stale_sets += 1
+                return False
+            self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'stale_sets': self.stale_sets,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class VersionMap:
+    # 사용자별 토큰 버전처럼 작고 자주 읽는 id -> 값 표를 통째로 메모리에 두는 캐시.
+    # 조회는 dict 한 번(O(1))입니다. 다른 프로세스에서 바뀐 값은 refresh_interval마다 백그라운드 스레드가
+    # loader()로 전체를 다시 읽어 반영하고, 그동안 요청은 가진 표로 바로 답합니다.
+    # 표에 없는 키는 load_one(key)로 그 키만 읽어 넣습니다. (없으면 None을 넣어 매번 다시 읽지 않습니다)
+    def __init__(self, name, loader, refresh_interval=30.0, load_one=None):
+        self.name = name
+        self.loader = loader
+        self.load_one = load_one
+        self.refresh_interval = refresh_interval
+        self._data = None
+        self._loaded_at = 0.0
+        self._retry_at = 0.0
+        self._refreshing = False
+        self._overrides = None  # 전체 읽기 도중 set/delete된 값 (읽은 표 위에 다시 적용)
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self.reloads = 0
+        self.single_loads = 0
+        self.refresh_failures = 0
+
+    def get(self, key, default=None):
+        data = self._data
+        if data is None:
+            # 처음 한 번만 요청 스레드에서 읽습니다. (보통은 warm_up에서 미리 읽어 둡니다)
+            data = self.reload()
+        else:
+            now = time.monotonic()
+            if now - self._loaded_at >= self.refresh_interval and now >= self._retry_at:
+                self._refresh_in_background()
+        if key not in data:
+            if self.load_one is None:
+                return default
+            value = self.load_one(key)
+            self.single_loads += 1
+            self.set(key, value)
+            return default if value is None else value
+        value = data[key]
+        return default if value is None else value
+
+    def peek(self, key, default=None):
+        # loader를 부르지 않고 지금 가진 표에서만 찾습니다. (이벤트 루프처럼 블로킹 I/O를 하면 안 되는 곳에서 사용)
+        data = self._data
+        value = None if data is None else data.get(key)
+        return default if value is None else value
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_reload, name=f'{self.name}-refresh', daemon=True).start()
+
+    def _background_reload(self):
+        try:
+            self.reload()
+        except Exception:
+            # 실패하면 가진 표를 계속 쓰고 다음 주기에 다시 시도합니다.
+            with self._lock:
+                self.refresh_failures += 1
+                self._retry_at = time.monotonic() + self.refresh_interval
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def reload(self):
+        requested_at = time.monotonic()
+        with self._reload_lock:
+            # 기다리는 동안 다른 스레드가 이미 다시 읽었으면 그 결과를 씁니다.
+            if self._data is not None and self._loaded_at >= requested_at:
+                return self._data
+            with self._lock:
+                self._overrides = {}
+            try:
+                data = dict(self.loader())
+            except Exception:
+                with self._lock:
+                    self._overrides = None
+                raise
+            with self._lock:
+                for key, value in self._overrides.items():
+                    if value is _MISSING:
+                        data.pop(key, None)
+                    else:
+                        data[key] = value
+                self._overrides = None
+                self._data = data
+                self._loaded_at = time.monotonic()
+                self.reloads += 1
+            return data
+
+    def replace(self, items):
+        # loader 대신 호출하는 쪽이 전체 표를 직접 넣습니다. (예: asgi.py가 asyncpg로 읽은 값)
+        data = dict(items)
+        with self._lock:
+            self._data = data
+            self._loaded_at = time.monotonic()
+            self.reloads += 1
+
+    def set(self, key, value):
+        with self._lock:
+            if self._data is not None:
+                self._data[key] = value
+            if self._overrides is not None:
+                self._overrides[key] = value
+
+    def delete(self, key):
+        with self._lock:
+            if self._data is not None:
+                self._data.pop(key, None)
+            if self._overrides is not None:
+                self._overrides[key] = _MISSING
+
+    def clear(self):
+        with self._lock:
+            self._data = None
+            self._loaded_at = 0.0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._data) if self._data is not None else 0,
+                'refresh_interval': self.refresh_interval,
+                'reloads': self.reloads,
+                'single_loads': self.single_loads,
+                'refresh_failures': self.refresh_failures,
+                'age': round(time.monotonic() - self._loaded_at, 3) if self._data is not None else None,
+            }
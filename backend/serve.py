@@ -0,0 +1,139 @@
+"""운영용 서버 실행 (waitress).
+
+app 모듈과 커넥션 풀을 먼저 불러오고, 워밍업(DB 커넥션, 캐시)이 끝난 뒤에 요청을 받기 시작합니다.
+플랫폼/로드밸런서는 /api/health/ready (준비 완료), /api/health/live (프로세스 생존)를 확인하면 됩니다.
+
+    cd backend
+    python serve.py                                # SERVE_HOST, PORT, SERVE_THREADS, SERVE_WORKERS 환경 변수 사용
+    python serve.py --port 5000 --threads 16
+    python serve.py --workers 2 --threads 8        # (Linux) 같은 포트를 나눠 쓰는 프로세스 2개
+
+Windows에는 fork가 없으므로 --workers 1로 실행하고 --threads로 동시 처리 수를 조정합니다.
+DB 커넥션 풀은 프로세스마다 따로 있으므로 DB_POOL_MAX_SIZE는 threads 이상, 전체 합은 DB의 max_connections 이하로 둡니다.
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+import time
+
+from waitress import serve
+
+
+def env_int(name, default):
+    return int(os.getenv(name, str(default)))
+
+
+def wait_for_warm_up(app_module, timeout):
+    # DB가 아직 뜨지 않았을 수 있으므로 timeout까지 재시도합니다. 실패해도 서버는 시작하고,
+    # 준비될 때까지 readiness가 503을 반환합니다.
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    while True:
+        try:
+            if app_module.warm_up():
+                return True
+        except Exception as e:
+            app_module.logger.warning('warm_up_failed', extra={'fields': {'error': str(e)}})
+        if time.monotonic() + delay > deadline:
+            return False
+        time.sleep(delay)
+        delay = min(delay * 2, 5.0)
+
+
+def run_worker(app_module, sock, args):
+    if args.warmup_timeout > 0:
+        wait_for_warm_up(app_module, args.warmup_timeout)
+    serve(
+        app_module.app,
+        sockets=[sock],
+        threads=args.threads,
+        connection_limit=args.connection_limit,
+        channel_timeout=args.channel_timeout,
+        ident='qw',
+    )
+
+
+def run_workers(app_module, sock, args):
+    # 부모 프로세스는 app을 미리 불러온 상태로 fork만 하고, 죽은 워커는 다시 띄웁니다.
+    # DB 커넥션과 스레드는 자식에서 새로 만들어집니다. (부모에서는 워밍업하지 않음)
+    children = {}
+    stopping = False
+
+    def spawn(index):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 0
+            try:
+                run_worker(app_module, sock, args)
+            except Exception:
+                app_module.logger.exception("Worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = index
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for index in range(args.workers):
+        spawn(index)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        index = children.pop(pid, None)
+        if index is not None and not stopping:
+            app_module.logger.warning('worker_exited', extra={'fields': {'pid': pid, 'status': status}})
+            time.sleep(1)
+            spawn(index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the API with waitress.')
+    parser.add_argument('--host', default=os.getenv('SERVE_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=env_int('PORT', 5000))
+    parser.add_argument('--threads', type=int, default=env_int('SERVE_THREADS', 8), help='Request threads per worker')
+    parser.add_argument('--workers', type=int, default=env_int('SERVE_WORKERS', 1), help='Worker processes (Linux only if > 1)')
+    parser.add_argument('--connection-limit', type=int, default=env_int('SERVE_CONNECTION_LIMIT', 100))
+    parser.add_argument('--channel-timeout', type=int, default=env_int('SERVE_CHANNEL_TIMEOUT', 120),
+                        help='Seconds before an idle connection is closed (SSE sends heartbeats more often)')
+    parser.add_argument('--warmup-timeout', type=float, default=float(os.getenv('SERVE_WARMUP_TIMEOUT', '30')),
+                        help='Seconds to retry warm-up before accepting traffic anyway (0 skips warm-up)')
+    args = parser.parse_args()
+
+    if args.workers > 1 and not hasattr(os, 'fork'):
+        parser.error('--workers > 1 needs fork(); on Windows run one worker and raise --threads instead')
+
+    # 소켓을 먼저 열어 두고 app을 불러옵니다. 워커가 여러 개면 모두 이 소켓에서 accept합니다.
+    sock = socket.create_server((args.host, args.port), backlog=1024)
+    import app as app_module
+
+    app_module.logger.info('serve', extra={'fields': {
+        'host': args.host, 'port': args.port, 'workers': args.workers, 'threads': args.threads,
+        'db_pool_max_size': app_module.DB_POOL_MAX_SIZE,
+    }})
+    if args.workers > 1:
+        run_workers(app_module, sock, args)
+    else:
+        run_worker(app_module, sock, args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+
+LOGGER_NAME = 'qw'
+
+
+class JsonFormatter(logging.Formatter):
+    # 한 줄에 하나의 JSON 객체 (JSON Lines)
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        payload.update(getattr(record, 'fields', None) or {})
+        if record.exc_text:
+            payload['exc'] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    # 요청 스레드는 큐에 넣기만 하고, 큐가 가득 차면 기다리지 않고 버립니다.
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._exc_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogSettings:
+    # 실행 중에 바꿀 수 있는 설정 (/api/debug/logging)
+    def __init__(self):
+        self.query_logging = False
+        self.query_sample_rate = 1.0
+
+
+settings = LogSettings()
+_handler = None
+_listener = None
+
+
+def configure(level='INFO', queue_size=10000, query_logging=False, query_sample_rate=1.0):
+    global _handler, _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    if _handler is not None:
+        logger.setLevel(level)
+        return logger
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    _handler = DroppingQueueHandler(log_queue)
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+    atexit.register(_stop_listener)
+
+    logger.addHandler(_handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    settings.query_logging = query_logging
+    settings.query_sample_rate = query_sample_rate
+    return logger
+
+
+def _stop_listener():
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def _restart_listener_in_child():
+    # fork된 자식 프로세스에는 리스너 스레드가 없으므로 새로 시작합니다. (serve.py --workers)
+    # 물려받은 큐는 fork 순간 다른 스레드가 잡고 있던 내부 락이 잠긴 채로 복사됐을 수 있어서 건드리지 않고,
+    # 새 큐를 만들어 핸들러와 리스너를 다시 연결합니다. (남아 있던 레코드는 부모 프로세스가 출력합니다)
+    global _listener
+    if _listener is not None:
+        log_queue = queue.Queue(maxsize=_listener.queue.maxsize)
+        _handler.queue = log_queue
+        _listener = logging.handlers.QueueListener(log_queue, *_listener.handlers, respect_handler_level=False)
+        _listener.start()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
+def get_logger(name=None):
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def should_log_query():
+    return settings.query_logging and (settings.query_sample_rate >= 1.0 or random.random() < settings.query_sample_rate)
+
+
+def dropped_count():
+    return _handler.dropped if _handler is not None else 0
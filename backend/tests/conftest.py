@@ -0,0 +1,5 @@
+import os
+import sys
+
+# backend/ 모듈(app, startup_check 등)을 패키지 없이 import할 수 있도록 경로에 넣습니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
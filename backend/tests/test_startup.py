@@ -0,0 +1,22 @@
+"""콜드 스타트 예산 검사 (startup_check.py와 같은 기준).
+
+새 프로세스에서 `import app`을 STARTUP_TEST_RUNS번 재고 최솟값을 예산(STARTUP_BUDGET_MS, 기본 500ms)과 비교합니다.
+한두 번 느린 실행(CPU 경쟁)으로는 실패하지 않고, 모든 실행이 예산을 넘을 때만 실패합니다.
+"""
+import os
+
+import startup_check
+
+RUNS = int(os.getenv('STARTUP_TEST_RUNS', '5'))
+
+
+def test_lazy_modules_are_not_imported_at_startup():
+    assert startup_check.eager_lazy_modules(startup_check.import_timings()) == []
+
+
+def test_import_app_within_budget():
+    samples = startup_check.measure_import(RUNS)
+    assert startup_check.within_budget(samples, startup_check.DEFAULT_BUDGET_MS), (
+        f"import app took at least {min(samples):.1f} ms over {RUNS} runs "
+        f"(budget {startup_check.DEFAULT_BUDGET_MS:.0f} ms): {', '.join(f'{s:.0f}' for s in samples)}"
+    )
@@ -30,10 +30,17 @@ api.interceptors.request.use(
     notifyLoadingChange();
 
     // Set a timer to detect cold start
-    coldStartTimer = setTimeout(() => {
-      isColdStarting = true;
-      loadingMessage = '서버 시작 중입니다. 잠시만 기다려 주세요... (예상 소요 시간: 약 10~30초)';
-      notifyLoadingChange();
+    // 요청이 늦어지면 서버가 아직 준비 중인지 readiness로 확인하고, 준비 중일 때만 안내 문구를 보여줍니다.
+    clearTimeout(coldStartTimer);
+    coldStartTimer = setTimeout(async () => {
+      try {
+        await axios.get(`${api.defaults.baseURL}/api/health/ready`, { timeout: 3000 });
+      } catch {
+        if (!isLoading) return;
+        isColdStarting = true;
+        loadingMessage = '서버 시작 중입니다. 잠시만 기다려 주세요... (예상 소요 시간: 약 10~30초)';
+        notifyLoadingChange();
+      }
     }, 5000); // 5 seconds threshold for cold start message
 
     const token = localStorage.getItem('token');
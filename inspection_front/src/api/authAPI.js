@@ -26,6 +26,10 @@ export const logout = () => {
 export const changePassword = async (passwordData) => {
   try {
     const response = await api.post('/api/change-password', passwordData);
+    // 비밀번호를 바꾸면 기존 토큰이 모두 폐기되므로 서버가 돌려준 새 토큰으로 교체합니다.
+    if (response.data.token) {
+      localStorage.setItem('token', response.data.token);
+    }
     return response.data;
   } catch (error) {
     console.error("Password change failed:", error);
@@ -0,0 +1,16 @@
+import api from '../api';
+
+const detailApi = {
+  // 상세 모달용: 항목, 댓글, 수정 로그를 한 번의 요청으로 가져옵니다.
+  getDetailBundle: async (parentType, parentId) => {
+    try {
+      const response = await api.get(`/api/details/${parentType}/${parentId}`);
+      return response.data;
+    } catch (error) {
+      console.error(`Failed to fetch details for ${parentType} ${parentId}:`, error);
+      throw new Error(error.response?.data?.message || '상세 정보를 불러오는 데 실패했습니다.');
+    }
+  },
+};
+
+export default detailApi;
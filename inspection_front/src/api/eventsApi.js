@@ -0,0 +1,16 @@
+const baseURL = import.meta.env.VITE_API_URL || 'http://127.0.0.1:5000';
+
+// 서버 변경 피드(/api/events)를 구독합니다. EventSource는 끊기면 Last-Event-ID를 보내며 자동 재접속합니다.
+// onEvent(event): { id, entity, action, item_id, parent_type, parent_id, ... }
+// onReset(): 놓친 이벤트가 너무 많을 때 호출되며, 전체 목록을 다시 불러와야 합니다.
+export const subscribeToChanges = ({ onEvent, onReset } = {}) => {
+  const token = localStorage.getItem('token');
+  if (!token) return () => {};
+
+  const source = new EventSource(`${baseURL}/api/events?token=${encodeURIComponent(token)}`);
+  const handleEvent = (e) => onEvent?.(JSON.parse(e.data));
+  ['inspection', 'quality', 'comment', 'history'].forEach(type => source.addEventListener(type, handleEvent));
+  source.addEventListener('reset', () => onReset?.());
+
+  return () => source.close();
+};
@@ -10,6 +10,49 @@ export const getInspections = async () => {
   }
 };
 
+// 서버 측 페이지네이션: params = { limit, cursor, username, company_name, product_name, status, order }
+export const getInspectionsPage = async (params = {}) => {
+  try {
+    const response = await api.get('/api/inspections', { params: { limit: 20, ...params } });
+    return response.data;
+  } catch (error) {
+    console.error("Failed to fetch inspections page:", error);
+    throw new Error(error.response?.data?.message || '검수 내역을 불러오는 데 실패했습니다.');
+  }
+};
+
+// 대시보드 첫 화면: { kpis, items, next_cursor, limit, filter_options }
+export const getInspectionBootstrap = async (params = {}) => {
+  try {
+    const response = await api.get('/api/inspections/bootstrap', { params: { limit: 20, ...params } });
+    return response.data;
+  } catch (error) {
+    console.error("Failed to fetch inspection dashboard:", error);
+    throw new Error(error.response?.data?.message || '대시보드를 불러오는 데 실패했습니다.');
+  }
+};
+
+export const getInspectionKpis = async (params = {}) => {
+  try {
+    const response = await api.get('/api/inspections/kpis', { params });
+    return response.data;
+  } catch (error) {
+    console.error("Failed to fetch inspection KPIs:", error);
+    throw new Error(error.response?.data?.message || '주요 지표를 불러오는 데 실패했습니다.');
+  }
+};
+
+// 불량률 추이: params = { bucket: 'day'|'week'|'month', group_by: 'none'|'company'|'product'|'inspector', from, to }
+export const getDefectAnalytics = async (params = {}) => {
+  try {
+    const response = await api.get('/api/analytics/defects', { params });
+    return response.data;
+  } catch (error) {
+    console.error("Failed to fetch defect analytics:", error);
+    throw new Error(error.response?.data?.message || '불량률 분석 데이터를 불러오는 데 실패했습니다.');
+  }
+};
+
 export const getMyInspections = async () => {
   try {
     const response = await api.get('/api/my-inspections');
@@ -20,6 +63,22 @@ export const getMyInspections = async () => {
   }
 };
 
+// rows: 검수 데이터 배열 또는 CSV File 객체
+export const importInspections = async (rows, { strict = false } = {}) => {
+  try {
+    let body = rows;
+    if (rows instanceof File) {
+      body = new FormData();
+      body.append('file', rows);
+    }
+    const response = await api.post('/api/inspections/import', body, { params: strict ? { strict: 1 } : {} });
+    return response.data;
+  } catch (error) {
+    console.error("Failed to import inspections:", error);
+    throw new Error(error.response?.data?.message || '검수 데이터 가져오기에 실패했습니다.');
+  }
+};
+
 export const getInspectionById = async (id) => {
   try {
     const response = await api.get(`/api/inspections/${id}`);
@@ -0,0 +1,17 @@
+import api from '../api';
+
+const myPostsApi = {
+  // 내 검수/품질개선 항목을 최근 수정 순서로 합친 목록: { items, next_cursor, limit }
+  // 각 항목의 kind는 'inspection' 또는 'quality'입니다.
+  getMyPosts: async (params = {}) => {
+    try {
+      const response = await api.get('/api/my-posts', { params: { limit: 10, ...params } });
+      return response.data;
+    } catch (error) {
+      console.error("Failed to fetch my posts:", error);
+      throw new Error(error.response?.data?.message || '작성 내역을 불러오는 데 실패했습니다.');
+    }
+  },
+};
+
+export default myPostsApi;
@@ -0,0 +1,18 @@
+import api from '../api';
+
+const searchApi = {
+  // params = { q, types: 'inspection,quality,comment', limit, offset }
+  // 반환: { items: [{ kind, id, parent_type, parent_id, username, title, snippet, score, created_at }], next_offset, limit }
+  // snippet은 서버에서 HTML 이스케이프된 문자열이며, 일치 부분만 <mark>로 감싸져 있습니다.
+  search: async (params) => {
+    try {
+      const response = await api.get('/api/search', { params });
+      return response.data;
+    } catch (error) {
+      console.error("Failed to search:", error);
+      throw new Error(error.response?.data?.message || '검색에 실패했습니다.');
+    }
+  },
+};
+
+export default searchApi;
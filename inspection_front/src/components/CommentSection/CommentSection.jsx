@@ -2,7 +2,7 @@ import React, { useState, useEffect, useCallback } from 'react';
 import commentApi from '../../api/commentApi';
 import styles from './CommentSection.module.css';
 
-function CommentSection({ user, parentId, parentType }) {
+function CommentSection({ user, parentId, parentType, initialComments }) {
   const [comments, setComments] = useState([]);
   const [newComment, setNewComment] = useState('');
   const [editingComment, setEditingComment] = useState({ id: null, content: '' });
@@ -24,8 +24,13 @@ function CommentSection({ user, parentId, parentType }) {
   }, [parentId, parentType]);
 
   useEffect(() => {
-    fetchComments();
-  }, [fetchComments]);
+    // 상세 모달이 번들로 받은 댓글을 넘겨주면 다시 요청하지 않습니다. (null이면 아직 로딩 중)
+    if (initialComments === undefined) {
+      fetchComments();
+    } else if (initialComments) {
+      setComments(initialComments);
+    }
+  }, [fetchComments, initialComments]);
 
   const handlePostComment = async (e) => {
     e.preventDefault();
@@ -86,9 +91,9 @@ function CommentSection({ user, parentId, parentType }) {
       )}
 
       <div className={styles.commentList}>
-        {isLoading && <p>댓글 로딩 중...</p>}
+        {(isLoading || initialComments === null) && <p>댓글 로딩 중...</p>}
         {error && <p>{error}</p>}
-        {!isLoading && comments.length === 0 && <p>작성된 댓글이 없습니다.</p>}
+        {!isLoading && initialComments !== null && comments.length === 0 && <p>작성된 댓글이 없습니다.</p>}
         {comments.map(comment => (
           <div key={comment.id} className={styles.comment}>
             <div className={styles.commentHeader}>
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import historyApi from '../../api/historyApi';
+import detailApi from '../../api/detailApi';
 import { deleteInspection } from '../../api/inspectionAPI';
 import CommentSection from '../CommentSection/CommentSection.jsx';
 import EditInspectionModal from '../EditInspectionModal/EditInspectionModal.jsx';
@@ -9,22 +9,27 @@ import { calculateStatus, statusMap } from '../../utils';
 const InspectionDetailModal = ({ item, onClose, user, onUpdate }) => {
   const [histories, setHistories] = useState([]);
   const [loadingHistory, setLoadingHistory] = useState(false);
+  // null: 로딩 중, undefined: 번들 요청 실패 시 CommentSection이 직접 조회
+  const [initialComments, setInitialComments] = useState(null);
   const [isEditModalOpen, setIsEditModalOpen] = useState(false);
 
   useEffect(() => {
     if (item) {
-      const fetchHistory = async () => {
+      const fetchDetails = async () => {
         setLoadingHistory(true);
+        setInitialComments(null);
         try {
-          const data = await historyApi.getHistories('inspection', item.id);
-          setHistories(data);
+          const data = await detailApi.getDetailBundle('inspection', item.id);
+          setHistories(data.histories);
+          setInitialComments(data.comments);
         } catch (error) {
-          console.error("Failed to fetch histories:", error);
+          console.error("Failed to fetch details:", error);
+          setInitialComments(undefined);
         } finally {
           setLoadingHistory(false);
         }
       };
-      fetchHistory();
+      fetchDetails();
     }
   }, [item]);
 
@@ -141,7 +146,7 @@ const InspectionDetailModal = ({ item, onClose, user, onUpdate }) => {
             </div>
 
             {/* 9. Comment Section */}
-            <CommentSection user={user} parentId={item.id} parentType="inspection" />
+            <CommentSection user={user} parentId={item.id} parentType="inspection" initialComments={initialComments} />
 
             {/* 10. History Section */}
             <div className={styles.historySection}>
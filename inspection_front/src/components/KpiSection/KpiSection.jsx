@@ -1,24 +1,16 @@
-import React, { useMemo } from 'react';
+import React from 'react';
 import KpiPieChart from '../KpiPieChart.jsx';
 import styles from './KpiSection.module.css';
-import { calculateStatus } from '../../utils';
 
-function KpiSection({ inspections, onKpiClick }) {
-    const kpiData = useMemo(() => {
-        return inspections.reduce((acc, item) => {
-            const status = calculateStatus(item); // Use calculated status
-            if (status === 'completed') {
-                acc.completed += 1;
-            } else if (status === 'inProgress') {
-                acc.inProgress += 1;
-            } else if (status === 'delayed') {
-                acc.delayed += 1;
-            }
-            return acc;
-        }, { completed: 0, inProgress: 0, delayed: 0 });
-    }, [inspections]);
+// kpis는 서버(/api/inspections/kpis)에서 집계된 값입니다.
+function KpiSection({ kpis, onKpiClick }) {
+    const kpiData = {
+        completed: kpis?.completed ?? 0,
+        inProgress: kpis?.inProgress ?? 0,
+        delayed: kpis?.delayed ?? 0,
+    };
 
-    const total = inspections.length;
+    const total = kpis?.total ?? 0;
 
     return (
         <section className={styles.kpiSection}>
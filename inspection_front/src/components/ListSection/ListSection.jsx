@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useMemo } from 'react';
 import styles from './ListSection.module.css';
 import { FaPlus, FaFilter } from 'react-icons/fa';
 import AddInspectionModal from '../AddInspectionModal/AddInspectionModal.jsx';
@@ -6,54 +6,34 @@ import InspectionDetailModal from '../InspectionDetailModal/InspectionDetailModa
 import FilterModal from '../FilterModal/FilterModal.jsx';
 import { calculateStatus, statusMap } from '../../utils';
 
-function ListSection({ user, inspections, onSuccess, currentPage, setCurrentPage }) {
-    const [filteredInspections, setFilteredInspections] = useState([]);
+function ListSection({ user, inspections, filters, filterOptions, onFiltersChange, onSuccess, currentPage, hasNextPage, onPageChange }) {
     const [isAddModalOpen, setIsAddModalOpen] = useState(false);
     const [isDetailModalOpen, setIsDetailModalOpen] = useState(false);
     const [isFilterModalOpen, setIsFilterModalOpen] = useState(false);
     const [selectedItem, setSelectedItem] = useState(null);
-    const [filters, setFilters] = useState({ username: 'all', company_name: 'all', product_name: 'all', status: 'all' });
-    const [filterOptions, setFilterOptions] = useState({ usernames: [], company_names: [], product_names: [], statuses: ['all', 'delayed', 'inProgress', 'completed'] });
-
-    useEffect(() => {
-        const processedData = inspections.map(item => ({
-            ...item,
-            status: calculateStatus(item)
-        }));
-
-        let result = processedData;
-        if (filters.username !== 'all') result = result.filter(item => item.username === filters.username);
-        if (filters.company_name !== 'all') result = result.filter(item => item.company_name === filters.company_name);
-        if (filters.product_name !== 'all') result = result.filter(item => item.product_name === filters.product_name);
-        if (filters.status !== 'all') result = result.filter(item => item.status === filters.status);
-        setFilteredInspections(result);
-
-        if (inspections.length > 0) {
-            const usernames = [...new Set(inspections.map(item => item.username))];
-            const company_names = [...new Set(inspections.map(item => item.company_name))];
-            const product_names = [...new Set(inspections.map(item => item.product_name))];
-            setFilterOptions(prev => ({ ...prev, usernames: ['all', ...usernames], company_names: ['all', ...company_names], product_names: ['all', ...product_names] }));
-        }
-    }, [filters, inspections]);
 
-    // --- 페이지네이션 로직 ---
-    const itemsPerPage = 10;
-    const pageCount = Math.ceil(filteredInspections.length / itemsPerPage);
-    const indexOfLastItem = currentPage * itemsPerPage;
-    const indexOfFirstItem = indexOfLastItem - itemsPerPage;
-    const paginatedInspections = filteredInspections.slice(indexOfFirstItem, indexOfLastItem);
+    // 필터링과 페이지네이션은 서버에서 처리합니다. 필터 옵션도 서버가 내려준 값을 사용합니다.
+    const paginatedInspections = useMemo(() => inspections.map(item => ({
+        ...item,
+        status: item.calculated_status || calculateStatus(item)
+    })), [inspections]);
+
+    const selectOptions = useMemo(() => ({
+        usernames: ['all', ...filterOptions.usernames],
+        company_names: ['all', ...filterOptions.company_names],
+        product_names: ['all', ...filterOptions.product_names],
+        statuses: ['all', 'delayed', 'inProgress', 'completed'],
+    }), [filterOptions]);
 
     const handlePageChange = (pageNumber) => {
-        if (pageNumber > 0 && pageNumber <= pageCount) {
-            setCurrentPage(pageNumber);
+        if (pageNumber < currentPage ? pageNumber > 0 : hasNextPage) {
+            onPageChange(pageNumber);
         }
     };
-    // --- 페이지네이션 로직 끝 ---
 
     const handleFilterChange = (e) => {
         const { name, value } = e.target;
-        setFilters(prev => ({ ...prev, [name]: value }));
-        setCurrentPage(1); // 필터 변경 시 1페이지로 리셋
+        onFiltersChange({ ...filters, [name]: value });
     };
 
     const handleOpenAddModal = () => {
@@ -67,8 +47,7 @@ function ListSection({ user, inspections, onSuccess, currentPage, setCurrentPage
     };
 
     const applyFiltersFromModal = (newFilters) => {
-        setFilters(newFilters);
-        setCurrentPage(1); // 필터 변경 시 1페이지로 리셋
+        onFiltersChange(newFilters);
     };
 
     return (
@@ -79,16 +58,16 @@ function ListSection({ user, inspections, onSuccess, currentPage, setCurrentPage
 
                     <div className={styles.desktopFilters}>
                         <select name="username" value={filters.username} onChange={handleFilterChange}>
-                            {filterOptions.usernames.map(option => (<option key={option} value={option}>{option === 'all' ? '담당자 전체' : option}</option>))}
+                            {selectOptions.usernames.map(option => (<option key={option} value={option}>{option === 'all' ? '담당자 전체' : option}</option>))}
                         </select>
                         <select name="company_name" value={filters.company_name} onChange={handleFilterChange}>
-                            {filterOptions.company_names.map(option => (<option key={option} value={option}>{option === 'all' ? '업체 전체' : option}</option>))}
+                            {selectOptions.company_names.map(option => (<option key={option} value={option}>{option === 'all' ? '업체 전체' : option}</option>))}
                         </select>
                         <select name="product_name" value={filters.product_name} onChange={handleFilterChange}>
-                            {filterOptions.product_names.map(option => (<option key={option} value={option}>{option === 'all' ? '부품 전체' : option}</option>))}
+                            {selectOptions.product_names.map(option => (<option key={option} value={option}>{option === 'all' ? '부품 전체' : option}</option>))}
                         </select>
                         <select name="status" value={filters.status} onChange={handleFilterChange}>
-                            {filterOptions.statuses.map(option => (<option key={option} value={option}>{option === 'all' && '상태 전체'}{option === 'delayed' && '지연'}{option === 'inProgress' && '진행중'}{option === 'completed' && '완료'}</option>))}
+                            {selectOptions.statuses.map(option => (<option key={option} value={option}>{option === 'all' && '상태 전체'}{option === 'delayed' && '지연'}{option === 'inProgress' && '진행중'}{option === 'completed' && '완료'}</option>))}
                         </select>
                     </div>
 
@@ -168,7 +147,7 @@ function ListSection({ user, inspections, onSuccess, currentPage, setCurrentPage
                     ))}
                 </div>
 
-                {pageCount > 1 && (
+                {(currentPage > 1 || hasNextPage) && (
                     <div className={styles.pagination}>
                         <button
                             onClick={() => handlePageChange(currentPage - 1)}
@@ -177,18 +156,12 @@ function ListSection({ user, inspections, onSuccess, currentPage, setCurrentPage
                         >
                             이전
                         </button>
-                        {Array.from({ length: pageCount }, (_, index) => (
-                            <button
-                                key={index + 1}
-                                onClick={() => handlePageChange(index + 1)}
-                                className={`${styles.pageButton} ${currentPage === index + 1 ? styles.active : ''}`}
-                            >
-                                {index + 1}
-                            </button>
-                        ))}
+                        <button className={`${styles.pageButton} ${styles.active}`}>
+                            {currentPage}
+                        </button>
                         <button
                             onClick={() => handlePageChange(currentPage + 1)}
-                            disabled={currentPage === pageCount}
+                            disabled={!hasNextPage}
                             className={styles.pageButton}
                         >
                             다음
@@ -204,7 +177,7 @@ function ListSection({ user, inspections, onSuccess, currentPage, setCurrentPage
                     onClose={() => setIsFilterModalOpen(false)}
                     onApplyFilters={applyFiltersFromModal}
                     initialFilters={filters}
-                    filterOptions={filterOptions}
+                    filterOptions={selectOptions}
                     type="inspection"
                 />
             )}
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import historyApi from '../../api/historyApi';
+import detailApi from '../../api/detailApi';
 import qualityApi from '../../api/qualityApi';
 import CommentSection from '../CommentSection/CommentSection.jsx';
 import EditQualityItemModal from '../EditQualityItemModal/EditQualityItemModal.jsx';
@@ -9,22 +9,27 @@ import { calculateStatus, statusMap } from '../../utils';
 const QualityImprovementDetailModal = ({ item, onClose, user, onUpdate }) => {
   const [histories, setHistories] = useState([]);
   const [loadingHistory, setLoadingHistory] = useState(false);
+  // null: 로딩 중, undefined: 번들 요청 실패 시 CommentSection이 직접 조회
+  const [initialComments, setInitialComments] = useState(null);
   const [isEditModalOpen, setIsEditModalOpen] = useState(false);
 
   useEffect(() => {
     if (item) {
-      const fetchHistory = async () => {
+      const fetchDetails = async () => {
         setLoadingHistory(true);
+        setInitialComments(null);
         try {
-          const data = await historyApi.getHistories('quality', item.id);
-          setHistories(data);
+          const data = await detailApi.getDetailBundle('quality', item.id);
+          setHistories(data.histories);
+          setInitialComments(data.comments);
         } catch (error) {
-          console.error("Failed to fetch histories:", error);
+          console.error("Failed to fetch details:", error);
+          setInitialComments(undefined);
         } finally {
           setLoadingHistory(false);
         }
       };
-      fetchHistory();
+      fetchDetails();
     }
   }, [item]);
 
@@ -116,7 +121,7 @@ const QualityImprovementDetailModal = ({ item, onClose, user, onUpdate }) => {
             </div>
 
             {/* 6열: 댓글 기능 */}
-            <CommentSection user={user} parentId={item.id} parentType="quality" />
+            <CommentSection user={user} parentId={item.id} parentType="quality" initialComments={initialComments} />
 
             {/* 7열: 수정 로그 */}
             <div className={styles.historySection}>
@@ -1,58 +1,81 @@
-import React, { useState, useEffect, useMemo } from 'react';
-import { getInspections } from '../api/inspectionAPI.js';
+import React, { useState, useEffect, useCallback } from 'react';
+import { getInspectionBootstrap, getInspectionsPage } from '../api/inspectionAPI.js';
 import KpiSection from '../components/KpiSection/KpiSection.jsx';
 import ListSection from '../components/ListSection/ListSection.jsx';
 import styles from './InspectionDashboard.module.css';
 
-import { calculateStatus } from '../utils';
-
 import Spinner from '../components/Spinner/Spinner.jsx';
 
+const PAGE_SIZE = 10;
+const DEFAULT_FILTERS = { username: 'all', company_name: 'all', product_name: 'all', status: 'all' };
+const DEFAULT_FILTER_OPTIONS = { usernames: [], company_names: [], product_names: [], statuses: [] };
+
 function InspectionDashboard({ user }) {
-    const [allInspections, setAllInspections] = useState([]);
+    const [inspections, setInspections] = useState([]);
+    const [kpis, setKpis] = useState(null);
+    const [filterOptions, setFilterOptions] = useState(DEFAULT_FILTER_OPTIONS);
+    const [filters, setFilters] = useState(DEFAULT_FILTERS);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
-    const [statusFilter, setStatusFilter] = useState('all'); // 'all', 'inProgress', 'completed', 'delayed'
+    // 서버 페이지네이션(커서 방식): pageCursors[n]은 n+1 페이지를 요청할 때 사용한 커서입니다.
     const [currentPage, setCurrentPage] = useState(1);
+    const [pageCursors, setPageCursors] = useState([null]);
+    const [nextCursor, setNextCursor] = useState(null);
 
-    const fetchData = async () => {
+    // KPI, 목록 첫 페이지, 필터 옵션을 한 번의 요청으로 받아옵니다.
+    const fetchData = useCallback(async () => {
         if (!user) {
             setLoading(false);
-            setAllInspections([]);
+            setInspections([]);
+            setKpis(null);
             return;
         }
         try {
             setLoading(true);
-            const data = await getInspections();
-            setAllInspections(data);
+            const data = await getInspectionBootstrap({ ...filters, limit: PAGE_SIZE });
+            setKpis(data.kpis);
+            setInspections(data.items);
+            setNextCursor(data.next_cursor);
+            setFilterOptions(data.filter_options);
+            setPageCursors([null]);
+            setCurrentPage(1);
+            setError(null);
         } catch (err) {
             console.error("Failed to fetch inspections:", err);
             setError(err.message);
-            setAllInspections([]);
+            setInspections([]);
         } finally {
             setLoading(false);
         }
-    };
+    }, [user, filters]);
 
     useEffect(() => {
         fetchData();
-    }, [user]);
-
-    const handleKpiClick = (status) => {
-        setStatusFilter(status);
-    };
+    }, [fetchData]);
 
-    const filteredByKpi = useMemo(() => {
-        if (statusFilter === 'all') {
-            return allInspections;
+    const handlePageChange = async (pageNumber) => {
+        const cursor = pageNumber > currentPage ? nextCursor : pageCursors[pageNumber - 1];
+        if (pageNumber < 1 || (pageNumber > currentPage && !cursor)) return;
+        try {
+            setLoading(true);
+            const params = { ...filters, limit: PAGE_SIZE };
+            if (cursor) params.cursor = cursor;
+            const data = await getInspectionsPage(params);
+            setInspections(data.items);
+            setNextCursor(data.next_cursor);
+            setPageCursors(prev => [...prev.slice(0, pageNumber - 1), cursor]);
+            setCurrentPage(pageNumber);
+        } catch (err) {
+            console.error("Failed to fetch inspections page:", err);
+            setError(err.message);
+        } finally {
+            setLoading(false);
         }
-        return allInspections.filter(item => calculateStatus(item) === statusFilter);
-    }, [statusFilter, allInspections]);
+    };
 
-    // 필터가 변경되면 항상 1페이지로 리셋합니다.
-    useEffect(() => {
-        setCurrentPage(1);
-    }, [statusFilter]);
+    const handleKpiClick = (status) => {
+        setFilters(prev => ({ ...prev, status }));
+    };
 
     return (
         <>
@@ -62,16 +85,20 @@ function InspectionDashboard({ user }) {
                 <p className={styles.contentSubTitle}>실시간으로 업체별 현황을 확인하세요.</p>
             </div>
             <div className={styles.scrollableContent}>
-                <KpiSection inspections={allInspections} onKpiClick={handleKpiClick} />
+                <KpiSection kpis={kpis} onKpiClick={handleKpiClick} />
                 {loading && <Spinner />}
                 {error && <p>데이터 로딩 실패: {error}</p>}
                 {!loading && !error && (
                     <ListSection
                         user={user}
-                        inspections={filteredByKpi}
+                        inspections={inspections}
+                        filters={filters}
+                        filterOptions={filterOptions}
+                        onFiltersChange={setFilters}
                         onSuccess={fetchData}
                         currentPage={currentPage}
-                        setCurrentPage={setCurrentPage}
+                        hasNextPage={Boolean(nextCursor)}
+                        onPageChange={handlePageChange}
                     />
                 )}
             </div>
@@ -79,4 +106,4 @@ function InspectionDashboard({ user }) {
     );
 }
 
-export default InspectionDashboard;
\ No newline at end of file
+export default InspectionDashboard;